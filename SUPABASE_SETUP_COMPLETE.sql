@@ -122,7 +122,8 @@ CREATE POLICY "Anyone can view community scores"
 -- FUNCTIONS
 -- ============================================
 
--- Function to update community trust score
+-- Function to update one community trust score on demand
+-- (bulk recomputation: community_worker.py, same formula)
 CREATE OR REPLACE FUNCTION update_community_trust_score(p_influencer_id UUID)
 RETURNS void AS $$
 DECLARE
@@ -176,25 +177,70 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
--- Trigger to update community score when signal is added/updated/deleted
+-- Influencers whose community score is stale. Signal changes only mark
+-- rows here; community_worker.py recomputes them in set-based batches, so a
+-- burst of ratings on one influencer costs a single recomputation.
+CREATE TABLE IF NOT EXISTS community_score_dirty (
+  influencer_id UUID PRIMARY KEY REFERENCES influencers(id) ON DELETE CASCADE,
+  marked_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_community_score_dirty_marked ON community_score_dirty(marked_at);
+
+-- No policies: only the trigger (security definer) and the worker touch it
+ALTER TABLE community_score_dirty ENABLE ROW LEVEL SECURITY;
+
+-- Trigger to mark the community score dirty when a signal is added/updated/deleted
 CREATE OR REPLACE FUNCTION trigger_update_community_score()
-RETURNS TRIGGER AS $$
+RETURNS TRIGGER
+SECURITY DEFINER
+SET search_path = public
+AS $$
 BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    INSERT INTO community_score_dirty (influencer_id)
+    VALUES (OLD.influencer_id)
+    ON CONFLICT (influencer_id) DO NOTHING;
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    INSERT INTO community_score_dirty (influencer_id)
+    VALUES (NEW.influencer_id)
+    ON CONFLICT (influencer_id) DO NOTHING;
+  END IF;
   IF TG_OP = 'DELETE' THEN
-    PERFORM update_community_trust_score(OLD.influencer_id);
     RETURN OLD;
-  ELSE
-    PERFORM update_community_trust_score(NEW.influencer_id);
-    RETURN NEW;
   END IF;
+  RETURN NEW;
 END;
 $$ LANGUAGE plpgsql;
 
+DROP TRIGGER IF EXISTS community_signal_changed ON community_signals;
 CREATE TRIGGER community_signal_changed
   AFTER INSERT OR UPDATE OR DELETE ON community_signals
   FOR EACH ROW
   EXECUTE FUNCTION trigger_update_community_score();
 
+-- The combined score also depends on the AI trust score
+CREATE OR REPLACE FUNCTION trigger_mark_ai_score_changed()
+RETURNS TRIGGER
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  INSERT INTO community_score_dirty (influencer_id)
+  VALUES (NEW.id)
+  ON CONFLICT (influencer_id) DO NOTHING;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS influencer_ai_score_changed ON influencers;
+CREATE TRIGGER influencer_ai_score_changed
+  AFTER UPDATE OF trust_score ON influencers
+  FOR EACH ROW
+  WHEN (OLD.trust_score IS DISTINCT FROM NEW.trust_score)
+  EXECUTE FUNCTION trigger_mark_ai_score_changed();
+
 -- ============================================
 -- ENABLE ANONYMOUS AUTH
 -- ============================================
@@ -0,0 +1,321 @@
+"""
+Shared sentiment analyzer server
+Loads the SentimentAnalyzer once (on config.ANALYZER_BACKEND), warms it
+up, freezes the heap and forks worker processes that share the model
+weights copy-on-write. Workers answer analysis requests over a local
+multiprocessing.connection endpoint and micro-batch concurrent requests
+into single inference calls.
+
+Point the app at it with config.ANALYZER_SERVER_ADDRESS (e.g.
+"127.0.0.1:6010" or a Unix socket path); InfluencerOrchestrator then uses
+RemoteAnalyzer instead of loading the model in every process.
+
+Usage:
+    python analyzer_server.py --address 127.0.0.1:6010 --workers 2
+    python analyzer_server.py --backend int8 --threads-per-worker 2
+"""
+
+import argparse
+import functools
+import gc
+import logging
+import os
+import queue
+import signal
+import sys
+import threading
+import time
+from multiprocessing.connection import Client, Listener
+from typing import Callable, Dict, List, Optional
+
+from inference_backend import BACKENDS, load_analyzer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_AUTHKEY = b'influencer-monitor'
+
+# Backoff between restarts of workers that die within STABLE_WORKER_SECONDS
+RESTART_DELAY = 0.1
+MAX_RESTART_DELAY = 30.0
+STABLE_WORKER_SECONDS = 10.0
+
+WARMUP_TEXTS = [
+    "Préchauffage du modèle d'analyse de sentiment",
+    "Model warm-up batch",
+]
+
+
+def parse_address(address: str):
+    """'host:port' -> (host, port); anything else is a Unix socket path"""
+    host, _, port = address.rpartition(':')
+    if host and port.isdigit():
+        return host, int(port)
+    return address
+
+
+def _default_address():
+    import config
+    return getattr(config, 'ANALYZER_SERVER_ADDRESS', None) or '127.0.0.1:6010'
+
+
+def _default_authkey() -> bytes:
+    import config
+    key = getattr(config, 'ANALYZER_SERVER_AUTHKEY', None) or DEFAULT_AUTHKEY
+    return key.encode('utf-8') if isinstance(key, str) else key
+
+
+def _analyze(analyzer, texts: List[str]) -> List[Dict]:
+    if hasattr(analyzer, 'analyze_batch'):
+        return analyzer.analyze_batch(texts)
+    return [analyzer.analyze_text(text) for text in texts]
+
+
+class _MicroBatcher:
+    """Coalesces requests from concurrent connections into one analyzer call"""
+
+    def __init__(self, analyzer, max_batch: int = 32, max_wait: float = 0.005):
+        self.analyzer = analyzer
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue = queue.Queue()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def submit(self, texts: List[str]) -> List[Dict]:
+        request = {'texts': texts, 'done': threading.Event()}
+        self._queue.put(request)
+        request['done'].wait()
+        if 'error' in request:
+            raise RuntimeError(request['error'])
+        return request['results']
+
+    def _run(self):
+        while True:
+            pending = [self._queue.get()]
+            size = len(pending[0]['texts'])
+            deadline = time.monotonic() + self.max_wait
+            while size < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                pending.append(request)
+                size += len(request['texts'])
+
+            try:
+                results = _analyze(self.analyzer, [text for r in pending for text in r['texts']])
+            except Exception as e:
+                for request in pending:
+                    request['error'] = str(e)
+            else:
+                offset = 0
+                for request in pending:
+                    request['results'] = results[offset:offset + len(request['texts'])]
+                    offset += len(request['texts'])
+            for request in pending:
+                request['done'].set()
+
+
+def _handle_connection(conn, batcher: _MicroBatcher):
+    with conn:
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                return
+            command = message[0]
+            try:
+                if command == 'analyze':
+                    conn.send(('ok', batcher.submit(message[1])))
+                elif command == 'ping':
+                    conn.send(('ok', os.getpid()))
+                else:
+                    conn.send(('error', f"unknown command {command!r}"))
+            except (EOFError, OSError):
+                return
+            except Exception as e:
+                conn.send(('error', str(e)))
+
+
+def _worker_loop(listener, analyzer, max_batch: int, max_wait: float, threads: Optional[int]):
+    """Body of a forked worker: accept connections on the shared listener"""
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    if threads and 'torch' in sys.modules:
+        sys.modules['torch'].set_num_threads(threads)
+
+    # Threads do not survive fork, so the batcher is started here
+    batcher = _MicroBatcher(analyzer, max_batch, max_wait)
+    while True:
+        try:
+            conn = listener.accept()
+        except OSError:
+            continue  # failed handshake (wrong authkey, client gone)
+        threading.Thread(target=_handle_connection, args=(conn, batcher), daemon=True).start()
+
+
+class AnalyzerServer:
+    """Pre-forking analyzer server sharing one warmed-up model"""
+
+    def __init__(self, address=None, authkey: Optional[bytes] = None, workers: int = 2,
+                 max_batch: int = 32, max_wait_ms: float = 5.0, threads_per_worker: Optional[int] = None,
+                 analyzer_factory: Callable = load_analyzer):
+        address = address or _default_address()
+        self.address = parse_address(address) if isinstance(address, str) else address
+        self.authkey = authkey or _default_authkey()
+        self.workers = workers
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.threads_per_worker = threads_per_worker
+        self.analyzer_factory = analyzer_factory
+        self._children = {}
+        self._stopping = False
+
+    def load(self):
+        """Load and warm up the model, then freeze the heap so forks keep sharing its pages"""
+        started = time.perf_counter()
+        analyzer = self.analyzer_factory()
+        _analyze(analyzer, WARMUP_TEXTS)
+        gc.collect()
+        if hasattr(gc, 'freeze'):
+            gc.freeze()
+        logger.info("Analyzer loaded and warmed up in %.2fs", time.perf_counter() - started)
+        return analyzer
+
+    def serve(self):
+        analyzer = self.load()
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+        listener = Listener(self.address, authkey=self.authkey)
+        logger.info("Analyzer server listening on %s", self.address)
+
+        if self.workers < 1 or not hasattr(os, 'fork'):
+            _worker_loop(listener, analyzer, self.max_batch, self.max_wait, self.threads_per_worker)
+            return
+
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+        for _ in range(self.workers):
+            self._fork_worker(listener, analyzer)
+
+        # Supervise: replace workers that die until asked to stop
+        delay = RESTART_DELAY
+        while self._children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+            started = self._children.pop(pid, None)
+            if self._stopping:
+                continue
+            # A worker that dies right after starting would otherwise respawn in a hot loop
+            if started is not None and time.monotonic() - started < STABLE_WORKER_SECONDS:
+                delay = min(delay * 2, MAX_RESTART_DELAY)
+            else:
+                delay = RESTART_DELAY
+            logger.warning("Analyzer worker %s exited (status %s), restarting in %.1fs", pid, status, delay)
+            time.sleep(delay)
+            if not self._stopping:
+                self._fork_worker(listener, analyzer)
+        listener.close()
+
+    def _fork_worker(self, listener, analyzer):
+        pid = os.fork()
+        if pid == 0:
+            # Only the supervisor tracks and signals workers
+            self._children = {}
+            try:
+                _worker_loop(listener, analyzer, self.max_batch, self.max_wait, self.threads_per_worker)
+            finally:
+                os._exit(0)
+        self._children[pid] = time.monotonic()
+
+    def _stop(self, signum, frame):
+        self._stopping = True
+        for pid in list(self._children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                self._children.pop(pid, None)
+
+
+class RemoteAnalyzer:
+    """SentimentAnalyzer-compatible client of AnalyzerServer (one connection per thread)"""
+
+    def __init__(self, address=None, authkey: Optional[bytes] = None, timeout: float = 30.0):
+        address = address or _default_address()
+        self.address = parse_address(address) if isinstance(address, str) else address
+        self.authkey = authkey or _default_authkey()
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = Client(self.address, authkey=self.authkey)
+        return conn
+
+    def _request(self, message):
+        for attempt in range(2):
+            conn = self._connection()
+            try:
+                conn.send(message)
+                if not conn.poll(self.timeout):
+                    # The late reply would be read as the answer to the next request
+                    self.close()
+                    raise TimeoutError(f"analyzer server did not answer within {self.timeout}s")
+                status, payload = conn.recv()
+                break
+            except (EOFError, ConnectionError):
+                # Worker restarted or connection dropped: reconnect once
+                self.close()
+                if attempt:
+                    raise
+        if status != 'ok':
+            raise RuntimeError(f"analyzer server error: {payload}")
+        return payload
+
+    def analyze_batch(self, texts: List[str]) -> List[Dict]:
+        if not texts:
+            return []
+        return self._request(('analyze', list(texts)))
+
+    def analyze_text(self, text: str) -> Dict:
+        return self.analyze_batch([text])[0]
+
+    def ping(self) -> int:
+        """PID of the worker serving this thread"""
+        return self._request(('ping',))
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the sentiment analyzer to local processes")
+    parser.add_argument('--address', help="host:port or Unix socket path (default: config.ANALYZER_SERVER_ADDRESS)")
+    parser.add_argument('--workers', type=int, default=2, help="Forked worker processes (0: serve in-process)")
+    parser.add_argument('--max-batch', type=int, default=32, help="Texts per inference call")
+    parser.add_argument('--max-wait-ms', type=float, default=5.0, help="How long to wait to fill a batch")
+    parser.add_argument('--threads-per-worker', type=int, help="torch intra-op threads in each worker")
+    parser.add_argument('--backend', choices=BACKENDS,
+                        help="Inference backend (default: config.ANALYZER_BACKEND)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    server = AnalyzerServer(args.address, workers=args.workers, max_batch=args.max_batch,
+                            max_wait_ms=args.max_wait_ms, threads_per_worker=args.threads_per_worker,
+                            analyzer_factory=functools.partial(load_analyzer, args.backend))
+    print(f"🧠 Analyzer server starting on {server.address} with {args.workers} workers")
+    server.serve()
+
+
+if __name__ == "__main__":
+    main()
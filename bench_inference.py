@@ -0,0 +1,104 @@
+"""
+Sentiment inference benchmark
+Runs the same mentions through each analyzer backend and reports
+throughput next to label agreement with the default torch backend.
+Exits non-zero when a backend falls below --min-agreement, so it can gate
+a switch of config.ANALYZER_BACKEND.
+
+Usage:
+    python bench_inference.py --backends torch int8 onnx --texts 500
+    python bench_inference.py --backends int8 --threads 4 --min-agreement 0.98
+"""
+
+import argparse
+import sys
+import time
+from typing import List
+
+import database
+from inference_backend import BACKENDS, DEFAULT_BACKEND, analyze_texts, compare_backends, load_analyzer
+
+SAMPLE_TEXTS = [
+    "Le nouveau scandale autour de l'influenceur fait réagir toute la communauté",
+    "Superbe live caritatif : plus de 100 000 euros de dons récoltés pour l'association",
+    "Sa dernière vidéo est sortie hier, rien de particulier à signaler",
+    "Polémique après des propos jugés insultants envers ses abonnés",
+    "Bravo pour cette initiative solidaire, vraiment inspirant",
+    "Accusé d'arnaque sur un partenariat crypto, il ne répond pas aux critiques",
+    "Interview intéressante sur ses projets et sa prochaine tournée",
+    "Merci pour ce moment, la communauté est fière de toi",
+]
+
+
+def load_texts(count: int) -> List[str]:
+    """Latest stored mention excerpts, topped up with built-in samples"""
+    db = database.get_db()
+    try:
+        rows = db.query(database.Mention.text_excerpt).filter(
+            database.Mention.text_excerpt != ''
+        ).order_by(database.Mention.id.desc()).limit(count).all()
+    finally:
+        db.close()
+    texts = [row.text_excerpt for row in rows]
+    while len(texts) < count:
+        texts.append(SAMPLE_TEXTS[len(texts) % len(SAMPLE_TEXTS)])
+    return texts
+
+
+def throughput(analyzer, texts: List[str], batch_size: int, runs: int) -> float:
+    """Best texts/second over `runs` passes, after one warm-up batch"""
+    analyze_texts(analyzer, texts[:batch_size], batch_size)
+    best = float('inf')
+    for _ in range(runs):
+        started = time.perf_counter()
+        analyze_texts(analyzer, texts, batch_size)
+        best = min(best, time.perf_counter() - started)
+    return len(texts) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare sentiment backends for speed and parity")
+    parser.add_argument('--backends', nargs='+', choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument('--texts', type=int, default=500, help="Mentions to analyze per pass")
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--threads', type=int, help="torch intra-op threads")
+    parser.add_argument('--min-agreement', type=float, default=0.97,
+                        help="Minimum share of labels matching the torch backend")
+    args = parser.parse_args()
+
+    if args.threads:
+        import torch
+        torch.set_num_threads(args.threads)
+
+    texts = load_texts(args.texts)
+    print(f"🧪 {len(texts)} texts, batch size {args.batch_size}, best of {args.runs}")
+
+    reference = load_analyzer(DEFAULT_BACKEND)
+    baseline = None
+    failed = []
+    for backend in args.backends:
+        analyzer = reference if backend == DEFAULT_BACKEND else load_analyzer(backend)
+        rate = throughput(analyzer, texts, args.batch_size, args.runs)
+        baseline = baseline or (rate if backend == DEFAULT_BACKEND else None)
+        speedup = f"x{rate / baseline:.2f}" if baseline else "-"
+
+        if analyzer is reference:
+            print(f"   {backend:<6} {rate:8.1f} texts/s  {speedup:>6}   (reference)")
+            continue
+        parity = compare_backends(reference, analyzer, texts, args.batch_size)
+        print(f"   {backend:<6} {rate:8.1f} texts/s  {speedup:>6}   "
+              f"agreement {parity['label_agreement']:.1%}  max score delta {parity['max_score_delta']:.3f}")
+        for text, expected, actual in parity['disagreements'][:5]:
+            print(f"          {expected} -> {actual}: {text[:70]}")
+        if parity['label_agreement'] < args.min_agreement:
+            failed.append(backend)
+
+    if failed:
+        print(f"❌ Below {args.min_agreement:.0%} label agreement: {', '.join(failed)}")
+        sys.exit(1)
+    print("✅ All backends within parity threshold")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Load driver for capacity testing the analysis pipeline
+
+Replays a Zipf-distributed stream of influencer searches, grouped into
+contributor sessions, against InfluencerOrchestrator backed by the
+synthetic scrapers, then reports throughput and latency percentiles.
+
+Note: results are written to the database configured in config.py.
+
+Usage:
+    python bench_load.py --requests 200 --influencers 500 --concurrency 8
+    python bench_load.py --sentiment-mix 0.4 0.1 0.5 --verbose
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import time
+from typing import Dict, List
+
+from scrapers import get_scrapers
+from orchestrator import InfluencerOrchestrator
+import metrics
+
+
+def zipf_sampler(rng: random.Random, population: int, s: float):
+    """Return a function drawing ranks 0..population-1 with P(k) ~ 1/(k+1)^s"""
+    cum_weights = []
+    total = 0.0
+    for k in range(1, population + 1):
+        total += 1.0 / (k ** s)
+        cum_weights.append(total)
+    ranks = range(population)
+    return lambda: rng.choices(ranks, cum_weights=cum_weights, k=1)[0]
+
+
+def build_workload(args) -> List[Dict]:
+    """Build the ordered request stream: contributor sessions of Zipf searches"""
+    rng = random.Random(args.seed)
+    pick_influencer = zipf_sampler(rng, args.influencers, args.zipf_s)
+
+    workload = []
+    while len(workload) < args.requests:
+        contributor = f"loadtest_user_{rng.randrange(args.contributors)}"
+        session_length = max(1, int(rng.expovariate(1.0 / args.session_length)))
+        for _ in range(session_length):
+            if len(workload) >= args.requests:
+                break
+            workload.append({
+                'influencer': f"Influenceur {pick_influencer():05d}",
+                'contributor': contributor,
+                'use_cache': rng.random() < args.cache_rate
+            })
+    return workload
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    idx = max(0, min(len(sorted_values) - 1, int(round(pct / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[idx]
+
+
+async def run_load(orchestrator: InfluencerOrchestrator, workload: List[Dict], concurrency: int) -> Dict:
+    """Run the workload with bounded concurrency and collect per-request timings"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+    cache_hits = 0
+    mentions = 0
+
+    async def one(request):
+        nonlocal errors, cache_hits, mentions
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                result = None
+                if request['use_cache']:
+                    result = orchestrator.get_cached_results(request['influencer'])
+                    if result:
+                        cache_hits += 1
+                if not result:
+                    result = await orchestrator.analyze_influencer(
+                        request['influencer'],
+                        contributor_username=request['contributor']
+                    )
+                mentions += len(result['mentions'])
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(request) for request in workload))
+    elapsed = time.perf_counter() - start
+
+    return {
+        'elapsed': elapsed,
+        'latencies': sorted(latencies),
+        'errors': errors,
+        'cache_hits': cache_hits,
+        'mentions': mentions
+    }
+
+
+def print_report(stats: Dict, workload: List[Dict]):
+    """Print throughput and latency percentiles"""
+    latencies = stats['latencies']
+    elapsed = stats['elapsed'] or 1e-9
+    distinct = len(set(r['influencer'] for r in workload))
+
+    print("\n📊 Load test report")
+    print(f"   Requests:        {len(workload)} ({distinct} distinct influencers)")
+    print(f"   Errors:          {stats['errors']}")
+    print(f"   Cache hits:      {stats['cache_hits']}")
+    print(f"   Elapsed:         {elapsed:.2f}s")
+    print(f"   Throughput:      {len(workload) / elapsed:.2f} req/s, {stats['mentions'] / elapsed:.0f} mentions/s")
+    for pct in (50, 90, 95, 99):
+        print(f"   p{pct:<3}            {percentile(latencies, pct) * 1000:.1f} ms")
+    if latencies:
+        print(f"   max              {latencies[-1] * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetic load driver for InfluencerOrchestrator")
+    parser.add_argument('--requests', type=int, default=100, help="Total searches to replay")
+    parser.add_argument('--influencers', type=int, default=200, help="Size of the influencer population")
+    parser.add_argument('--zipf-s', type=float, default=1.1, help="Zipf exponent for influencer popularity")
+    parser.add_argument('--contributors', type=int, default=20, help="Number of distinct contributors")
+    parser.add_argument('--session-length', type=float, default=5.0, help="Mean searches per contributor session")
+    parser.add_argument('--cache-rate', type=float, default=0.0, help="Fraction of searches that try the cache first")
+    parser.add_argument('--concurrency', type=int, default=4, help="Concurrent in-flight searches")
+    parser.add_argument('--mentions-per-source', type=int, default=50)
+    parser.add_argument('--latency-ms', type=float, default=300.0, help="Median scraper latency")
+    parser.add_argument('--failure-rate', type=float, default=0.02, help="Per-call scraper failure probability")
+    parser.add_argument('--sentiment-mix', type=float, nargs=3, default=(0.15, 0.15, 0.70),
+                        metavar=('DRAMA', 'GOOD', 'NEUTRAL'), help="Relative weights of synthetic mention kinds")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--verbose', action='store_true', help="Log pipeline progress for every search")
+    parser.add_argument('--metrics', action='store_true', help="Print per-stage metrics in Prometheus text format")
+    args = parser.parse_args()
+
+    # Pipeline progress goes through logging; keep it quiet unless asked
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+
+    scrapers = get_scrapers(
+        'synthetic',
+        mentions_per_source=args.mentions_per_source,
+        seed=args.seed,
+        latency_ms=args.latency_ms,
+        failure_rate=args.failure_rate,
+        sentiment_mix=tuple(args.sentiment_mix)
+    )
+    orchestrator = InfluencerOrchestrator(scrapers=scrapers)
+    workload = build_workload(args)
+
+    print(f"🚀 Replaying {len(workload)} searches with concurrency {args.concurrency}...")
+    stats = asyncio.run(run_load(orchestrator, workload, args.concurrency))
+
+    print_report(stats, workload)
+
+    if args.metrics:
+        sink = metrics.get_metrics()
+        if isinstance(sink, metrics.InMemoryMetrics):
+            print("\n" + sink.render_prometheus())
+
+
+if __name__ == "__main__":
+    main()
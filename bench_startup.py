@@ -0,0 +1,75 @@
+"""
+Cold-start benchmark
+Times module imports and first orchestrator construction in fresh
+interpreters, so regressions in app boot time show up before deploy.
+
+Usage:
+    python bench_startup.py --runs 5
+    python bench_startup.py --importtime 15
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+STEPS = {
+    'import database': "import database",
+    'import leaderboard': "import leaderboard",
+    'import orchestrator': "import orchestrator",
+    'InfluencerOrchestrator()': "import orchestrator; orchestrator.InfluencerOrchestrator()",
+}
+
+_TIMER = """
+import time
+start = time.perf_counter()
+{code}
+print(time.perf_counter() - start)
+"""
+
+
+def time_in_subprocess(code: str) -> float:
+    """Wall time of `code` in a fresh interpreter (imports included)"""
+    result = subprocess.run(
+        [sys.executable, '-c', _TIMER.format(code=code)],
+        capture_output=True, text=True, check=True
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def import_time_report(module: str, top: int):
+    """Slowest modules (cumulative) from python -X importtime"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+        capture_output=True, text=True
+    )
+    entries = []
+    for line in result.stderr.splitlines():
+        # "import time:   self [us] | cumulative | imported package"
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        entries.append((int(cumulative_us), name.rstrip()))
+    return sorted(entries, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import and first-construction time")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--importtime', type=int, default=0, metavar='N',
+                        help="Also list the N slowest imports of orchestrator")
+    args = parser.parse_args()
+
+    print(f"⏱️  Cold start over {args.runs} fresh interpreters")
+    for label, code in STEPS.items():
+        samples = [time_in_subprocess(code) * 1000 for _ in range(args.runs)]
+        print(f"   {label:<28} median {statistics.median(samples):8.1f} ms   max {max(samples):8.1f} ms")
+
+    if args.importtime:
+        print("\n🐢 Slowest imports (cumulative):")
+        for cumulative_us, name in import_time_report('orchestrator', args.importtime):
+            print(f"   {cumulative_us / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Debounced community trust score recomputation
+Signal changes in Supabase only mark the influencer in community_score_dirty
+(see SUPABASE_SETUP_COMPLETE.sql). This worker wakes up every `interval`
+seconds, claims a batch of dirty influencers and recomputes their
+community_trust_scores rows in one set-based statement, so a burst of
+ratings on a viral influencer is folded into a single recomputation.
+
+Usage:
+    python community_worker.py --target "$SUPABASE_DB_URL" --interval 5
+    python community_worker.py --target ... --once
+"""
+
+import argparse
+import time
+
+from sqlalchemy import create_engine, text
+
+import config
+import database
+
+# Same formula as update_community_trust_score() in SUPABASE_SETUP_COMPLETE.sql.
+# Claimed rows are deleted in the same transaction; a signal changing meanwhile
+# re-marks its influencer for the next pass. SKIP LOCKED lets workers run side by side.
+RECOMPUTE_SQL = text("""
+    WITH claimed AS (
+        DELETE FROM community_score_dirty
+        WHERE influencer_id IN (
+            SELECT influencer_id FROM community_score_dirty
+            ORDER BY marked_at
+            LIMIT :batch_size
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING influencer_id
+    ), stats AS (
+        SELECT
+            c.influencer_id,
+            COALESCE(AVG(s.rating), 0) AS avg_rating,
+            COUNT(*) FILTER (WHERE s.type = 'RATING') AS total_ratings,
+            COUNT(*) FILTER (WHERE s.type = 'DRAMA_REPORT') AS total_drama,
+            COUNT(*) FILTER (WHERE s.type = 'POSITIVE_ACTION') AS total_positive,
+            COUNT(*) FILTER (WHERE s.type = 'COMMENT') AS total_comments
+        FROM claimed c
+        LEFT JOIN community_signals s ON s.influencer_id = c.influencer_id AND s.is_hidden = false
+        GROUP BY c.influencer_id
+    ), scored AS (
+        SELECT
+            stats.*,
+            GREATEST(0, LEAST(100,
+                50 + ((avg_rating - 2.5) * 8) - (total_drama * 2) + (total_positive * 3)
+            )) AS community_score
+        FROM stats
+    )
+    INSERT INTO community_trust_scores (
+        influencer_id, avg_rating, total_ratings, total_drama_reports,
+        total_positive_reports, total_comments, community_score, combined_score, last_updated
+    )
+    SELECT
+        sc.influencer_id, sc.avg_rating, sc.total_ratings, sc.total_drama,
+        sc.total_positive, sc.total_comments, sc.community_score,
+        (i.trust_score * 0.6) + (sc.community_score * 0.4), NOW()
+    FROM scored sc
+    JOIN influencers i ON i.id = sc.influencer_id
+    ON CONFLICT (influencer_id) DO UPDATE SET
+        avg_rating = EXCLUDED.avg_rating,
+        total_ratings = EXCLUDED.total_ratings,
+        total_drama_reports = EXCLUDED.total_drama_reports,
+        total_positive_reports = EXCLUDED.total_positive_reports,
+        total_comments = EXCLUDED.total_comments,
+        community_score = EXCLUDED.community_score,
+        combined_score = EXCLUDED.combined_score,
+        last_updated = EXCLUDED.last_updated
+""")
+
+
+def recompute_batch(target, batch_size: int = 500) -> int:
+    """Recompute up to batch_size dirty influencers. Returns scores written."""
+    with target.begin() as conn:
+        return conn.execute(RECOMPUTE_SQL, {'batch_size': batch_size}).rowcount
+
+
+def drain(target, batch_size: int = 500) -> int:
+    """Recompute batches until the dirty set is empty"""
+    total = 0
+    while True:
+        written = recompute_batch(target, batch_size)
+        total += written
+        if written < batch_size:
+            return total
+
+
+def run(target, interval: float = 5.0, batch_size: int = 500):
+    """Drain the dirty set every `interval` seconds, forever"""
+    while True:
+        started = time.monotonic()
+        written = drain(target, batch_size)
+        if written:
+            print(f"🔄 Recomputed {written} community scores")
+        time.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute dirty community trust scores in batches")
+    parser.add_argument('--target', default=getattr(config, 'SUPABASE_DATABASE_URL', None),
+                        help="Postgres URL of the Supabase database (default: config.SUPABASE_DATABASE_URL)")
+    parser.add_argument('--interval', type=float, default=5.0, help="Seconds between passes")
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--once', action='store_true', help="Drain the dirty set once and exit")
+    args = parser.parse_args()
+    if not args.target:
+        parser.error("--target or config.SUPABASE_DATABASE_URL is required")
+
+    target_url, target_options = database._engine_url_and_options(args.target)
+    target = create_engine(target_url, **target_options)
+
+    if args.once:
+        print(f"✅ Recomputed {drain(target, args.batch_size)} community scores")
+    else:
+        print(f"👷 Community score worker started (every {args.interval:g}s)")
+        run(target, args.interval, args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
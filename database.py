@@ -1,8 +1,10 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Text, ForeignKey, Index
+from sqlalchemy import create_engine, event, Column, Integer, String, Float, DateTime, Text, ForeignKey, Index, text, func, case
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
-from datetime import datetime
+from sqlalchemy.orm import Session, sessionmaker, relationship
+from datetime import datetime, timedelta
+import threading
 import config
+from name_index import normalize_name, display_name, notify_insert
 
 Base = declarative_base()
 
@@ -24,20 +26,33 @@ class Contributor(Base):
         Index('idx_analyses_count', 'analyses_count'),
     )
 
-class ContributorStats(Base):
-    __tablename__ = 'contributor_stats'
+class ContributorDailyStats(Base):
+    """Points per contributor and UTC calendar day; week/month totals are range sums"""
+    __tablename__ = 'contributor_daily_stats'
     
     id = Column(Integer, primary_key=True)
     contributor_id = Column(Integer, ForeignKey('contributors.id'), nullable=False)
-    period = Column(String(20), nullable=False)  # 'day', 'week', 'month'
-    period_start = Column(DateTime, nullable=False)
+    day = Column(DateTime, nullable=False)  # midnight UTC
     points_earned = Column(Integer, default=0)
     analyses_count = Column(Integer, default=0)
     
     # Indexes for efficient queries
     __table_args__ = (
-        Index('idx_contributor_period', 'contributor_id', 'period', 'period_start'),
-        Index('idx_period_points', 'period', 'points_earned'),
+        Index('idx_daily_contributor_day', 'contributor_id', 'day', unique=True),
+        Index('idx_daily_day', 'day', 'contributor_id'),
+    )
+
+class ContributorAchievement(Base):
+    """Badge unlocked by a contributor (see ACHIEVEMENT_RULES)"""
+    __tablename__ = 'contributor_achievements'
+    
+    id = Column(Integer, primary_key=True)
+    contributor_id = Column(Integer, ForeignKey('contributors.id'), nullable=False)
+    achievement_key = Column(String(50), nullable=False)
+    unlocked_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        Index('idx_achievement_contributor', 'contributor_id', 'achievement_key', unique=True),
     )
 
 class Influencer(Base):
@@ -45,6 +60,7 @@ class Influencer(Base):
     
     id = Column(Integer, primary_key=True)
     name = Column(String(255), unique=True, nullable=False)
+    normalized_name = Column(String(255), unique=True, nullable=True)  # see name_index.normalize_name
     trust_score = Column(Float, default=50.0)
     drama_count = Column(Integer, default=0)
     good_action_count = Column(Integer, default=0)
@@ -62,6 +78,29 @@ class Mention(Base):
     sentiment_score = Column(Float, nullable=False)  # -1 to 1
     label = Column(String(20), nullable=False)  # drama, good_action, neutral
     scraped_at = Column(DateTime, default=datetime.utcnow)
+    cluster_id = Column(String(16), nullable=True)  # near-duplicate cluster (see dedup.py)
+    duplicate_count = Column(Integer, default=0)
+    
+    __table_args__ = (
+        Index('idx_mention_cluster', 'cluster_id'),
+        # Serves keyset pagination in get_mention_page
+        Index('idx_mention_influencer_scraped', 'influencer_name', 'scraped_at', 'id'),
+    )
+
+class MentionDuplicate(Base):
+    """Near-duplicate of a stored Mention, kept as cluster membership only"""
+    __tablename__ = 'mention_duplicates'
+    
+    id = Column(Integer, primary_key=True)
+    cluster_id = Column(String(16), nullable=False)
+    influencer_name = Column(String(255), nullable=False)
+    source = Column(String(50), nullable=False)
+    url = Column(Text, nullable=False)
+    scraped_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        Index('idx_duplicate_cluster', 'cluster_id'),
+    )
 
 class AnalysisHistory(Base):
     __tablename__ = 'analysis_history'
@@ -81,35 +120,223 @@ class AnalysisHistory(Base):
         Index('idx_contributor_date', 'contributor_id', 'analyzed_at'),
     )
 
+class LeaderboardVersion(Base):
+    """Single-row version counter for cross-process leaderboard cache invalidation"""
+    __tablename__ = 'leaderboard_version'
+    
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+class SyncCheckpoint(Base):
+    """High-water mark of one outbound sync stream (see supabase_sync.py)"""
+    __tablename__ = 'sync_checkpoints'
+    
+    stream = Column(String(100), primary_key=True)  # e.g. 'supabase:mentions'
+    last_id = Column(Integer, nullable=False, default=0)
+    rows_synced = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+class MentionArchive(Base):
+    """Aggregates for mentions rolled out of the hot table into an archive file (see retention.py)"""
+    __tablename__ = 'mention_archives'
+    
+    id = Column(Integer, primary_key=True)
+    influencer_name = Column(String(255), nullable=False)
+    month = Column(DateTime, nullable=False)
+    path = Column(Text, nullable=False)
+    format = Column(String(20), nullable=False)  # 'parquet', 'arrow'
+    row_count = Column(Integer, nullable=False)
+    drama_count = Column(Integer, default=0)
+    good_action_count = Column(Integer, default=0)
+    neutral_count = Column(Integer, default=0)
+    sentiment_sum = Column(Float, default=0.0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        Index('idx_archive_influencer_month', 'influencer_name', 'month'),
+    )
+
+class ScoreRollup(Base):
+    """Trust score time series downsampled per influencer (hour/day/week buckets)"""
+    __tablename__ = 'score_rollups'
+    
+    id = Column(Integer, primary_key=True)
+    influencer_name = Column(String(255), nullable=False)
+    resolution = Column(String(10), nullable=False)  # 'hour', 'day', 'week'
+    bucket_start = Column(DateTime, nullable=False)
+    min_score = Column(Float, nullable=False)
+    max_score = Column(Float, nullable=False)
+    sum_score = Column(Float, nullable=False)
+    count = Column(Integer, nullable=False)
+    last_score = Column(Float, nullable=False)
+    last_at = Column(DateTime, nullable=False)
+    
+    __table_args__ = (
+        Index('idx_rollup_bucket', 'influencer_name', 'resolution', 'bucket_start', unique=True),
+    )
+
+class RankingSnapshot(Base):
+    """Daily leaderboard positions, one narrow row per contributor and period"""
+    __tablename__ = 'ranking_snapshots'
+    
+    id = Column(Integer, primary_key=True)
+    period = Column(String(10), nullable=False)  # 'day', 'week', 'month', 'all'
+    snapshot_date = Column(DateTime, nullable=False)  # midnight UTC of the snapshot day
+    contributor_id = Column(Integer, nullable=False)
+    rank = Column(Integer, nullable=False)
+    
+    __table_args__ = (
+        Index('idx_snapshot_lookup', 'period', 'snapshot_date', 'contributor_id', unique=True),
+    )
+
+# Full-text search over Mention.text_excerpt
+# SQLite: external-content FTS5 table kept in sync by triggers
+# Postgres: expression GIN index on a French tsvector
+SQLITE_SEARCH_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS mentions_fts USING fts5(
+        text_excerpt, content='mentions', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS mentions_fts_insert AFTER INSERT ON mentions BEGIN
+        INSERT INTO mentions_fts(rowid, text_excerpt) VALUES (new.id, new.text_excerpt);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS mentions_fts_delete AFTER DELETE ON mentions BEGIN
+        INSERT INTO mentions_fts(mentions_fts, rowid, text_excerpt) VALUES ('delete', old.id, old.text_excerpt);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS mentions_fts_update AFTER UPDATE OF text_excerpt ON mentions BEGIN
+        INSERT INTO mentions_fts(mentions_fts, rowid, text_excerpt) VALUES ('delete', old.id, old.text_excerpt);
+        INSERT INTO mentions_fts(rowid, text_excerpt) VALUES (new.id, new.text_excerpt);
+    END""",
+]
+
+POSTGRES_SEARCH_DDL = [
+    "CREATE INDEX IF NOT EXISTS idx_mentions_fts ON mentions USING GIN (to_tsvector('french', text_excerpt))",
+]
+
+def init_search_index(bind):
+    """Create the full-text index for the engine's dialect (idempotent)"""
+    dialect = bind.dialect.name
+    with bind.begin() as conn:
+        if dialect == 'sqlite':
+            exists = conn.execute(text(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name='mentions_fts'"
+            )).first()
+            for statement in SQLITE_SEARCH_DDL:
+                conn.execute(text(statement))
+            if not exists:
+                # Index mentions stored before the FTS table existed
+                conn.execute(text("INSERT INTO mentions_fts(mentions_fts) VALUES ('rebuild')"))
+        elif dialect == 'postgresql':
+            for statement in POSTGRES_SEARCH_DDL:
+                conn.execute(text(statement))
+
+def _engine_url_and_options(url):
+    """Engine URL and dialect-specific options (Postgres gets the production settings)"""
+    import importlib.util
+    options = {}
+    if url.startswith('postgres://'):
+        # Supabase/Heroku style URL, not accepted by SQLAlchemy
+        url = 'postgresql://' + url[len('postgres://'):]
+    if url.startswith('postgresql'):
+        options['pool_pre_ping'] = True
+        if url.startswith('postgresql://') and importlib.util.find_spec('psycopg'):
+            # psycopg2 (SQLAlchemy's default driver) never prepares statements; psycopg 3 can
+            url = 'postgresql+psycopg://' + url[len('postgresql://'):]
+        if url.startswith('postgresql+psycopg:'):
+            # Prepare a statement server-side from its second execution on a connection
+            # (psycopg waits for 5). None turns it off, as needed behind a transaction pooler.
+            options['connect_args'] = {'prepare_threshold': getattr(config, 'PG_PREPARE_THRESHOLD', 1)}
+    return url, options
+
 # Database setup
-engine = create_engine(config.DATABASE_URL)
-Base.metadata.create_all(engine)
+# Creating the engine does not connect; the schema check runs once per
+# process on first use instead of at import time
+_engine_url, _engine_options = _engine_url_and_options(config.DATABASE_URL)
+engine = create_engine(_engine_url, **_engine_options)
 SessionLocal = sessionmaker(bind=engine)
 
+_schema_ready = False
+_schema_creating = False
+_schema_lock = threading.RLock()
+
+def ensure_schema():
+    """Create missing tables and the search index, once per process"""
+    global _schema_ready, _schema_creating
+    if _schema_ready:
+        return
+    with _schema_lock:
+        # create_all's own connection re-enters here through the connect hook below
+        if _schema_ready or _schema_creating:
+            return
+        _schema_creating = True
+        try:
+            Base.metadata.create_all(engine)
+            init_search_index(engine)
+            _schema_ready = True
+        finally:
+            _schema_creating = False
+
+@event.listens_for(engine, 'engine_connect')
+def _ensure_schema_on_connect(connection):
+    # Code that uses `engine` directly, without a session, still gets the schema
+    if not _schema_ready:
+        ensure_schema()
+
 def get_db():
     """Get database session"""
+    ensure_schema()
     db = SessionLocal()
     try:
         return db
     finally:
         pass
 
+def enable_query_profiling(n_plus_one_threshold=5):
+    """Opt in to per-statement SQL profiling (see query_profiler.py)"""
+    from query_profiler import QueryProfiler
+    return QueryProfiler(engine, n_plus_one_threshold=n_plus_one_threshold).enable()
+
 def init_db():
     """Initialize database tables"""
-    Base.metadata.create_all(engine)
+    ensure_schema()
     print("Database initialized successfully!")
 
+def find_influencer(db, name):
+    """Find an influencer by normalized name (case, accents and spacing ignored)"""
+    key = normalize_name(name)
+    influencer = db.query(Influencer).filter(Influencer.normalized_name == key).first()
+    if not influencer:
+        # Rows created before normalized names existed: SQL lower() only folds
+        # ASCII (and not accents), so compare their keys in Python
+        legacy = db.query(Influencer.id, Influencer.name).filter(
+            Influencer.normalized_name.is_(None)
+        ).order_by(Influencer.id)
+        match = next((row.id for row in legacy if normalize_name(row.name) == key), None)
+        if match is not None:
+            influencer = db.get(Influencer, match)
+            influencer.normalized_name = key
+            db.commit()
+    return influencer
+
+def resolve_influencer_name(db, name):
+    """Canonical stored name for `name`, or the cleaned-up input if unknown"""
+    influencer = find_influencer(db, name)
+    return influencer.name if influencer else display_name(name)
+
 def get_or_create_influencer(db, name):
     """Get existing influencer or create new one"""
-    influencer = db.query(Influencer).filter(Influencer.name == name).first()
+    influencer = find_influencer(db, name)
     if not influencer:
-        influencer = Influencer(name=name)
+        influencer = Influencer(name=display_name(name), normalized_name=normalize_name(name))
         db.add(influencer)
         db.commit()
         db.refresh(influencer)
+        notify_insert(influencer.name)
     return influencer
 
-def save_mention(db, influencer_name, source, url, text_excerpt, sentiment_score, label):
+def save_mention(db, influencer_name, source, url, text_excerpt, sentiment_score, label, cluster_id=None, duplicate_count=0,
+                 scraped_at=None):
     """Save a mention to database"""
     mention = Mention(
         influencer_name=influencer_name,
@@ -117,12 +344,102 @@ def save_mention(db, influencer_name, source, url, text_excerpt, sentiment_score
         url=url,
         text_excerpt=text_excerpt,
         sentiment_score=sentiment_score,
-        label=label
+        label=label,
+        cluster_id=cluster_id,
+        duplicate_count=duplicate_count,
+        scraped_at=scraped_at or datetime.utcnow()
     )
     db.add(mention)
     db.commit()
     return mention
 
+MENTION_COPY_COLUMNS = ('influencer_name', 'source', 'url', 'text_excerpt', 'sentiment_score', 'label',
+                        'scraped_at', 'cluster_id', 'duplicate_count')
+
+def save_mentions_bulk(db, influencer_name, mentions):
+    """
+    Save many mentions in one round trip
+    
+    `mentions` are dicts with save_mention's keyword arguments. Postgres
+    streams them with COPY; other backends use a single executemany INSERT.
+    Returns the number of rows written.
+    """
+    if not mentions:
+        return 0
+    now = datetime.utcnow()
+    rows = [{
+        'influencer_name': influencer_name,
+        'source': m['source'],
+        'url': m['url'],
+        'text_excerpt': m['text_excerpt'],
+        'sentiment_score': m['sentiment_score'],
+        'label': m['label'],
+        'scraped_at': m.get('scraped_at') or now,
+        'cluster_id': m.get('cluster_id'),
+        'duplicate_count': m.get('duplicate_count') or 0
+    } for m in mentions]
+    
+    if db.get_bind().dialect.name == 'postgresql':
+        _copy_mentions(db, rows)
+    else:
+        from sqlalchemy import insert
+        db.execute(insert(Mention), rows)
+    db.commit()
+    return len(rows)
+
+def _copy_mentions(db, rows):
+    """COPY rows into mentions through the session's psycopg connection"""
+    import csv
+    import io
+    
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([row[column] for column in MENTION_COPY_COLUMNS])
+    
+    # Empty unquoted CSV fields are NULL by default; keep them as '' for NOT NULL text columns
+    statement = (
+        f"COPY mentions ({', '.join(MENTION_COPY_COLUMNS)}) FROM STDIN "
+        "WITH (FORMAT csv, FORCE_NOT_NULL (influencer_name, source, url, text_excerpt, label))"
+    )
+    cursor = db.connection().connection.cursor()
+    try:
+        if hasattr(cursor, 'copy_expert'):  # psycopg2
+            buffer.seek(0)
+            cursor.copy_expert(statement, buffer)
+        else:  # psycopg 3
+            with cursor.copy(statement) as copy:
+                copy.write(buffer.getvalue())
+    finally:
+        cursor.close()
+
+def _upsert(db, model, values, index_elements, set_):
+    """
+    INSERT ... ON CONFLICT DO UPDATE on Postgres and SQLite
+    
+    `set_` receives the `excluded` row and returns the columns to update.
+    Returns False on other backends so the caller can fall back to
+    read-then-write.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return False
+    statement = insert(model).values(**values)
+    db.execute(statement.on_conflict_do_update(index_elements=index_elements, set_=set_(statement.excluded)))
+    return True
+
+def save_mention_duplicates(db, influencer_name, duplicates):
+    """Save near-duplicate cluster membership as (cluster_id, source, url) tuples"""
+    db.add_all([
+        MentionDuplicate(influencer_name=influencer_name, cluster_id=cluster_id, source=source, url=url)
+        for cluster_id, source, url in duplicates
+    ])
+    db.commit()
+
 def update_influencer_score(db, name, trust_score, drama_count, good_action_count, contributor_id=None, points_awarded=10, quality_score=1.0):
     """Update influencer trust score"""
     influencer = get_or_create_influencer(db, name)
@@ -133,7 +450,7 @@ def update_influencer_score(db, name, trust_score, drama_count, good_action_coun
     
     # Save to history
     history = AnalysisHistory(
-        influencer_name=name,
+        influencer_name=influencer.name,
         contributor_id=contributor_id,
         trust_score=trust_score,
         drama_count=drama_count,
@@ -142,6 +459,7 @@ def update_influencer_score(db, name, trust_score, drama_count, good_action_coun
         quality_score=quality_score
     )
     db.add(history)
+    _update_score_rollups(db, influencer.name, trust_score, influencer.last_updated)
     db.commit()
     
     # Update contributor stats if provided
@@ -150,24 +468,423 @@ def update_influencer_score(db, name, trust_score, drama_count, good_action_coun
     
     return influencer
 
-def get_influencer_mentions(db, name, limit=50):
-    """Get recent mentions for an influencer"""
-    return db.query(Mention).filter(
-        Mention.influencer_name == name
-    ).order_by(Mention.scraped_at.desc()).limit(limit).all()
+# Trust score rollups
+
+ROLLUP_RESOLUTIONS = [
+    ('hour', timedelta(hours=1)),
+    ('day', timedelta(days=1)),
+    ('week', timedelta(weeks=1)),
+]
+
+def rollup_bucket_start(resolution, when):
+    """Start of the hour/day/week (Monday) bucket containing `when`"""
+    if resolution == 'hour':
+        return when.replace(minute=0, second=0, microsecond=0)
+    day = when.replace(hour=0, minute=0, second=0, microsecond=0)
+    if resolution == 'week':
+        return day - timedelta(days=day.weekday())
+    return day
+
+def _update_score_rollups(db, name, trust_score, when):
+    """Fold one score into the hour/day/week buckets (caller commits)"""
+    dialect = db.get_bind().dialect.name
+    least, greatest = (func.least, func.greatest) if dialect == 'postgresql' else (func.min, func.max)
+    
+    for resolution, _ in ROLLUP_RESOLUTIONS:
+        bucket_start = rollup_bucket_start(resolution, when)
+        values = dict(
+            influencer_name=name,
+            resolution=resolution,
+            bucket_start=bucket_start,
+            min_score=trust_score,
+            max_score=trust_score,
+            sum_score=trust_score,
+            count=1,
+            last_score=trust_score,
+            last_at=when
+        )
+        
+        def merge(excluded):
+            newer = excluded.last_at >= ScoreRollup.last_at
+            return {
+                'min_score': least(ScoreRollup.min_score, excluded.min_score),
+                'max_score': greatest(ScoreRollup.max_score, excluded.max_score),
+                'sum_score': ScoreRollup.sum_score + excluded.sum_score,
+                'count': ScoreRollup.count + excluded.count,
+                'last_score': case((newer, excluded.last_score), else_=ScoreRollup.last_score),
+                'last_at': case((newer, excluded.last_at), else_=ScoreRollup.last_at),
+            }
+        
+        if _upsert(db, ScoreRollup, values, ['influencer_name', 'resolution', 'bucket_start'], merge):
+            continue
+        
+        rollup = db.query(ScoreRollup).filter(
+            ScoreRollup.influencer_name == name,
+            ScoreRollup.resolution == resolution,
+            ScoreRollup.bucket_start == bucket_start
+        ).first()
+        
+        if not rollup:
+            db.add(ScoreRollup(
+                influencer_name=name,
+                resolution=resolution,
+                bucket_start=bucket_start,
+                min_score=trust_score,
+                max_score=trust_score,
+                sum_score=trust_score,
+                count=1,
+                last_score=trust_score,
+                last_at=when
+            ))
+            continue
+        
+        rollup.min_score = min(rollup.min_score, trust_score)
+        rollup.max_score = max(rollup.max_score, trust_score)
+        rollup.sum_score += trust_score
+        rollup.count += 1
+        if when >= rollup.last_at:
+            rollup.last_score = trust_score
+            rollup.last_at = when
+
+def _rollup_bucket_sql(dialect, resolution, column):
+    """SQL expression for rollup_bucket_start(resolution, column), or None if unsupported"""
+    if dialect == 'postgresql':
+        return func.date_trunc(resolution, column)  # Postgres weeks start on Monday too
+    if dialect == 'sqlite':
+        # Same text format as SQLAlchemy's SQLite DateTime
+        if resolution == 'hour':
+            return func.strftime('%Y-%m-%d %H:00:00.000000', column)
+        if resolution == 'day':
+            return func.strftime('%Y-%m-%d 00:00:00.000000', column)
+        return func.strftime('%Y-%m-%d 00:00:00.000000', column, 'weekday 0', '-6 days')
+    return None
 
-def get_influencer_data(db, name):
-    """Get complete influencer data"""
-    influencer = db.query(Influencer).filter(Influencer.name == name).first()
+def rebuild_score_rollups(db, name=None):
+    """
+    Recompute rollups from AnalysisHistory (for data written before rollups existed)
+    One grouped INSERT ... SELECT per resolution on Postgres and SQLite.
+    """
+    from sqlalchemy import insert, literal, select
+    
+    rollups = db.query(ScoreRollup)
+    history = db.query(AnalysisHistory)
+    if name:
+        rollups = rollups.filter(ScoreRollup.influencer_name == name)
+        history = history.filter(AnalysisHistory.influencer_name == name)
+    rollups.delete(synchronize_session=False)
+    db.flush()
+    
+    dialect = db.get_bind().dialect.name
+    if _rollup_bucket_sql(dialect, 'hour', AnalysisHistory.analyzed_at) is None:
+        for entry in history.order_by(AnalysisHistory.analyzed_at).yield_per(1000):
+            _update_score_rollups(db, entry.influencer_name, entry.trust_score, entry.analyzed_at)
+            db.flush()
+        db.commit()
+        return
+    
+    for resolution, _ in ROLLUP_RESOLUTIONS:
+        bucket = _rollup_bucket_sql(dialect, resolution, AnalysisHistory.analyzed_at)
+        # Latest score per bucket (ties go to the later row, like the incremental merge)
+        scores = select(
+            AnalysisHistory.influencer_name,
+            bucket.label('bucket_start'),
+            AnalysisHistory.trust_score,
+            AnalysisHistory.analyzed_at,
+            func.first_value(AnalysisHistory.trust_score).over(
+                partition_by=(AnalysisHistory.influencer_name, bucket),
+                order_by=(AnalysisHistory.analyzed_at.desc(), AnalysisHistory.id.desc())
+            ).label('last_score')
+        ).where(AnalysisHistory.analyzed_at.isnot(None))
+        if name:
+            scores = scores.where(AnalysisHistory.influencer_name == name)
+        scores = scores.subquery()
+        
+        buckets = select(
+            scores.c.influencer_name,
+            literal(resolution),
+            scores.c.bucket_start,
+            func.min(scores.c.trust_score),
+            func.max(scores.c.trust_score),
+            func.sum(scores.c.trust_score),
+            func.count(),
+            func.max(scores.c.last_score),
+            func.max(scores.c.analyzed_at)
+        ).group_by(scores.c.influencer_name, scores.c.bucket_start)
+        db.execute(insert(ScoreRollup).from_select([
+            'influencer_name', 'resolution', 'bucket_start', 'min_score', 'max_score',
+            'sum_score', 'count', 'last_score', 'last_at'
+        ], buckets))
+    db.commit()
+
+def get_score_series(db, name, start=None, end=None, max_points=200):
+    """
+    Trust score history for charting
+    Picks the finest resolution that fits `max_points` buckets in
+    [start, end] (default: the last 30 days), so the cost follows the
+    number of points drawn rather than the size of the history.
+    """
+    end = end or datetime.utcnow()
+    start = start or end - timedelta(days=30)
+    
+    resolution = ROLLUP_RESOLUTIONS[-1][0]
+    for candidate, size in ROLLUP_RESOLUTIONS:
+        if (end - start) / size <= max_points:
+            resolution = candidate
+            break
+    
+    rollups = db.query(ScoreRollup).filter(
+        ScoreRollup.influencer_name == name,
+        ScoreRollup.resolution == resolution,
+        ScoreRollup.bucket_start >= rollup_bucket_start(resolution, start),
+        ScoreRollup.bucket_start <= end
+    ).order_by(ScoreRollup.bucket_start).all()
+    
+    return {
+        'resolution': resolution,
+        'points': [{
+            'bucket_start': r.bucket_start,
+            'min': r.min_score,
+            'max': r.max_score,
+            'avg': r.sum_score / r.count,
+            'last': r.last_score,
+            'count': r.count
+        } for r in rollups]
+    }
+
+def get_influencer_mentions(db, name, limit=50, since=None):
+    """Get recent mentions for an influencer (all of them when limit is None)"""
+    query = db.query(Mention).filter(Mention.influencer_name == name)
+    if since:
+        query = query.filter(Mention.scraped_at >= since)
+    return query.order_by(Mention.scraped_at.desc()).limit(limit).all()
+
+def get_mention_page(db, name, label=None, source=None, limit=20, cursor=None, since=None):
+    """
+    One page of an influencer's mentions, newest first (only those scraped
+    from `since` on when given, e.g. one analysis run)
+    
+    Returns {'mentions': [...], 'next_cursor': str or None}. Pass next_cursor
+    back as `cursor` to get the following page (keyset on scraped_at, id).
+    """
+    query = db.query(Mention).filter(Mention.influencer_name == name)
+    if since:
+        query = query.filter(Mention.scraped_at >= since)
+    if label:
+        query = query.filter(Mention.label == label)
+    if source:
+        query = query.filter(Mention.source == source)
+    if cursor:
+        last_scraped, last_id = cursor.rsplit('|', 1)
+        last_scraped = datetime.fromisoformat(last_scraped)
+        last_id = int(last_id)
+        query = query.filter(
+            (Mention.scraped_at < last_scraped) |
+            ((Mention.scraped_at == last_scraped) & (Mention.id < last_id))
+        )
+    
+    mentions = query.order_by(Mention.scraped_at.desc(), Mention.id.desc()).limit(limit + 1).all()
+    
+    next_cursor = None
+    if len(mentions) > limit:
+        mentions = mentions[:limit]
+        last = mentions[-1]
+        next_cursor = f"{last.scraped_at.isoformat()}|{last.id}"
+    
+    return {'mentions': mentions, 'next_cursor': next_cursor}
+
+def get_mention_label_counts(db, name, source=None, since=None):
+    """Mention count per label for an influencer, computed in the database"""
+    query = db.query(Mention.label, func.count(Mention.id)).filter(Mention.influencer_name == name)
+    if source:
+        query = query.filter(Mention.source == source)
+    if since:
+        query = query.filter(Mention.scraped_at >= since)
+    counts = {'drama': 0, 'good_action': 0, 'neutral': 0}
+    for label, count in query.group_by(Mention.label):
+        counts[label] = count
+    return counts
+
+def get_mention_source_counts(db, name, since=None):
+    """Mention count per source for an influencer, computed in the database"""
+    query = db.query(Mention.source, func.count(Mention.id)).filter(Mention.influencer_name == name)
+    if since:
+        query = query.filter(Mention.scraped_at >= since)
+    return dict(query.group_by(Mention.source).all())
+
+def get_latest_run_window(db, name):
+    """
+    (start, analyzed_at) of the influencer's latest analysis run, from analysis_history
+    Its mentions were scraped after the previous run was recorded (start, None
+    for the first run) and before analyzed_at. Rows saved before runs shared
+    one scraped_at each carry their own timestamp, so the run cannot be read
+    from the mentions themselves.
+    """
+    recorded = [analyzed_at for (analyzed_at,) in db.query(AnalysisHistory.analyzed_at).filter(
+        AnalysisHistory.influencer_name == name
+    ).order_by(AnalysisHistory.analyzed_at.desc(), AnalysisHistory.id.desc()).limit(2)]
+    if not recorded:
+        return None, None
+    return (recorded[1] if len(recorded) > 1 else None), recorded[0]
+
+def get_influencer_data(db, name, include_archive=False, since=None):
+    """
+    Get complete influencer data
+    include_archive returns the full history: every hot mention plus those
+    rolled into archive files. `since` limits both to mentions scraped after it.
+    """
+    influencer = find_influencer(db, name)
     if not influencer:
         return None
     
-    mentions = get_influencer_mentions(db, name)
+    if include_archive:
+        from retention import read_archived_mentions
+        mentions = get_influencer_mentions(db, influencer.name, limit=None, since=since)
+        mentions += read_archived_mentions(db, influencer.name, since)
+        mentions.sort(key=lambda m: m.scraped_at, reverse=True)
+    else:
+        mentions = get_influencer_mentions(db, influencer.name, since=since)
     return {
         'influencer': influencer,
         'mentions': mentions
     }
 
+def _fts5_query(query):
+    """Quote each term so user input cannot break FTS5 syntax; a trailing * keeps prefix search"""
+    terms = []
+    for term in query.split():
+        prefix = term.endswith('*')
+        term = term.rstrip('*').replace('"', '""')
+        if term:
+            terms.append(f'"{term}"*' if prefix else f'"{term}"')
+    return ' '.join(terms)
+
+def search_mentions(db, query, influencer=None, label=None, limit=20, cursor=None):
+    """
+    Ranked full-text search over mention text
+    
+    Returns {'results': [...], 'next_cursor': str or None}. Pass next_cursor
+    back as `cursor` to get the following page (keyset on rounded rank, id).
+    """
+    dialect = db.get_bind().dialect.name
+    params = {'limit': limit + 1}
+    filters = []
+    
+    if dialect == 'sqlite':
+        params['query'] = _fts5_query(query)
+        if not params['query']:
+            return {'results': [], 'next_cursor': None}
+        rank_expr = 'bm25(mentions_fts)'
+        source = 'mentions_fts JOIN mentions m ON m.id = mentions_fts.rowid'
+        filters.append('mentions_fts MATCH :query')
+        excerpt = "snippet(mentions_fts, 0, '[', ']', '…', 24)"
+    elif dialect == 'postgresql':
+        params['query'] = query
+        tsquery = "websearch_to_tsquery('french', :query)"
+        # Negated so that, as with bm25, a lower rank is a better match
+        rank_expr = f"-ts_rank_cd(to_tsvector('french', m.text_excerpt), {tsquery})"
+        source = 'mentions m'
+        filters.append(f"to_tsvector('french', m.text_excerpt) @@ {tsquery}")
+        excerpt = 'm.text_excerpt'
+    else:
+        # Portable fallback without an index
+        params['query'] = f"%{query}%"
+        rank_expr = '0.0'
+        source = 'mentions m'
+        filters.append('m.text_excerpt LIKE :query')
+        excerpt = 'm.text_excerpt'
+    
+    if influencer:
+        filters.append('m.influencer_name = :influencer')
+        params['influencer'] = resolve_influencer_name(db, influencer)
+    if label:
+        filters.append('m.label = :label')
+        params['label'] = label
+    # Pages are keyed on the rank rounded to an integer (micro-units) then the id,
+    # so the cursor comparison is exact instead of an equality test on floats
+    rank_key = f"CAST(round(({rank_expr}) * 1000000) AS BIGINT)"
+    if cursor:
+        last_rank, last_id = cursor.split(':')
+        filters.append(f'({rank_key} > :last_rank OR ({rank_key} = :last_rank AND m.id > :last_id))')
+        params['last_rank'] = int(last_rank)
+        params['last_id'] = int(last_id)
+    
+    rows = db.execute(text(f"""
+        SELECT m.id, m.influencer_name, m.source, m.url, m.label, m.sentiment_score,
+               m.scraped_at, {excerpt} AS excerpt, {rank_expr} AS rank, {rank_key} AS rank_key
+        FROM {source}
+        WHERE {' AND '.join(filters)}
+        ORDER BY rank_key, m.id
+        LIMIT :limit
+    """), params).fetchall()
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = f"{rows[-1].rank_key}:{rows[-1].id}"
+    
+    return {
+        'results': [{
+            'id': r.id,
+            'influencer_name': r.influencer_name,
+            'source': r.source,
+            'url': r.url,
+            'label': r.label,
+            'sentiment_score': r.sentiment_score,
+            'scraped_at': r.scraped_at,
+            'excerpt': r.excerpt,
+            'rank': float(r.rank)
+        } for r in rows],
+        'next_cursor': next_cursor
+    }
+
+# Leaderboard cache versioning
+
+# Bumped after every committed contributor stats write in this process
+_leaderboard_version = 0
+_leaderboard_version_lock = threading.Lock()
+
+# Also keep the version in the leaderboard_version table so other processes see writes.
+# Needed whenever writers run in other processes (jobs.py, several app workers):
+# without it their changes only show up here once the rankings cache turns over.
+SHARED_LEADERBOARD_VERSION = getattr(config, 'SHARED_LEADERBOARD_VERSION', False)
+
+@event.listens_for(Session, 'after_commit')
+def _publish_leaderboard_version(session):
+    # Bumping before commit would let a reader cache pre-commit rankings under the new version
+    global _leaderboard_version
+    if session.info.pop('leaderboard_dirty', False):
+        with _leaderboard_version_lock:
+            _leaderboard_version += 1
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_leaderboard_version(session, previous_transaction):
+    session.info.pop('leaderboard_dirty', None)
+
+def bump_leaderboard_version(db):
+    """
+    Invalidate cached leaderboards once the caller commits (the shared row
+    is updated in the caller's transaction)
+    """
+    if not db.in_transaction():
+        # Tie the mark to a transaction so a rollback discards it
+        db.begin()
+    db.info['leaderboard_dirty'] = True
+    if SHARED_LEADERBOARD_VERSION:
+        updated = db.query(LeaderboardVersion).filter(LeaderboardVersion.id == 1).update({
+            LeaderboardVersion.version: LeaderboardVersion.version + 1,
+            LeaderboardVersion.updated_at: datetime.utcnow()
+        }, synchronize_session=False)
+        if not updated:
+            db.add(LeaderboardVersion(id=1, version=1))
+
+def get_leaderboard_version(db, shared=None):
+    """Current leaderboard version: (process counter, shared row version)"""
+    shared = SHARED_LEADERBOARD_VERSION if shared is None else shared
+    if not shared:
+        return (_leaderboard_version, 0)
+    row = db.query(LeaderboardVersion.version).filter(LeaderboardVersion.id == 1).first()
+    return (_leaderboard_version, row.version if row else 0)
+
 # Contributor Management Functions
 
 def get_or_create_contributor(db, username, email=None):
@@ -180,6 +897,74 @@ def get_or_create_contributor(db, username, email=None):
         db.refresh(contributor)
     return contributor
 
+# Achievement key -> (Contributor counter, threshold)
+# Display names live in LeaderboardManager.ACHIEVEMENTS
+ACHIEVEMENT_RULES = {
+    'first_analysis': ('analyses_count', 1),
+    'dedicated': ('analyses_count', 10),
+    'expert': ('analyses_count', 50),
+    'master': ('analyses_count', 100),
+    'streak_3': ('streak_days', 3),
+    'streak_7': ('streak_days', 7),
+    'streak_30': ('streak_days', 30),
+}
+
+def _unlock_achievements(db, contributor, before, now):
+    """Record achievements whose threshold was crossed by this update (before -> current counters)"""
+    crossed = [
+        key for key, (metric, threshold) in ACHIEVEMENT_RULES.items()
+        if before[metric] < threshold <= getattr(contributor, metric)
+    ]
+    if not crossed:
+        return []
+    
+    existing = {key for (key,) in db.query(ContributorAchievement.achievement_key).filter(
+        ContributorAchievement.contributor_id == contributor.id,
+        ContributorAchievement.achievement_key.in_(crossed)
+    )}
+    unlocked = [key for key in crossed if key not in existing]
+    for key in unlocked:
+        db.add(ContributorAchievement(contributor_id=contributor.id, achievement_key=key, unlocked_at=now))
+    return unlocked
+
+def get_contributor_achievements(db, contributor_ids):
+    """Unlocked achievements for a page of contributors: {contributor_id: [(key, unlocked_at), ...]}"""
+    achievements = {contributor_id: [] for contributor_id in contributor_ids}
+    if not achievements:
+        return achievements
+    rows = db.query(
+        ContributorAchievement.contributor_id,
+        ContributorAchievement.achievement_key,
+        ContributorAchievement.unlocked_at
+    ).filter(
+        ContributorAchievement.contributor_id.in_(list(achievements))
+    ).order_by(ContributorAchievement.unlocked_at, ContributorAchievement.id)
+    for contributor_id, key, unlocked_at in rows:
+        achievements[contributor_id].append((key, unlocked_at))
+    return achievements
+
+def backfill_achievements(db):
+    """Unlock every achievement already earned according to current counters. Returns rows added."""
+    from sqlalchemy import insert, select, literal, exists, and_
+    
+    added = 0
+    for key, (metric, threshold) in ACHIEVEMENT_RULES.items():
+        already = exists().where(and_(
+            ContributorAchievement.contributor_id == Contributor.id,
+            ContributorAchievement.achievement_key == key
+        ))
+        earned = select(
+            Contributor.id,
+            literal(key),
+            func.coalesce(Contributor.last_contribution_date, Contributor.created_at, datetime.utcnow())
+        ).where(getattr(Contributor, metric) >= threshold, ~already)
+        result = db.execute(insert(ContributorAchievement).from_select(
+            ['contributor_id', 'achievement_key', 'unlocked_at'], earned
+        ))
+        added += result.rowcount
+    db.commit()
+    return added
+
 def update_contributor_stats(db, contributor_id, points_earned, quality_score=1.0):
     """Update contributor statistics after an analysis"""
     from datetime import datetime, timedelta
@@ -188,6 +973,8 @@ def update_contributor_stats(db, contributor_id, points_earned, quality_score=1.
     if not contributor:
         return None
     
+    before = {'analyses_count': contributor.analyses_count, 'streak_days': contributor.streak_days}
+    
     # Update total stats
     contributor.total_points += points_earned
     contributor.analyses_count += 1
@@ -205,21 +992,28 @@ def update_contributor_stats(db, contributor_id, points_earned, quality_score=1.
     
     contributor.last_contribution_date = now
     
-    # Update period stats
-    for period, days in [('day', 1), ('week', 7), ('month', 30)]:
-        period_start = (now - timedelta(days=days)).replace(hour=0, minute=0, second=0, microsecond=0)
-        
-        stat = db.query(ContributorStats).filter(
-            ContributorStats.contributor_id == contributor_id,
-            ContributorStats.period == period,
-            ContributorStats.period_start == period_start
+    # Update today's bucket (day/week/month leaderboards sum these)
+    day = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    upserted = _upsert(db, ContributorDailyStats, dict(
+        contributor_id=contributor_id,
+        day=day,
+        points_earned=points_earned,
+        analyses_count=1
+    ), ['contributor_id', 'day'], lambda excluded: {
+        'points_earned': ContributorDailyStats.points_earned + excluded.points_earned,
+        'analyses_count': ContributorDailyStats.analyses_count + excluded.analyses_count,
+    })
+    
+    if not upserted:
+        stat = db.query(ContributorDailyStats).filter(
+            ContributorDailyStats.contributor_id == contributor_id,
+            ContributorDailyStats.day == day
         ).first()
         
         if not stat:
-            stat = ContributorStats(
+            stat = ContributorDailyStats(
                 contributor_id=contributor_id,
-                period=period,
-                period_start=period_start,
+                day=day,
                 points_earned=0,
                 analyses_count=0
             )
@@ -228,14 +1022,78 @@ def update_contributor_stats(db, contributor_id, points_earned, quality_score=1.
         stat.points_earned += points_earned
         stat.analyses_count += 1
     
+    _unlock_achievements(db, contributor, before, now)
+    
+    bump_leaderboard_version(db)
     db.commit()
     db.refresh(contributor)
     return contributor
 
-def get_leaderboard(db, period='all', limit=10):
+def recompute_streaks(db, first_id, last_id, now=None):
+    """
+    Recompute streak_days for contributors first_id..last_id from their analysis dates
+    
+    Gaps-and-islands in SQL: distinct UTC days minus their row number is
+    constant within a run of consecutive days. A run ending today or
+    yesterday is the live streak; everyone else in the range is reset to 0.
+    Returns the number of contributors whose streak changed.
+    """
+    today = (now or datetime.utcnow()).date()
+    if db.get_bind().dialect.name == 'postgresql':
+        day = 'CAST(analyzed_at AS DATE)'
+        island = 'day - CAST(ROW_NUMBER() OVER (PARTITION BY contributor_id ORDER BY day) AS INTEGER)'
+        params = {'since': today - timedelta(days=1)}
+    else:
+        day = 'date(analyzed_at)'
+        island = 'julianday(day) - ROW_NUMBER() OVER (PARTITION BY contributor_id ORDER BY day)'
+        params = {'since': (today - timedelta(days=1)).isoformat()}
+    params.update(first_id=first_id, last_id=last_id)
+    
+    streaks = dict(db.execute(text(f"""
+        WITH days AS (
+            SELECT DISTINCT contributor_id, {day} AS day
+            FROM analysis_history
+            WHERE contributor_id BETWEEN :first_id AND :last_id
+        ), islands AS (
+            SELECT contributor_id, day, {island} AS island
+            FROM days
+        )
+        SELECT contributor_id, COUNT(*) AS streak
+        FROM islands
+        GROUP BY contributor_id, island
+        HAVING MAX(day) >= :since
+    """), params).fetchall())
+    
+    current = db.query(Contributor.id, Contributor.streak_days).filter(
+        Contributor.id.between(first_id, last_id)
+    )
+    changes = [
+        {'id': contributor_id, 'streak_days': streaks.get(contributor_id, 0)}
+        for contributor_id, streak_days in current
+        if streak_days != streaks.get(contributor_id, 0)
+    ]
+    if changes:
+        db.bulk_update_mappings(Contributor, changes)
+    db.commit()
+    return len(changes)
+
+def get_period_start(period, now=None):
+    """Start (UTC midnight) of the current calendar day, week (Monday) or month"""
+    today = (now or datetime.utcnow()).replace(hour=0, minute=0, second=0, microsecond=0)
+    if period == 'day':
+        return today
+    if period == 'week':
+        return today - timedelta(days=today.weekday())
+    if period == 'month':
+        return today.replace(day=1)
+    return None
+
+def get_leaderboard(db, period='all', limit=10, as_of=None):
     """
     Get leaderboard for specified period
     period: 'day', 'week', 'month', 'all'
+    as_of: a past day to get the period standings at the end of that day
+    ('all' always reflects current totals)
     """
     from datetime import datetime, timedelta
     from sqlalchemy import func, desc
@@ -257,30 +1115,26 @@ def get_leaderboard(db, period='all', limit=10):
         } for idx, c in enumerate(contributors)]
     
     else:
-        # Period-based leaderboard
-        now = datetime.utcnow()
-        if period == 'day':
-            period_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        elif period == 'week':
-            period_start = (now - timedelta(days=now.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
-        elif period == 'month':
-            period_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        else:
+        # Period-based leaderboard: sum the daily buckets since the calendar period start
+        period_start = get_period_start(period, as_of)
+        if period_start is None:
             return []
         
-        results = db.query(
+        query = db.query(
             Contributor.username,
             Contributor.id,
             Contributor.streak_days,
-            func.sum(ContributorStats.points_earned).label('points'),
-            func.sum(ContributorStats.analyses_count).label('analyses_count')
+            func.sum(ContributorDailyStats.points_earned).label('points'),
+            func.sum(ContributorDailyStats.analyses_count).label('analyses_count')
         ).join(
-            ContributorStats,
-            Contributor.id == ContributorStats.contributor_id
+            ContributorDailyStats,
+            Contributor.id == ContributorDailyStats.contributor_id
         ).filter(
-            ContributorStats.period == period,
-            ContributorStats.period_start >= period_start
-        ).group_by(
+            ContributorDailyStats.day >= period_start
+        )
+        if as_of is not None:
+            query = query.filter(ContributorDailyStats.day <= get_period_start('day', as_of))
+        results = query.group_by(
             Contributor.id
         ).order_by(
             desc('points'),
@@ -296,6 +1150,57 @@ def get_leaderboard(db, period='all', limit=10):
             'contributor_id': r.id
         } for idx, r in enumerate(results)]
 
+def take_ranking_snapshot(db, period, limit=1000, now=None):
+    """
+    Store the closing top `limit` positions of the day before `now` for a
+    period (replacing an earlier snapshot of that day). Run just after
+    midnight UTC: the snapshot is stamped with the day that ended and
+    computed over that day's period window, not the period that just
+    reset. Returns rows written.
+    """
+    snapshot_date = get_period_start('day', now) - timedelta(days=1)
+    rankings = get_leaderboard(db, period, limit, as_of=snapshot_date)
+    
+    db.query(RankingSnapshot).filter(
+        RankingSnapshot.period == period,
+        RankingSnapshot.snapshot_date == snapshot_date
+    ).delete(synchronize_session=False)
+    db.bulk_insert_mappings(RankingSnapshot, [{
+        'period': period,
+        'snapshot_date': snapshot_date,
+        'contributor_id': r['contributor_id'],
+        'rank': r['rank']
+    } for r in rankings])
+    db.commit()
+    return len(rankings)
+
+def get_rank_changes(db, period, rankings, now=None):
+    """
+    Rank movement since the closing standings of the latest day before today
+    
+    `rankings` is a page from get_leaderboard. Returns {contributor_id: change},
+    positive when the contributor moved up. Contributors absent from the
+    snapshot (or with no snapshot yet) get 0. One query per page.
+    """
+    if not rankings:
+        return {}
+    today = (now or datetime.utcnow()).replace(hour=0, minute=0, second=0, microsecond=0)
+    
+    latest = db.query(func.max(RankingSnapshot.snapshot_date)).filter(
+        RankingSnapshot.period == period,
+        RankingSnapshot.snapshot_date < today
+    ).scalar_subquery()
+    previous = dict(db.query(RankingSnapshot.contributor_id, RankingSnapshot.rank).filter(
+        RankingSnapshot.period == period,
+        RankingSnapshot.snapshot_date == latest,
+        RankingSnapshot.contributor_id.in_([r['contributor_id'] for r in rankings])
+    ))
+    
+    return {
+        r['contributor_id']: previous[r['contributor_id']] - r['rank'] if r['contributor_id'] in previous else 0
+        for r in rankings
+    }
+
 def get_contributor_profile(db, contributor_id):
     """Get detailed contributor profile"""
     contributor = db.query(Contributor).filter(Contributor.id == contributor_id).first()
@@ -0,0 +1,133 @@
+"""
+Near-duplicate mention detection
+MinHash signatures over word shingles, bucketed with LSH banding, so
+syndicated articles, quote-tweets and cross-posts collapse into clusters
+scored once through one representative
+"""
+
+import hashlib
+import re
+import unicodedata
+import zlib
+from typing import List
+
+import numpy as np
+
+_TOKEN = re.compile(r'\w+')
+_URL = re.compile(r'\S+://\S+|www\.\S+')
+
+# Prime just above 2**32 so (a * x + b) stays inside uint64 for 32-bit hashes
+_MERSENNE_LIKE_PRIME = np.uint64(4294967311)
+
+# Signature value of texts without shingles; real hashes stay below the prime
+_EMPTY_HASH = np.iinfo(np.uint64).max
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, strip accents and collapse punctuation/whitespace"""
+    text = unicodedata.normalize('NFKD', text.lower())
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return ' '.join(_TOKEN.findall(text))
+
+
+def shingles(text: str, size: int = 3) -> set:
+    """Word n-gram shingles of the normalized text (links left out: shortened URLs are noise)"""
+    tokens = normalize_text(_URL.sub(' ', text)).split()
+    if len(tokens) <= size:
+        return {' '.join(tokens)} if tokens else set()
+    return {' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+def cluster_key(text: str) -> str:
+    """Stable cluster id derived from a representative's normalized text (raw text when that is empty)"""
+    return hashlib.blake2b((normalize_text(text) or text).encode('utf-8'), digest_size=8).hexdigest()
+
+
+class _UnionFind:
+    def __init__(self, n):
+        self.parent = list(range(n))
+
+    def find(self, x):
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            # Keep the lowest index as root so the first mention represents the cluster
+            if rb < ra:
+                ra, rb = rb, ra
+            self.parent[rb] = ra
+
+
+class NearDuplicateDetector:
+    """
+    MinHash + LSH near-duplicate clustering
+
+    Texts whose estimated Jaccard similarity (over word shingles) reaches
+    `threshold` end up in the same cluster. `bands` x `rows` must equal
+    `num_perm`; the LSH candidate threshold is roughly (1/bands)^(1/rows).
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 64, bands: int = 16,
+                 shingle_size: int = 3, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 2 ** 31, size=num_perm, dtype=np.int64).astype(np.uint64)
+        self._b = rng.randint(0, 2 ** 31, size=num_perm, dtype=np.int64).astype(np.uint64)
+
+    def signature(self, text: str):
+        """
+        MinHash signature (num_perm uint64 values) of one text. Texts without
+        word shingles (empty, emoji- or punctuation-only) get the all-max
+        signature, which cluster() never matches.
+        """
+        grams = shingles(text, self.shingle_size)
+        if not grams:
+            return np.full(self.num_perm, _EMPTY_HASH, dtype=np.uint64)
+        hashes = np.fromiter((zlib.crc32(g.encode('utf-8')) for g in grams), dtype=np.uint64, count=len(grams))
+        permuted = (hashes[:, None] * self._a + self._b) % _MERSENNE_LIKE_PRIME
+        return permuted.min(axis=0)
+
+    def cluster(self, texts: List[str]) -> List[int]:
+        """
+        Cluster texts
+        Returns, for each text, the index of its cluster representative
+        (the first text of the cluster in input order)
+        """
+        n = len(texts)
+        if n < 2:
+            return list(range(n))
+
+        signatures = np.vstack([self.signature(t) for t in texts])
+        # Shingle-less texts share one signature but have nothing in common: keep them apart
+        comparable = np.flatnonzero(~np.all(signatures == _EMPTY_HASH, axis=1))
+        uf = _UnionFind(n)
+
+        for band in range(self.bands):
+            columns = signatures[:, band * self.rows:(band + 1) * self.rows]
+            buckets = {}
+            for idx in comparable:
+                buckets.setdefault(columns[idx].tobytes(), []).append(idx)
+
+            for members in buckets.values():
+                if len(members) < 2:
+                    continue
+                first = members[0]
+                for other in members[1:]:
+                    if uf.find(first) == uf.find(other):
+                        continue
+                    similarity = np.count_nonzero(signatures[first] == signatures[other]) / self.num_perm
+                    if similarity >= self.threshold:
+                        uf.union(first, other)
+
+        return [uf.find(idx) for idx in range(n)]
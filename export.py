@@ -0,0 +1,209 @@
+"""
+Streaming bulk export of mentions and trust scores
+Rows are streamed with server-side cursors (yield_per) in fixed-size
+chunks and written straight to Parquet, Arrow IPC or CSV, so memory stays
+constant regardless of how many rows match.
+
+Usage:
+    python export.py mentions -o mentions.parquet --influencer Squeezie --label drama
+    python export.py scores -o scores.csv --format csv --since 2025-01-01
+"""
+
+import argparse
+import csv
+import sys
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, Float, Integer, select
+
+import database
+
+EXPORT_FORMATS = ('parquet', 'arrow', 'csv')
+
+MENTION_COLUMNS = [
+    database.Mention.id,
+    database.Mention.influencer_name,
+    database.Mention.source,
+    database.Mention.url,
+    database.Mention.text_excerpt,
+    database.Mention.sentiment_score,
+    database.Mention.label,
+    database.Mention.scraped_at,
+    database.Mention.cluster_id,
+    database.Mention.duplicate_count,
+]
+
+SCORE_COLUMNS = [
+    database.AnalysisHistory.id,
+    database.AnalysisHistory.influencer_name,
+    database.AnalysisHistory.contributor_id,
+    database.AnalysisHistory.trust_score,
+    database.AnalysisHistory.drama_count,
+    database.AnalysisHistory.good_action_count,
+    database.AnalysisHistory.points_awarded,
+    database.AnalysisHistory.quality_score,
+    database.AnalysisHistory.analyzed_at,
+]
+
+
+def _arrow_schema(pa, columns):
+    fields = []
+    for column in columns:
+        if isinstance(column.type, Integer):
+            arrow_type = pa.int64()
+        elif isinstance(column.type, Float):
+            arrow_type = pa.float64()
+        elif isinstance(column.type, DateTime):
+            arrow_type = pa.timestamp('us')
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(column.key, arrow_type))
+    return pa.schema(fields)
+
+
+class _CsvWriter:
+    def __init__(self, path, columns):
+        self.file = sys.stdout if path == '-' else open(path, 'w', newline='', encoding='utf-8')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow([c.key for c in columns])
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+
+    def close(self):
+        if self.file is not sys.stdout:
+            self.file.close()
+
+
+class ArrowWriter:
+    """
+    Chunked Parquet / Arrow IPC writer for rows of `columns` (tuples in
+    column order). random_access writes the IPC file format, which can be
+    memory-mapped on read, instead of the IPC stream format. Both formats
+    are written front to back, so path '-' streams to stdout.
+    """
+
+    def __init__(self, path, columns, format, random_access=False):
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise RuntimeError(f"{format} output requires pyarrow (pip install pyarrow)")
+        self.pa = pa
+        self.keys = [c.key for c in columns]
+        self.schema = _arrow_schema(pa, columns)
+        self.to_stdout = path == '-'
+        self.sink = None
+        if self.to_stdout:
+            sys.stdout.flush()
+            self.sink = pa.PythonFile(sys.stdout.buffer, mode='w')
+        elif format != 'parquet':
+            self.sink = pa.OSFile(path, 'wb')
+        if format == 'parquet':
+            import pyarrow.parquet as pq
+            self.writer = pq.ParquetWriter(self.sink or path, self.schema, compression='zstd')
+        else:
+            import pyarrow.ipc as ipc
+            new_writer = ipc.new_file if random_access else ipc.new_stream
+            self.writer = new_writer(self.sink, self.schema)
+
+    def write(self, rows):
+        arrays = [self.pa.array([row[idx] for row in rows], type=field.type)
+                  for idx, field in enumerate(self.schema)]
+        self.writer.write_batch(self.pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+        if self.to_stdout:
+            sys.stdout.buffer.flush()  # stdout stays open
+        elif self.sink is not None:
+            self.sink.close()
+
+
+def _open_writer(path, columns, format):
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {format}")
+    if format == 'csv':
+        return _CsvWriter(path, columns)
+    return ArrowWriter(path, columns, format)
+
+
+def stream_to_file(db, statement, columns, path: str, format: str = 'parquet', chunk_size: int = 50000) -> int:
+    """Execute `statement` with a streaming cursor and write it chunk by chunk. Returns rows written."""
+    writer = _open_writer(path, columns, format)
+    total = 0
+    try:
+        result = db.execute(statement.execution_options(stream_results=True, yield_per=chunk_size))
+        for chunk in result.partitions(chunk_size):
+            writer.write(chunk)
+            total += len(chunk)
+    finally:
+        writer.close()
+    return total
+
+
+def export_mentions(db, path: str, format: str = 'parquet', influencer: Optional[str] = None,
+                    since: Optional[datetime] = None, until: Optional[datetime] = None,
+                    label: Optional[str] = None, chunk_size: int = 50000) -> int:
+    """Export mentions filtered by influencer, scrape period and label"""
+    statement = select(*MENTION_COLUMNS).order_by(database.Mention.id)
+    if influencer:
+        statement = statement.where(
+            database.Mention.influencer_name == database.resolve_influencer_name(db, influencer)
+        )
+    if since:
+        statement = statement.where(database.Mention.scraped_at >= since)
+    if until:
+        statement = statement.where(database.Mention.scraped_at < until)
+    if label:
+        statement = statement.where(database.Mention.label == label)
+    return stream_to_file(db, statement, MENTION_COLUMNS, path, format, chunk_size)
+
+
+def export_scores(db, path: str, format: str = 'parquet', influencer: Optional[str] = None,
+                  since: Optional[datetime] = None, until: Optional[datetime] = None,
+                  chunk_size: int = 50000) -> int:
+    """Export the trust score history (analysis_history)"""
+    statement = select(*SCORE_COLUMNS).order_by(database.AnalysisHistory.id)
+    if influencer:
+        statement = statement.where(
+            database.AnalysisHistory.influencer_name == database.resolve_influencer_name(db, influencer)
+        )
+    if since:
+        statement = statement.where(database.AnalysisHistory.analyzed_at >= since)
+    if until:
+        statement = statement.where(database.AnalysisHistory.analyzed_at < until)
+    return stream_to_file(db, statement, SCORE_COLUMNS, path, format, chunk_size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream mentions or trust scores to Parquet, Arrow or CSV")
+    parser.add_argument('dataset', choices=['mentions', 'scores'])
+    parser.add_argument('-o', '--output', required=True, help="Output path ('-' for stdout, with --format)")
+    parser.add_argument('--format', choices=EXPORT_FORMATS, help="Defaults to the output file extension")
+    parser.add_argument('--influencer')
+    parser.add_argument('--since', type=datetime.fromisoformat, help="ISO date, inclusive")
+    parser.add_argument('--until', type=datetime.fromisoformat, help="ISO date, exclusive")
+    parser.add_argument('--label', choices=['drama', 'good_action', 'neutral'], help="Mentions only")
+    parser.add_argument('--chunk-size', type=int, default=50000)
+    args = parser.parse_args()
+
+    format = args.format or (None if args.output == '-' else args.output.rsplit('.', 1)[-1])
+    if format not in EXPORT_FORMATS:
+        parser.error("--format is required for stdout" if args.output == '-'
+                     else "cannot infer --format from the output path")
+
+    db = database.get_db()
+    if args.dataset == 'mentions':
+        total = export_mentions(db, args.output, format, args.influencer, args.since, args.until,
+                                args.label, args.chunk_size)
+    else:
+        total = export_scores(db, args.output, format, args.influencer, args.since, args.until,
+                              args.chunk_size)
+
+    if args.output != '-':
+        print(f"✅ Exported {total} {args.dataset} to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+CPU inference backends for the sentiment analyzer
+SentimentAnalyzer keeps its analyze_text/analyze_batch interface; only the
+transformer model underneath it is swapped:
+
+    torch  - the model as loaded (default)
+    int8   - dynamic int8 quantization of the Linear layers (torch only)
+    onnx   - exported once to ONNX and run with ONNX Runtime (optimum)
+
+Pick one with config.ANALYZER_BACKEND. compare_backends() measures label
+agreement against the default backend; bench_inference.py reports
+throughput and parity for each backend on real mentions.
+"""
+
+import os
+import re
+from typing import Dict, List, Optional
+
+BACKENDS = ('torch', 'int8', 'onnx')
+DEFAULT_BACKEND = 'torch'
+
+# Next to the code, not the working directory, so every entry point shares one export
+DEFAULT_ONNX_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'onnx')
+
+
+def configured_backend() -> str:
+    import config
+    return getattr(config, 'ANALYZER_BACKEND', None) or DEFAULT_BACKEND
+
+
+def _onnx_cache_dir() -> str:
+    import config
+    return getattr(config, 'ANALYZER_ONNX_CACHE', None) or DEFAULT_ONNX_CACHE
+
+
+def quantize_int8(model):
+    """Dynamic int8 quantization: weights stored int8, activations quantized per batch"""
+    import torch
+    quantization = getattr(torch, 'ao', torch).quantization
+    return quantization.quantize_dynamic(model.eval(), {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def export_onnx(model, cache_dir: Optional[str] = None):
+    """ONNX Runtime copy of a transformers model, exported on first use and cached on disk"""
+    from optimum.onnxruntime import ORTModelForSequenceClassification
+
+    name = getattr(model, 'name_or_path', None) or model.config.name_or_path
+    path = os.path.join(cache_dir or _onnx_cache_dir(), re.sub(r'[^\w.-]+', '--', name))
+    if os.path.isdir(path):
+        return ORTModelForSequenceClassification.from_pretrained(path)
+
+    ort_model = ORTModelForSequenceClassification.from_pretrained(name, export=True)
+    ort_model.save_pretrained(path)
+    return ort_model
+
+
+def _convert(model, backend: str, cache_dir: Optional[str]):
+    if backend == 'int8':
+        return quantize_int8(model)
+    return export_onnx(model, cache_dir)
+
+
+def apply_backend(analyzer, backend: str, cache_dir: Optional[str] = None):
+    """
+    Swap the transformer models held by `analyzer` (directly or through a
+    transformers pipeline) for the given backend, in place. Returns the analyzer.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown analyzer backend {backend!r} (expected one of {', '.join(BACKENDS)})")
+    if backend == DEFAULT_BACKEND:
+        return analyzer
+
+    import torch
+
+    converted = {}
+
+    def convert(model):
+        if id(model) not in converted:
+            converted[id(model)] = _convert(model, backend, cache_dir)
+        return converted[id(model)]
+
+    for attr, value in list(vars(analyzer).items()):
+        if isinstance(value, torch.nn.Module):
+            setattr(analyzer, attr, convert(value))
+        elif isinstance(getattr(value, 'model', None), torch.nn.Module) and hasattr(value, 'tokenizer'):
+            # transformers pipeline: it only calls model(**inputs) and reads model.config
+            value.model = convert(value.model)
+
+    if not converted:
+        raise ValueError(f"{type(analyzer).__name__} holds no torch model to run on the {backend} backend")
+    return analyzer
+
+
+def load_analyzer(backend: Optional[str] = None):
+    """SentimentAnalyzer running on `backend` (default: config.ANALYZER_BACKEND)"""
+    from analyzer import SentimentAnalyzer
+
+    backend = backend or configured_backend()
+    analyzer = apply_backend(SentimentAnalyzer(), backend)
+    analyzer.backend = backend
+    return analyzer
+
+
+def analyze_texts(analyzer, texts: List[str], batch_size: int = 32) -> List[Dict]:
+    results = []
+    for start in range(0, len(texts), batch_size):
+        batch = texts[start:start + batch_size]
+        if hasattr(analyzer, 'analyze_batch'):
+            results.extend(analyzer.analyze_batch(batch))
+        else:
+            results.extend(analyzer.analyze_text(text) for text in batch)
+    return results
+
+
+def compare_backends(reference, candidate, texts: List[str], batch_size: int = 32) -> Dict:
+    """
+    Parity of `candidate` against `reference` on the same texts: share of
+    identical labels and the drift of sentiment_score
+    """
+    expected = analyze_texts(reference, texts, batch_size)
+    actual = analyze_texts(candidate, texts, batch_size)
+
+    deltas = [abs(e['sentiment_score'] - a['sentiment_score']) for e, a in zip(expected, actual)]
+    disagreements = [
+        (text, e['label'], a['label'])
+        for text, e, a in zip(texts, expected, actual) if e['label'] != a['label']
+    ]
+    return {
+        'texts': len(texts),
+        'label_agreement': 1.0 - len(disagreements) / len(texts) if texts else 1.0,
+        'max_score_delta': max(deltas, default=0.0),
+        'mean_score_delta': sum(deltas) / len(deltas) if deltas else 0.0,
+        'disagreements': disagreements,
+    }
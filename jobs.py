@@ -0,0 +1,75 @@
+"""
+Scheduled maintenance jobs
+Run from cron (or any scheduler) once a day, just after midnight UTC:
+
+    python jobs.py snapshot-rankings
+    python jobs.py recompute-streaks
+
+The app only sees the jobs' leaderboard changes before its cache rolls
+over when config.SHARED_LEADERBOARD_VERSION is on.
+"""
+
+import argparse
+
+from sqlalchemy import func
+
+import database
+
+LEADERBOARD_PERIODS = ('day', 'week', 'month', 'all')
+
+
+def snapshot_rankings(db, periods=LEADERBOARD_PERIODS, limit: int = 1000) -> int:
+    """Record yesterday's closing leaderboard positions so today's rank changes can be shown"""
+    total = 0
+    for period in periods:
+        written = database.take_ranking_snapshot(db, period, limit)
+        print(f"📸 {period}: {written} positions")
+        total += written
+
+    # Cached rankings hold rank changes computed against the previous snapshot
+    database.bump_leaderboard_version(db)
+    db.commit()
+    return total
+
+
+def recompute_streaks(db, chunk_size: int = 50000) -> int:
+    """Recompute every contributor's streak from analysis history, one id range at a time"""
+    first_id, last_id = db.query(func.min(database.Contributor.id), func.max(database.Contributor.id)).one()
+    if first_id is None:
+        return 0
+
+    changed = 0
+    for start in range(first_id, last_id + 1, chunk_size):
+        changed += database.recompute_streaks(db, start, min(start + chunk_size - 1, last_id))
+
+    if changed:
+        # Streaks are shown on the leaderboard
+        database.bump_leaderboard_version(db)
+        db.commit()
+    return changed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scheduled leaderboard maintenance jobs")
+    subparsers = parser.add_subparsers(dest='job', required=True)
+
+    snapshot = subparsers.add_parser('snapshot-rankings', help="Store daily ranking snapshots")
+    snapshot.add_argument('--periods', nargs='+', choices=LEADERBOARD_PERIODS, default=list(LEADERBOARD_PERIODS))
+    snapshot.add_argument('--limit', type=int, default=1000, help="Positions kept per period")
+
+    streaks = subparsers.add_parser('recompute-streaks', help="Recompute contributor streaks from analysis history")
+    streaks.add_argument('--chunk-size', type=int, default=50000, help="Contributor ids per batch")
+
+    args = parser.parse_args()
+    db = database.get_db()
+
+    if args.job == 'snapshot-rankings':
+        total = snapshot_rankings(db, args.periods, args.limit)
+        print(f"✅ Stored {total} ranking positions")
+    elif args.job == 'recompute-streaks':
+        changed = recompute_streaks(db, args.chunk_size)
+        print(f"✅ Streaks recomputed ({changed} contributors changed)")
+
+
+if __name__ == "__main__":
+    main()
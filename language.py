@@ -0,0 +1,149 @@
+"""
+Language identification and per-language analyzer routing
+A stopword-frequency detector (no model, microseconds per text) tags each
+mention, and AnalyzerPool hands every language group as one batch to a
+lazily built analyzer. Undetermined texts go to the default language's
+analyzer; texts confidently detected in a language without an analyzer
+are skipped rather than run through a model trained on another language.
+"""
+
+import re
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional
+
+UNDETERMINED = 'und'
+
+_WORD = re.compile(r"[a-zà-öø-ÿœæ]+")
+
+# Function words: frequent, short and distinctive enough for short social texts
+STOPWORDS = {
+    'fr': frozenset("""
+        le la les un une des du de et est sont pas ne que qui dans pour sur avec au aux ce cette ces
+        il elle ils elles nous vous je tu on son sa ses leur leurs mais ou donc car plus très été être
+        avoir fait comme tout tous aussi après avant sans chez entre depuis encore même alors
+    """.split()),
+    'en': frozenset("""
+        the a an and is are was were not that which who in for on with at to of this these those
+        he she they we you i it his her their but or so because more very been be have has had
+        do does did as all also after before without between since still even then there what
+    """.split()),
+    'es': frozenset("""
+        el los las unos unas y es son no que en para con por del al este esta estos pero muy
+        está están ser fue como más también porque cuando donde
+    """.split()),
+    'de': frozenset("""
+        der die das und ist sind nicht ein eine einen dem den mit für auf von zu im auch aber
+        sehr wie wenn oder ich sie wir nach bei noch nur
+    """.split()),
+    'it': frozenset("""
+        il lo gli le un una e è sono non che di per con su del della dei anche ma molto come
+        questo questa quando perché più
+    """.split()),
+}
+
+# Words in more than one list (il, le, un, de...) say nothing about which
+# language a text is in, so they are not scored
+_SHARED = frozenset(
+    word for language, stopwords in STOPWORDS.items() for word in stopwords
+    if any(word in other for name, other in STOPWORDS.items() if name != language)
+)
+
+# Letters that only occur in some of the languages above (à, è, é and ù
+# are left out of French: Italian uses them as much)
+_MARKERS = {
+    'fr': frozenset('çœêîûëï'),
+    'es': frozenset('ñ¿¡'),
+    'de': frozenset('äöüß'),
+}
+
+
+def detect_language(text: str, max_words: int = 60, min_hits: int = 2) -> str:
+    """
+    ISO 639-1 code of the most likely language, or 'und' when the text
+    carries too little signal (few words, no function words)
+    """
+    if not text:
+        return UNDETERMINED
+    lowered = text.lower()
+    words = _WORD.findall(lowered.replace("'", ' ').replace('’', ' '))[:max_words]
+
+    scores = dict.fromkeys(STOPWORDS, 0.0)
+    for word in words:
+        if word in _SHARED:
+            continue
+        for language, stopwords in STOPWORDS.items():
+            if word in stopwords:
+                scores[language] += 1
+    for language, letters in _MARKERS.items():
+        if any(c in letters for c in lowered):
+            scores[language] += 2
+
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    (best, best_score), (_, runner_up) = ranked[0], ranked[1]
+    if best_score < min_hits or best_score == runner_up:
+        return UNDETERMINED
+    return best
+
+
+def group_by_language(texts: List[str], default: Optional[str] = None) -> Dict[str, List[int]]:
+    """Indexes of `texts` per detected language ('und' mapped to `default` when given)"""
+    groups = defaultdict(list)
+    for idx, text in enumerate(texts):
+        language = detect_language(text)
+        if language == UNDETERMINED and default:
+            language = default
+        groups[language].append(idx)
+    return dict(groups)
+
+
+class AnalyzerPool:
+    """
+    Lazily built sentiment analyzers, one per language
+
+    `factories` maps a language to a zero-argument callable returning an
+    object with analyze_text() (and optionally analyze_batch()). Languages
+    sharing the same factory share one instance, so a multilingual model
+    is only loaded once.
+    """
+
+    def __init__(self, factories: Dict[str, Callable], default_language: str = 'fr'):
+        self.factories = dict(factories)
+        self.default_language = default_language
+        self._instances = {}
+        self._lock = threading.Lock()
+
+    @property
+    def languages(self):
+        return tuple(self.factories)
+
+    def supports(self, language: str) -> bool:
+        return language in self.factories
+
+    def route(self, language: str) -> Optional[str]:
+        """
+        Language whose analyzer handles `language`: itself, the default for
+        undetermined texts, or None when it has no analyzer (skip it)
+        """
+        if language in self.factories:
+            return language
+        if language == UNDETERMINED:
+            return self.default_language
+        return None
+
+    def get(self, language: str):
+        factory = self.factories[language]
+        analyzer = self._instances.get(factory)
+        if analyzer is None:
+            with self._lock:
+                analyzer = self._instances.get(factory)
+                if analyzer is None:
+                    analyzer = self._instances[factory] = factory()
+        return analyzer
+
+    def analyze_batch(self, language: str, texts: List[str]) -> List[Dict]:
+        """Analyze texts of one language with its analyzer, as a single batch when supported"""
+        analyzer = self.get(language)
+        if hasattr(analyzer, 'analyze_batch'):
+            return analyzer.analyze_batch(texts)
+        return [analyzer.analyze_text(text) for text in texts]
@@ -3,16 +3,39 @@ Leaderboard module for competitive dashboard
 Handles point calculation, ranking logic, and achievements
 """
 
+import threading
+import time
 from typing import Dict, List
 from datetime import datetime, timedelta
 import database
 
+# Rankings shared by every LeaderboardManager (and Streamlit session) in the process
+# (period, limit, day) -> (version, rankings)
+_rankings_cache = {}
+_rankings_cache_lock = threading.Lock()
+
+# Badge name and description per achievement key (unlock rules live in database.ACHIEVEMENT_RULES)
+ACHIEVEMENT_BADGES = {
+    'first_analysis': ('🎯 First Steps', 'Complete your first analysis'),
+    'dedicated': ('💪 Dedicated', 'Complete {threshold} analyses'),
+    'expert': ('🏆 Expert', 'Complete {threshold} analyses'),
+    'master': ('👑 Master', 'Complete {threshold} analyses'),
+    'streak_3': ('🔥 On Fire', '{threshold}-day streak'),
+    'streak_7': ('⚡ Unstoppable', '{threshold}-day streak'),
+    'streak_30': ('🌟 Legend', '{threshold}-day streak'),
+}
+
 class LeaderboardManager:
     """Manages leaderboard calculations and rankings"""
     
-    def __init__(self):
+    def __init__(self, version_check_interval: float = 1.0):
         self.db = database.get_db()
         
+        # Cross-process mode reads the shared version row at most this often (seconds)
+        self.version_check_interval = version_check_interval
+        self._version = None
+        self._version_checked_at = 0.0
+        
         # Point system configuration
         self.BASE_POINTS = 10
         self.QUALITY_BONUS_THRESHOLD = 0.8
@@ -20,15 +43,14 @@ class LeaderboardManager:
         self.COMPREHENSIVE_DATA_BONUS = 3  # For analyses with many mentions
         self.STREAK_BONUS_MULTIPLIER = 0.1  # 10% bonus per streak day
         
-        # Achievement thresholds
+        # Achievement display; thresholds come from database.ACHIEVEMENT_RULES
         self.ACHIEVEMENTS = {
-            'first_analysis': {'name': '🎯 First Steps', 'description': 'Complete your first analysis', 'threshold': 1},
-            'dedicated': {'name': '💪 Dedicated', 'description': 'Complete 10 analyses', 'threshold': 10},
-            'expert': {'name': '🏆 Expert', 'description': 'Complete 50 analyses', 'threshold': 50},
-            'master': {'name': '👑 Master', 'description': 'Complete 100 analyses', 'threshold': 100},
-            'streak_3': {'name': '🔥 On Fire', 'description': '3-day streak', 'threshold': 3},
-            'streak_7': {'name': '⚡ Unstoppable', 'description': '7-day streak', 'threshold': 7},
-            'streak_30': {'name': '🌟 Legend', 'description': '30-day streak', 'threshold': 30},
+            key: {
+                'name': name,
+                'description': description.format(threshold=database.ACHIEVEMENT_RULES[key][1]),
+                'threshold': database.ACHIEVEMENT_RULES[key][1]
+            }
+            for key, (name, description) in ACHIEVEMENT_BADGES.items()
         }
     
     def calculate_points(self, mentions_count: int, quality_score: float = 1.0, streak_days: int = 0) -> int:
@@ -74,6 +96,9 @@ class LeaderboardManager:
         if not mentions:
             return 0.5
         
+        if hasattr(mentions, 'age_seconds'):  # columnar MentionBatch
+            return self.calculate_quality_score_batch(mentions)
+        
         score = 0.0
         
         # Source diversity (max 0.4)
@@ -89,7 +114,7 @@ class LeaderboardManager:
         now = datetime.utcnow()
         recent_count = 0
         for mention in mentions:
-            scraped_at = mention.get('scraped_at', now)
+            scraped_at = mention.get('scraped_at') or now
             if isinstance(scraped_at, str):
                 try:
                     scraped_at = datetime.fromisoformat(scraped_at)
@@ -105,6 +130,23 @@ class LeaderboardManager:
         
         return min(score, 1.0)
     
+    def calculate_quality_score_batch(self, batch, now: datetime = None) -> float:
+        """
+        Vectorized calculate_quality_score over a mention_batch.MentionBatch
+        Same factors and weights, computed with array ops
+        """
+        if len(batch) == 0:
+            return 0.5
+        
+        source_diversity = min(batch.unique_source_count() / 5.0, 1.0) * 0.4
+        volume_score = min(len(batch) / 30.0, 1.0) * 0.3
+        
+        # (now - scraped_at).days <= 30  <=>  age < 31 days
+        recent_count = int((batch.age_seconds(now) < 31 * 86400).sum())
+        recency_score = (recent_count / len(batch)) * 0.3
+        
+        return min(source_diversity + volume_score + recency_score, 1.0)
+    
     def get_rankings(self, period: str = 'all', limit: int = 10) -> List[Dict]:
         """
         Get leaderboard rankings for specified period
@@ -116,43 +158,60 @@ class LeaderboardManager:
         Returns:
             List of ranked contributors with stats
         """
+        version = self._current_version()
+        # Period boundaries move at midnight even without writes
+        key = (period, limit, datetime.utcnow().date())
+        
+        cached = _rankings_cache.get(key)
+        if cached and cached[0] == version:
+            return [dict(r) for r in cached[1]]
+        
         rankings = database.get_leaderboard(self.db, period, limit)
         
-        # Add rank change indicators (would need historical data)
+        # Rank movement against the last daily snapshot (see jobs.py snapshot-rankings)
+        rank_changes = database.get_rank_changes(self.db, period, rankings)
+        unlocked = database.get_contributor_achievements(self.db, [r['contributor_id'] for r in rankings])
         for ranking in rankings:
-            ranking['rank_change'] = 0  # Placeholder for rank change tracking
-            ranking['achievements'] = self.get_contributor_achievements(ranking['contributor_id'])
+            ranking['rank_change'] = rank_changes.get(ranking['contributor_id'], 0)
+            ranking['achievements'] = self._display_achievements(unlocked[ranking['contributor_id']])
+        
+        with _rankings_cache_lock:
+            # Drop entries from previous days or versions
+            for stale in [k for k, v in _rankings_cache.items() if v[0] != version or k[2] != key[2]]:
+                del _rankings_cache[stale]
+            _rankings_cache[key] = (version, rankings)
+        
+        return [dict(r) for r in rankings]
+    
+    def _current_version(self):
+        """Leaderboard version, re-reading the shared row at most every version_check_interval"""
+        if not database.SHARED_LEADERBOARD_VERSION:
+            return database.get_leaderboard_version(self.db, shared=False)
         
-        return rankings
+        now = time.monotonic()
+        local = database.get_leaderboard_version(self.db, shared=False)[0]
+        if self._version is None or self._version[0] != local or now - self._version_checked_at >= self.version_check_interval:
+            self._version = database.get_leaderboard_version(self.db, shared=True)
+            self._version_checked_at = now
+        return self._version
     
     def get_contributor_achievements(self, contributor_id: int) -> List[Dict]:
         """Get achievements earned by contributor"""
-        profile = database.get_contributor_profile(self.db, contributor_id)
-        if not profile:
-            return []
+        unlocked = database.get_contributor_achievements(self.db, [contributor_id])
+        return self._display_achievements(unlocked[contributor_id])
+    
+    def _display_achievements(self, unlocked) -> List[Dict]:
+        """Highest unlocked badge per family (analyses, then streak), with its unlock time"""
+        best = {}
+        for key, unlocked_at in unlocked:
+            metric, threshold = database.ACHIEVEMENT_RULES[key]
+            if metric not in best or threshold > best[metric][1]:
+                best[metric] = (key, threshold, unlocked_at)
         
-        contributor = profile['contributor']
-        achievements = []
-        
-        # Analysis count achievements
-        if contributor.analyses_count >= self.ACHIEVEMENTS['master']['threshold']:
-            achievements.append(self.ACHIEVEMENTS['master'])
-        elif contributor.analyses_count >= self.ACHIEVEMENTS['expert']['threshold']:
-            achievements.append(self.ACHIEVEMENTS['expert'])
-        elif contributor.analyses_count >= self.ACHIEVEMENTS['dedicated']['threshold']:
-            achievements.append(self.ACHIEVEMENTS['dedicated'])
-        elif contributor.analyses_count >= self.ACHIEVEMENTS['first_analysis']['threshold']:
-            achievements.append(self.ACHIEVEMENTS['first_analysis'])
-        
-        # Streak achievements
-        if contributor.streak_days >= self.ACHIEVEMENTS['streak_30']['threshold']:
-            achievements.append(self.ACHIEVEMENTS['streak_30'])
-        elif contributor.streak_days >= self.ACHIEVEMENTS['streak_7']['threshold']:
-            achievements.append(self.ACHIEVEMENTS['streak_7'])
-        elif contributor.streak_days >= self.ACHIEVEMENTS['streak_3']['threshold']:
-            achievements.append(self.ACHIEVEMENTS['streak_3'])
-        
-        return achievements
+        return [
+            dict(self.ACHIEVEMENTS[best[metric][0]], unlocked_at=best[metric][2])
+            for metric in ('analyses_count', 'streak_days') if metric in best
+        ]
     
     def get_contributor_stats(self, contributor_id: int) -> Dict:
         """Get detailed statistics for a contributor"""
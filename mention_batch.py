@@ -0,0 +1,105 @@
+"""
+Columnar mention batches for vectorized scoring
+One NumPy array per field (sentiment, label code, source code, epoch
+timestamp) so scorers run a handful of array ops instead of a Python loop
+"""
+
+from datetime import datetime
+from typing import Iterable, Optional
+
+import numpy as np
+
+from mention_record import MentionRecord
+
+LABELS = ('neutral', 'drama', 'good_action')
+LABEL_CODES = {label: code for code, label in enumerate(LABELS)}
+
+SOURCES = ('news', 'youtube', 'twitter', 'reddit', 'forum')
+SOURCE_CODES = {source: code for code, source in enumerate(SOURCES)}
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _to_epoch(value) -> float:
+    """Naive-UTC datetime or ISO string to epoch seconds (NaN if missing/invalid)"""
+    if value is None:
+        return np.nan
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return np.nan
+    if value.tzinfo is not None:
+        value = value.replace(tzinfo=None) - value.utcoffset()
+    return (value - _EPOCH).total_seconds()
+
+
+class MentionBatch:
+    """Struct-of-arrays view over a list of mentions"""
+
+    __slots__ = ('sentiment', 'label_codes', 'source_codes', 'timestamps', 'source_names')
+
+    def __init__(self, sentiment, label_codes, source_codes, timestamps, source_names=SOURCES):
+        self.sentiment = sentiment
+        self.label_codes = label_codes
+        self.source_codes = source_codes
+        self.timestamps = timestamps
+        self.source_names = source_names
+
+    @classmethod
+    def from_mentions(cls, mentions: Iterable) -> 'MentionBatch':
+        """
+        Build from MentionRecord objects or mention dicts
+        Unknown sources get codes appended after the known ones; unknown
+        labels are treated as neutral.
+        """
+        mentions = list(mentions)
+        if all(isinstance(m, MentionRecord) for m in mentions):
+            sentiments = [m.sentiment_score for m in mentions]
+            labels = [m.label for m in mentions]
+            sources = [m.source for m in mentions]
+            scraped = [m.scraped_at for m in mentions]
+        else:
+            sentiments = [m.get('sentiment_score', 0.0) for m in mentions]
+            labels = [m.get('label', 'neutral') for m in mentions]
+            sources = [m.get('source', '') for m in mentions]
+            scraped = [m.get('scraped_at') for m in mentions]
+
+        sentiment = np.array([value or 0.0 for value in sentiments], dtype=np.float64)
+        label_codes = np.array([LABEL_CODES.get(label, 0) for label in labels], dtype=np.int8)
+
+        source_map = dict(SOURCE_CODES)
+        source_names = list(SOURCES)
+        for source in set(sources).difference(source_map):
+            source_map[source] = len(source_names)
+            source_names.append(source)
+        source_codes = np.array([source_map[source] for source in sources], dtype=np.int16)
+
+        # Pipeline batches share one scraped_at, so convert each distinct value once
+        epochs = {value: _to_epoch(value) for value in set(scraped)}
+        timestamps = np.array([epochs[value] for value in scraped], dtype=np.float64)
+
+        return cls(sentiment, label_codes, source_codes, timestamps, tuple(source_names))
+
+    def __len__(self):
+        return len(self.sentiment)
+
+    def label_counts(self) -> dict:
+        """Counts per label name"""
+        counts = np.bincount(self.label_codes, minlength=len(LABELS))
+        return {label: int(counts[code]) for code, label in enumerate(LABELS)}
+
+    def unique_source_count(self) -> int:
+        if len(self) == 0:
+            return 0
+        return int(np.count_nonzero(np.bincount(self.source_codes)))
+
+    def age_seconds(self, now: Optional[datetime] = None):
+        """Age of each mention; missing timestamps count as scraped `now`"""
+        now_ts = _to_epoch(now or datetime.utcnow())
+        ages = now_ts - self.timestamps
+        ages[np.isnan(ages)] = 0.0
+        return ages
+
+    def mean_sentiment(self) -> float:
+        return float(self.sentiment.mean()) if len(self) else 0.0
@@ -0,0 +1,87 @@
+"""
+Compact mention record used through scrape -> analyze -> score -> save
+Slotted (no per-instance __dict__) with interned source/label strings, and
+read-compatible with the dict mentions the scorer and UI expect
+"""
+
+import sys
+from datetime import datetime
+from typing import Dict, Optional
+
+
+class MentionRecord:
+    """A single scraped (and optionally analyzed) mention"""
+
+    __slots__ = ('source', 'url', 'text', 'title', 'sentiment_score', 'label', 'confidence', 'scraped_at',
+                 'cluster_id', 'duplicate_count')
+
+    def __init__(self, source: str, url: str, text: str, title: Optional[str] = None,
+                 sentiment_score: float = 0.0, label: str = 'neutral', confidence: float = 0.0,
+                 scraped_at: Optional[datetime] = None, cluster_id: Optional[str] = None,
+                 duplicate_count: int = 0):
+        self.source = sys.intern(source or 'unknown')
+        self.url = url or ''
+        self.text = text or ''
+        self.title = title
+        self.sentiment_score = sentiment_score
+        self.label = sys.intern(label or 'neutral')
+        self.confidence = confidence
+        self.scraped_at = scraped_at
+        self.cluster_id = cluster_id
+        self.duplicate_count = duplicate_count
+
+    @classmethod
+    def from_scraped(cls, data: Dict) -> 'MentionRecord':
+        """Build from a scraper result dict"""
+        return cls(
+            source=data.get('source', 'unknown'),
+            url=data.get('url', ''),
+            text=data.get('text', ''),
+            title=data.get('title')
+        )
+
+    @classmethod
+    def from_model(cls, mention) -> 'MentionRecord':
+        """Build from a database.Mention row"""
+        return cls(
+            source=mention.source,
+            url=mention.url,
+            text=mention.text_excerpt,
+            sentiment_score=mention.sentiment_score,
+            label=mention.label,
+            scraped_at=mention.scraped_at,
+            cluster_id=mention.cluster_id,
+            duplicate_count=mention.duplicate_count or 0
+        )
+
+    def set_analysis(self, sentiment_score: float, label: str, confidence: float, scraped_at: datetime):
+        """Attach sentiment analysis results in place"""
+        self.sentiment_score = sentiment_score
+        self.label = sys.intern(label)
+        self.confidence = confidence
+        self.scraped_at = scraped_at
+
+    # Mapping-style read access so existing dict consumers keep working
+
+    def __getitem__(self, key: str):
+        if key in self.__slots__:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__slots__
+
+    def get(self, key: str, default=None):
+        """Like dict.get: a stored None is returned as None, the default only covers unknown keys"""
+        if key in self.__slots__:
+            return getattr(self, key)
+        return default
+
+    def keys(self):
+        return self.__slots__
+
+    def to_dict(self) -> Dict:
+        return {key: getattr(self, key) for key in self.__slots__}
+
+    def __repr__(self):
+        return f"MentionRecord(source={self.source!r}, label={self.label!r}, url={self.url!r})"
@@ -0,0 +1,228 @@
+"""
+Metrics module for pipeline instrumentation
+Pluggable sinks for counters and histograms, with a Prometheus text-format
+exporter and a JSON log mode
+"""
+
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger('metrics')
+
+# Default histogram buckets in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _label_key(labels: Optional[Dict]) -> Tuple:
+    return tuple(sorted((labels or {}).items()))
+
+
+class MetricsSink:
+    """Base sink - discards everything"""
+
+    def increment(self, name: str, value: float = 1, labels: Optional[Dict] = None):
+        pass
+
+    def observe(self, name: str, value: float, labels: Optional[Dict] = None):
+        pass
+
+    @contextmanager
+    def timer(self, name: str, labels: Optional[Dict] = None):
+        """Observe the duration of the wrapped block in seconds"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, labels)
+
+
+class InMemoryMetrics(MetricsSink):
+    """Aggregates counters and histograms in process and renders Prometheus text format"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counters = {}
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: float = 1, labels: Optional[Dict] = None):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, labels: Optional[Dict] = None):
+        key = (name, _label_key(labels))
+        with self._lock:
+            hist = self.histograms.get(key)
+            if hist is None:
+                hist = {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+                self.histograms[key] = hist
+            for idx, bound in enumerate(self.buckets):
+                if value <= bound:
+                    hist['buckets'][idx] += 1
+            hist['sum'] += value
+            hist['count'] += 1
+
+    def snapshot(self) -> Dict:
+        """Plain-dict copy of the current values"""
+        with self._lock:
+            return {
+                'counters': {self._series(n, l): v for (n, l), v in self.counters.items()},
+                'histograms': {
+                    self._series(n, l): {'sum': h['sum'], 'count': h['count']}
+                    for (n, l), h in self.histograms.items()
+                }
+            }
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    @staticmethod
+    def _format_labels(labels: Tuple, extra: Optional[Tuple] = None) -> str:
+        items = list(labels) + list(extra or ())
+        if not items:
+            return ''
+        escaped = (
+            '{}="{}"'.format(k, str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+            for k, v in items
+        )
+        return '{' + ','.join(escaped) + '}'
+
+    def _series(self, name: str, labels: Tuple) -> str:
+        return name + self._format_labels(labels)
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            typed = set()
+            for (name, labels), value in sorted(self.counters.items()):
+                if name not in typed:
+                    lines.append(f"# TYPE {name} counter")
+                    typed.add(name)
+                lines.append(f"{self._series(name, labels)} {value}")
+
+            for (name, labels), hist in sorted(self.histograms.items()):
+                if name not in typed:
+                    lines.append(f"# TYPE {name} histogram")
+                    typed.add(name)
+                for bound, count in zip(self.buckets, hist['buckets']):
+                    lines.append(f"{name}_bucket{self._format_labels(labels, (('le', bound),))} {count}")
+                lines.append(f"{name}_bucket{self._format_labels(labels, (('le', '+Inf'),))} {hist['count']}")
+                lines.append(f"{name}_sum{self._format_labels(labels)} {hist['sum']}")
+                lines.append(f"{name}_count{self._format_labels(labels)} {hist['count']}")
+        return '\n'.join(lines) + '\n'
+
+
+class JsonLogMetrics(MetricsSink):
+    """Emits one JSON line per event on the 'metrics' logger"""
+
+    def __init__(self, log: Optional[logging.Logger] = None):
+        self.log = log or logger
+
+    def _emit(self, kind: str, name: str, value: float, labels: Optional[Dict]):
+        if self.log.isEnabledFor(logging.INFO):
+            self.log.info(json.dumps({
+                'ts': time.time(),
+                'type': kind,
+                'name': name,
+                'value': value,
+                'labels': labels or {}
+            }))
+
+    def increment(self, name: str, value: float = 1, labels: Optional[Dict] = None):
+        self._emit('counter', name, value, labels)
+
+    def observe(self, name: str, value: float, labels: Optional[Dict] = None):
+        self._emit('histogram', name, value, labels)
+
+
+class MultiSink(MetricsSink):
+    """Fans events out to several sinks"""
+
+    def __init__(self, *sinks: MetricsSink):
+        self.sinks = sinks
+
+    def increment(self, name: str, value: float = 1, labels: Optional[Dict] = None):
+        for sink in self.sinks:
+            sink.increment(name, value, labels)
+
+    def observe(self, name: str, value: float, labels: Optional[Dict] = None):
+        for sink in self.sinks:
+            sink.observe(name, value, labels)
+
+
+_default_sink: MetricsSink = InMemoryMetrics()
+
+
+def get_metrics() -> MetricsSink:
+    """Get the process-wide metrics sink"""
+    return _default_sink
+
+
+def set_metrics(sink: MetricsSink):
+    """Replace the process-wide metrics sink"""
+    global _default_sink
+    _default_sink = sink
+
+
+def configure_metrics(mode: str = 'memory') -> MetricsSink:
+    """
+    Configure the process-wide sink
+    mode: 'memory' (Prometheus exporter), 'json' (JSON log lines),
+          'both', or 'none'
+    """
+    if mode == 'json':
+        sink = JsonLogMetrics()
+    elif mode == 'both':
+        sink = MultiSink(InMemoryMetrics(), JsonLogMetrics())
+    elif mode == 'none':
+        sink = MetricsSink()
+    else:
+        sink = InMemoryMetrics()
+    set_metrics(sink)
+    return sink
+
+
+def _find_memory_sink(sink: MetricsSink) -> Optional[InMemoryMetrics]:
+    if isinstance(sink, InMemoryMetrics):
+        return sink
+    if isinstance(sink, MultiSink):
+        for child in sink.sinks:
+            found = _find_memory_sink(child)
+            if found:
+                return found
+    return None
+
+
+def start_prometheus_server(port: int = 9108, addr: str = '') -> HTTPServer:
+    """Serve the process-wide in-memory metrics on /metrics in a daemon thread"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            sink = _find_memory_sink(get_metrics())
+            if self.path != '/metrics' or sink is None:
+                self.send_response(404)
+                self.end_headers()
+                return
+            body = sink.render_prometheus().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = HTTPServer((addr, port), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
@@ -7,6 +7,54 @@ import os
 
 DB_PATH = 'influencer_monitor.db'
 
+def backfill_normalized_names(cursor):
+    """
+    Fill influencers.normalized_name, merging spellings of the same name
+    into the most recently updated row. Returns the number of rows merged.
+    """
+    from name_index import normalize_name
+    
+    cursor.execute("SELECT id, name FROM influencers ORDER BY last_updated DESC, id DESC")
+    canonical = {}
+    merged = 0
+    for influencer_id, name in cursor.fetchall():
+        key = normalize_name(name)
+        if key not in canonical:
+            canonical[key] = name
+            cursor.execute("UPDATE influencers SET normalized_name = ? WHERE id = ?", (key, influencer_id))
+            continue
+        
+        target = canonical[key]
+        for table in ('mentions', 'mention_duplicates', 'analysis_history'):
+            cursor.execute(f"UPDATE {table} SET influencer_name = ? WHERE influencer_name = ?", (target, name))
+        cursor.execute("DELETE FROM influencers WHERE id = ?", (influencer_id,))
+        merged += 1
+    return merged
+
+def compact_contributor_stats(cursor):
+    """
+    Fold the old rolling contributor_stats rows into contributor_daily_stats
+    
+    Each analysis incremented a 'day' row whose period_start was the previous
+    midnight, so period_start + 1 day is the day it happened (written in
+    SQLAlchemy's DateTime text format so it matches new buckets). The 'week' and
+    'month' rows only duplicate those counts and are dropped with the table.
+    Returns the number of daily buckets written.
+    """
+    cursor.execute("""
+        INSERT INTO contributor_daily_stats (contributor_id, day, points_earned, analyses_count)
+        SELECT contributor_id, datetime(period_start, '+1 day') || '.000000', SUM(points_earned), SUM(analyses_count)
+        FROM contributor_stats
+        WHERE period = 'day'
+        GROUP BY contributor_id, datetime(period_start, '+1 day')
+        ON CONFLICT (contributor_id, day) DO UPDATE SET
+            points_earned = points_earned + excluded.points_earned,
+            analyses_count = analyses_count + excluded.analyses_count
+    """)
+    compacted = cursor.rowcount
+    cursor.execute("DROP TABLE contributor_stats")
+    return compacted
+
 def migrate_database():
     """Add new tables and columns to existing database"""
     
@@ -44,26 +92,27 @@ def migrate_database():
         else:
             print("✅ Contributors table already exists")
         
-        # Check if contributor_stats table exists
+        # Daily contributor buckets (replace the rolling contributor_stats rows)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS contributor_daily_stats (
+                id INTEGER PRIMARY KEY,
+                contributor_id INTEGER NOT NULL,
+                day DATETIME NOT NULL,
+                points_earned INTEGER DEFAULT 0,
+                analyses_count INTEGER DEFAULT 0,
+                FOREIGN KEY (contributor_id) REFERENCES contributors(id)
+            )
+        """)
+        cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_daily_contributor_day ON contributor_daily_stats(contributor_id, day)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_daily_day ON contributor_daily_stats(day, contributor_id)")
+        
         cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='contributor_stats'")
-        if not cursor.fetchone():
-            print("Creating contributor_stats table...")
-            cursor.execute("""
-                CREATE TABLE contributor_stats (
-                    id INTEGER PRIMARY KEY,
-                    contributor_id INTEGER NOT NULL,
-                    period VARCHAR(20) NOT NULL,
-                    period_start DATETIME NOT NULL,
-                    points_earned INTEGER DEFAULT 0,
-                    analyses_count INTEGER DEFAULT 0,
-                    FOREIGN KEY (contributor_id) REFERENCES contributors(id)
-                )
-            """)
-            cursor.execute("CREATE INDEX idx_contributor_period ON contributor_stats(contributor_id, period, period_start)")
-            cursor.execute("CREATE INDEX idx_period_points ON contributor_stats(period, points_earned)")
-            print("✅ Contributor_stats table created")
+        if cursor.fetchone():
+            print("Compacting contributor_stats into daily buckets...")
+            compacted = compact_contributor_stats(cursor)
+            print(f"✅ Compacted into {compacted} daily buckets, contributor_stats dropped")
         else:
-            print("✅ Contributor_stats table already exists")
+            print("✅ Contributor_daily_stats table ready")
         
         # Check if analysis_history table has contributor_id column
         cursor.execute("PRAGMA table_info(analysis_history)")
@@ -79,7 +128,84 @@ def migrate_database():
         else:
             print("✅ Analysis_history already has contributor columns")
         
+        # Check if mentions table has near-duplicate cluster columns
+        cursor.execute("PRAGMA table_info(mentions)")
+        columns = [col[1] for col in cursor.fetchall()]
+        
+        if columns and 'cluster_id' not in columns:
+            print("Adding cluster columns to mentions...")
+            cursor.execute("ALTER TABLE mentions ADD COLUMN cluster_id VARCHAR(16)")
+            cursor.execute("ALTER TABLE mentions ADD COLUMN duplicate_count INTEGER DEFAULT 0")
+            cursor.execute("CREATE INDEX idx_mention_cluster ON mentions(cluster_id)")
+            print("✅ Added cluster columns to mentions")
+        elif columns:
+            print("✅ Mentions already have cluster columns")
+        else:
+            print("ℹ️  No mentions table yet, it will be created with cluster columns")
+        
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='mentions'")
+        if cursor.fetchone():
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_mention_influencer_scraped ON mentions(influencer_name, scraped_at, id)"
+            )
+            print("✅ Mention pagination index ready")
+        
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='mention_duplicates'")
+        if not cursor.fetchone():
+            print("Creating mention_duplicates table...")
+            cursor.execute("""
+                CREATE TABLE mention_duplicates (
+                    id INTEGER PRIMARY KEY,
+                    cluster_id VARCHAR(16) NOT NULL,
+                    influencer_name VARCHAR(255) NOT NULL,
+                    source VARCHAR(50) NOT NULL,
+                    url TEXT NOT NULL,
+                    scraped_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            cursor.execute("CREATE INDEX idx_duplicate_cluster ON mention_duplicates(cluster_id)")
+            print("✅ Mention_duplicates table created")
+        else:
+            print("✅ Mention_duplicates table already exists")
+        
+        # Check if influencers table has normalized names
+        cursor.execute("PRAGMA table_info(influencers)")
+        columns = [col[1] for col in cursor.fetchall()]
+        
+        if columns and 'normalized_name' not in columns:
+            print("Adding normalized_name to influencers...")
+            cursor.execute("ALTER TABLE influencers ADD COLUMN normalized_name VARCHAR(255)")
+            merged = backfill_normalized_names(cursor)
+            cursor.execute("CREATE UNIQUE INDEX ix_influencers_normalized_name ON influencers(normalized_name)")
+            print(f"✅ Added normalized_name ({merged} duplicate spellings merged)")
+        else:
+            print("✅ Influencers already have normalized names")
+        
         conn.commit()
+        
+        # Score rollups and achievements are SQLAlchemy tables; create and backfill
+        # them in this same file (not config.DATABASE_URL)
+        import database
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+        engine = create_engine(f"sqlite:///{DB_PATH}")
+        database.Base.metadata.create_all(engine, tables=[
+            database.ScoreRollup.__table__, database.ContributorAchievement.__table__
+        ])
+        db = sessionmaker(bind=engine)()
+        if db.query(database.ScoreRollup).first() is None and db.query(database.AnalysisHistory).first() is not None:
+            print("Backfilling trust score rollups...")
+            database.rebuild_score_rollups(db)
+            print("✅ Score rollups backfilled")
+        
+        # Achievements are persisted now; unlock the ones already earned
+        if db.query(database.ContributorAchievement).first() is None and db.query(database.Contributor).first() is not None:
+            print("Backfilling contributor achievements...")
+            added = database.backfill_achievements(db)
+            print(f"✅ {added} achievements unlocked")
+        db.close()
+        engine.dispose()
+        
         print("\n🎉 Database migration completed successfully!")
         
     except Exception as e:
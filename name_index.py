@@ -0,0 +1,122 @@
+"""
+Influencer name normalization and autocomplete index
+Folds case, accents, punctuation and whitespace so "Squeezie", "squeezie "
+and "SQUEEZIE" resolve to the same influencer, and serves prefix/trigram
+suggestions from memory for the search box
+"""
+
+import bisect
+import re
+import threading
+import unicodedata
+from typing import Dict, List, Optional, Set
+
+_SEPARATORS = re.compile(r"[\s\-_'’.]+")
+
+
+def normalize_name(name: str) -> str:
+    """Case/accent/whitespace-folded lookup key for an influencer name"""
+    if not name:
+        return ''
+    folded = unicodedata.normalize('NFKD', name)
+    folded = ''.join(c for c in folded if not unicodedata.combining(c))
+    return _SEPARATORS.sub(' ', folded.casefold()).strip()
+
+
+def display_name(name: str) -> str:
+    """Cleaned-up name as typed (surrounding and repeated whitespace removed)"""
+    return ' '.join((name or '').split())
+
+
+def _trigrams(key: str) -> Set[str]:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """Sorted-key prefix index plus a trigram index for fuzzy matches"""
+
+    def __init__(self):
+        self._keys: List[str] = []
+        self._names: Dict[str, str] = {}
+        self._trigrams: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, name: str):
+        key = normalize_name(name)
+        if not key:
+            return
+        with self._lock:
+            if key in self._names:
+                return
+            bisect.insort(self._keys, key)
+            self._names[key] = name
+            for gram in _trigrams(key):
+                self._trigrams.setdefault(gram, set()).add(key)
+
+    def lookup(self, name: str) -> Optional[str]:
+        """Canonical name for an exact normalized match"""
+        return self._names.get(normalize_name(name))
+
+    def suggest(self, query: str, limit: int = 8, min_similarity: float = 0.3) -> List[str]:
+        """Prefix matches first, then trigram (typo-tolerant) matches"""
+        key = normalize_name(query)
+        if not key:
+            return []
+
+        # add() may be inserting from another thread
+        with self._lock:
+            return self._suggest(key, limit, min_similarity)
+
+    def _suggest(self, key: str, limit: int, min_similarity: float) -> List[str]:
+        results = []
+        start = bisect.bisect_left(self._keys, key)
+        for candidate in self._keys[start:start + limit]:
+            if not candidate.startswith(key):
+                break
+            results.append(candidate)
+
+        if len(results) < limit:
+            grams = _trigrams(key)
+            scores = {}
+            for gram in grams:
+                for candidate in self._trigrams.get(gram, ()):
+                    scores[candidate] = scores.get(candidate, 0) + 1
+            ranked = sorted(
+                ((count / len(grams | _trigrams(candidate)), candidate) for candidate, count in scores.items()),
+                reverse=True
+            )
+            for similarity, candidate in ranked:
+                if len(results) >= limit or similarity < min_similarity:
+                    break
+                if candidate not in results:
+                    results.append(candidate)
+
+        return [self._names[candidate] for candidate in results]
+
+
+_index: Optional[NameIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_name_index(db) -> NameIndex:
+    """Process-wide index, loaded from the influencers table on first use"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                import database
+                index = NameIndex()
+                for (name,) in db.query(database.Influencer.name):
+                    index.add(name)
+                _index = index
+    return _index
+
+
+def notify_insert(name: str):
+    """Keep the index current when an influencer is created (no-op until loaded)"""
+    if _index is not None:
+        _index.add(name)
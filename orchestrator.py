@@ -1,29 +1,99 @@
 import asyncio
+import logging
+import threading
+import time
 from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
-from scrapers import NewsScraper, YouTubeScraper, TwitterScraper, RedditScraper, ForumScraper
-from analyzer import SentimentAnalyzer
+from scrapers import get_scrapers
 from scorer import TrustScorer
 from leaderboard import LeaderboardManager
 import database
+from metrics import MetricsSink, get_metrics
+from mention_record import MentionRecord
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
 class InfluencerOrchestrator:
     """Orchestrates parallel scraping, analysis, and scoring"""
     
-    def __init__(self):
-        self.scrapers = {
-            'news': NewsScraper(),
-            'youtube': YouTubeScraper(),
-            'twitter': TwitterScraper(),
-            'reddit': RedditScraper(),
-            'forum': ForumScraper()
-        }
-        self.analyzer = SentimentAnalyzer()
+    def __init__(self, scrapers: Optional[Dict] = None, metrics: Optional[MetricsSink] = None):
+        # Scrapers, the sentiment model and the dedup detector are built on
+        # first use so constructing the orchestrator (and app boot) stays cheap
+        self._scrapers = scrapers
+        self._analyzer = None
+        self._analyzer_pool = None
+        self._dedup = None
+        self._dedup_loaded = False
+        self._metrics = metrics
+        # Streamlit reruns and bench workers share one orchestrator; load each piece once
+        self._load_lock = threading.RLock()
         self.scorer = TrustScorer()
         self.leaderboard = LeaderboardManager()
         self.db = database.get_db()
     
+    @property
+    def scrapers(self) -> Dict:
+        if self._scrapers is None:
+            with self._load_lock:
+                if self._scrapers is None:
+                    self._scrapers = get_scrapers()
+        return self._scrapers
+    
+    @property
+    def analyzer(self):
+        """
+        Sentiment analyzer on config.ANALYZER_BACKEND - model weights load on
+        first analysis, or a client of the shared analyzer server when
+        config.ANALYZER_SERVER_ADDRESS is set
+        """
+        if self._analyzer is None:
+            with self._load_lock:
+                if self._analyzer is None:
+                    import config
+                    if getattr(config, 'ANALYZER_SERVER_ADDRESS', None):
+                        from analyzer_server import RemoteAnalyzer
+                        self._analyzer = RemoteAnalyzer(config.ANALYZER_SERVER_ADDRESS)
+                    else:
+                        from inference_backend import load_analyzer
+                        self._analyzer = load_analyzer()
+        return self._analyzer
+    
+    @property
+    def analyzer_pool(self):
+        """Per-language analyzers; French and English share the default SentimentAnalyzer"""
+        if self._analyzer_pool is None:
+            with self._load_lock:
+                if self._analyzer_pool is None:
+                    from language import AnalyzerPool
+                    self._analyzer_pool = AnalyzerPool({
+                        'fr': self._default_analyzer,
+                        'en': self._default_analyzer,
+                    }, default_language='fr')
+        return self._analyzer_pool
+    
+    def _default_analyzer(self):
+        return self.analyzer
+    
+    @property
+    def dedup(self):
+        """Near-duplicate detector, or None when NumPy is unavailable"""
+        if not self._dedup_loaded:
+            with self._load_lock:
+                if not self._dedup_loaded:
+                    try:
+                        from dedup import NearDuplicateDetector
+                        self._dedup = NearDuplicateDetector()
+                    except ImportError:
+                        self._dedup = None
+                    self._dedup_loaded = True
+        return self._dedup
+    
+    @property
+    def metrics(self) -> MetricsSink:
+        """Metrics sink - the process-wide one unless injected"""
+        return self._metrics or get_metrics()
+    
     async def analyze_influencer(self, influencer_name: str, progress_callback=None, contributor_username: Optional[str] = None) -> Dict:
         """
         Main orchestration method - runs all scrapers in parallel
@@ -34,7 +104,13 @@ class InfluencerOrchestrator:
             progress_callback: Optional callback for progress updates
             contributor_username: Optional username of contributor performing analysis
         """
-        print(f"\n🔍 Starting analysis for: {influencer_name}")
+        # Reuse the stored spelling so variants share mentions and cache
+        influencer_name = database.resolve_influencer_name(self.db, influencer_name)
+        logger.info("Starting analysis for: %s", influencer_name)
+        metrics = self.metrics
+        started = time.perf_counter()
+        # Mentions saved by this run are stamped at or after this time
+        analyzed_at = datetime.utcnow()
         
         if progress_callback:
             progress_callback("Initializing scrapers...", 0)
@@ -43,72 +119,92 @@ class InfluencerOrchestrator:
         if progress_callback:
             progress_callback("Scraping data from multiple sources...", 10)
         
-        scraping_results = await self._run_scrapers_parallel(influencer_name)
+        with metrics.timer('pipeline_stage_seconds', {'stage': 'scrape'}):
+            scraping_results = await self._run_scrapers_parallel(influencer_name)
+        
+        logger.info("Scraped %d mentions", len(scraping_results))
         
-        print(f"✅ Scraped {len(scraping_results)} mentions")
+        # Step 2: Collapse near-duplicates so each unique text is analyzed once
+        with metrics.timer('pipeline_stage_seconds', {'stage': 'dedup'}):
+            unique_mentions, duplicates = self._cluster_mentions(scraping_results)
+        metrics.increment('mentions_duplicate_total', len(duplicates))
         
-        # Step 2: Analyze sentiment for all mentions
+        logger.info("%d unique mentions, %d near-duplicates", len(unique_mentions), len(duplicates))
+        
+        # Step 3: Analyze sentiment for cluster representatives
         if progress_callback:
             progress_callback("Analyzing sentiment...", 40)
         
-        analyzed_mentions = self._analyze_mentions(scraping_results)
+        with metrics.timer('pipeline_stage_seconds', {'stage': 'analyze'}):
+            analyzed_mentions = self._analyze_mentions(unique_mentions)
+            self._propagate_analysis(analyzed_mentions, duplicates)
+        metrics.increment('mentions_analyzed_total', len(analyzed_mentions))
         
-        print(f"✅ Analyzed {len(analyzed_mentions)} mentions")
+        logger.info("Analyzed %d mentions", len(analyzed_mentions))
         
-        # Step 3: Save to database
+        # Step 4: Save to database
         if progress_callback:
             progress_callback("Saving to database...", 70)
         
-        self._save_mentions(influencer_name, analyzed_mentions)
+        with metrics.timer('pipeline_stage_seconds', {'stage': 'save'}):
+            self._save_mentions(influencer_name, analyzed_mentions, duplicates)
         
-        # Step 4: Calculate trust score
+        # Step 5: Calculate trust score (copies are not counted twice)
         if progress_callback:
             progress_callback("Calculating trust score...", 85)
         
-        score_data = self.scorer.calculate_trust_score(analyzed_mentions)
+        with metrics.timer('pipeline_stage_seconds', {'stage': 'score'}):
+            score_data = self.scorer.calculate_trust_score(analyzed_mentions)
         
-        # Step 5: Calculate points and quality score for contributor
+        # Step 6: Calculate points and quality score for contributor
         contributor_id = None
         points_awarded = 10
         quality_score = 1.0
         
-        if contributor_username:
-            contributor = database.get_or_create_contributor(self.db, contributor_username)
-            contributor_id = contributor.id
-            
-            # Calculate quality score based on analysis
-            quality_score = self.leaderboard.calculate_quality_score(analyzed_mentions)
-            
-            # Calculate points with bonuses
-            points_awarded = self.leaderboard.calculate_points(
-                mentions_count=len(analyzed_mentions),
-                quality_score=quality_score,
-                streak_days=contributor.streak_days
+        with metrics.timer('pipeline_stage_seconds', {'stage': 'leaderboard'}):
+            if contributor_username:
+                contributor = database.get_or_create_contributor(self.db, contributor_username)
+                contributor_id = contributor.id
+                
+                # Calculate quality score based on analysis
+                quality_score = self.leaderboard.calculate_quality_score(self._as_batch(analyzed_mentions))
+                
+                # Calculate points with bonuses
+                points_awarded = self.leaderboard.calculate_points(
+                    mentions_count=len(analyzed_mentions),
+                    quality_score=quality_score,
+                    streak_days=contributor.streak_days
+                )
+                
+                logger.info("Points awarded: %d (Quality: %.2f)", points_awarded, quality_score)
+        
+        # Step 7: Update influencer record with contributor info (its own stage: this is a DB write)
+        with metrics.timer('pipeline_stage_seconds', {'stage': 'save_score'}):
+            database.update_influencer_score(
+                self.db,
+                influencer_name,
+                score_data['trust_score'],
+                score_data['drama_count'],
+                score_data['good_action_count'],
+                contributor_id=contributor_id,
+                points_awarded=points_awarded,
+                quality_score=quality_score
             )
-            
-            print(f"🎯 Points awarded: {points_awarded} (Quality: {quality_score:.2f})")
-        
-        # Step 6: Update influencer record with contributor info
-        database.update_influencer_score(
-            self.db,
-            influencer_name,
-            score_data['trust_score'],
-            score_data['drama_count'],
-            score_data['good_action_count'],
-            contributor_id=contributor_id,
-            points_awarded=points_awarded,
-            quality_score=quality_score
-        )
         
         if progress_callback:
             progress_callback("Analysis complete!", 100)
         
-        print(f"✅ Trust Score: {score_data['trust_score']}/100")
-        print(f"   Dramas: {score_data['drama_count']}")
-        print(f"   Good Actions: {score_data['good_action_count']}")
+        metrics.observe('analysis_seconds', time.perf_counter() - started)
+        metrics.increment('analyses_total')
+        
+        logger.info(
+            "Trust Score: %s/100 (dramas: %d, good actions: %d)",
+            score_data['trust_score'], score_data['drama_count'], score_data['good_action_count']
+        )
         
         return {
             'influencer_name': influencer_name,
+            'analyzed_at': analyzed_at,
             'mentions': analyzed_mentions,
             'score_data': score_data,
             'trust_level': self.scorer.get_trust_level(score_data['trust_score']),
@@ -117,7 +213,7 @@ class InfluencerOrchestrator:
             'quality_score': quality_score if contributor_username else None
         }
     
-    async def _run_scrapers_parallel(self, influencer_name: str) -> List[Dict]:
+    async def _run_scrapers_parallel(self, influencer_name: str) -> List[MentionRecord]:
         """Run all scrapers in parallel using asyncio"""
         tasks = []
         
@@ -134,92 +230,178 @@ class InfluencerOrchestrator:
         all_mentions = []
         for result in results:
             if isinstance(result, list):
-                all_mentions.extend(result)
+                all_mentions.extend(MentionRecord.from_scraped(item) for item in result)
             elif isinstance(result, Exception):
-                print(f"Scraper error: {str(result)}")
+                logger.warning("Scraper error: %s", result)
         
         return all_mentions
     
     async def _safe_scrape(self, scraper, influencer_name: str, scraper_name: str) -> List[Dict]:
         """Safely run a scraper with error handling"""
+        labels = {'source': scraper_name}
+        start = time.perf_counter()
         try:
-            print(f"  🔄 Running {scraper_name} scraper...")
+            logger.debug("Running %s scraper...", scraper_name)
             results = await scraper.scrape(influencer_name)
-            print(f"  ✅ {scraper_name}: {len(results)} results")
+            logger.debug("%s: %d results", scraper_name, len(results))
+            self.metrics.increment('mentions_scraped_total', len(results), labels)
             return results
         except Exception as e:
-            print(f"  ❌ {scraper_name} error: {str(e)}")
+            logger.warning("%s scraper error: %s", scraper_name, e)
+            self.metrics.increment('scrape_errors_total', 1, labels)
             return []
+        finally:
+            self.metrics.observe('scrape_seconds', time.perf_counter() - start, labels)
+    
+    def _cluster_mentions(self, mentions: List[MentionRecord]):
+        """
+        Group near-duplicate texts
+        Returns (representatives, duplicates); every record gets a cluster_id
+        and representatives carry their duplicate_count
+        """
+        if self.dedup is None:
+            return mentions, []
+        
+        from dedup import cluster_key
+        
+        with_text = [m for m in mentions if m.text]
+        roots = self.dedup.cluster([m.text for m in with_text])
+        
+        representatives = [m for m in mentions if not m.text]
+        duplicates = []
+        for mention, root in zip(with_text, roots):
+            representative = with_text[root]
+            if representative.cluster_id is None:
+                representative.cluster_id = cluster_key(representative.text)
+            if mention is representative:
+                representatives.append(mention)
+            else:
+                mention.cluster_id = representative.cluster_id
+                representative.duplicate_count += 1
+                duplicates.append(mention)
+        
+        return representatives, duplicates
     
-    def _analyze_mentions(self, mentions: List[Dict]) -> List[Dict]:
-        """Analyze sentiment for all mentions"""
-        analyzed = []
+    def _propagate_analysis(self, analyzed: List[MentionRecord], duplicates: List[MentionRecord]):
+        """Copy each representative's analysis onto its near-duplicates"""
+        by_cluster = {m.cluster_id: m for m in analyzed if m.cluster_id}
+        for mention in duplicates:
+            representative = by_cluster.get(mention.cluster_id)
+            if representative is not None:
+                mention.set_analysis(
+                    representative.sentiment_score,
+                    representative.label,
+                    representative.confidence,
+                    representative.scraped_at
+                )
+    
+    def _analyze_mentions(self, mentions: List[MentionRecord]) -> List[MentionRecord]:
+        """
+        Analyze sentiment for all mentions (records are updated in place)
+        Mentions are grouped by detected language and each group is sent as
+        one batch to that language's analyzer. Undetermined texts go to the
+        default analyzer; languages without an analyzer are not run through
+        a model and are saved as neutral with zero confidence.
+        """
+        from language import group_by_language
+        
+        pool = self.analyzer_pool
+        scraped_at = datetime.utcnow()
+        with_text = [m for m in mentions if m.text]
         
-        for mention in mentions:
-            text = mention.get('text', '')
-            if not text:
+        batches = {}
+        for language, indexes in group_by_language([m.text for m in with_text]).items():
+            self.metrics.increment('mentions_by_language_total', len(indexes), {'language': language})
+            target = pool.route(language)
+            if target is None:
+                self.metrics.increment('mentions_language_skipped_total', len(indexes), {'language': language})
+                for idx in indexes:
+                    with_text[idx].set_analysis(0.0, 'neutral', 0.0, scraped_at)
                 continue
-            
-            # Analyze sentiment
-            analysis = self.analyzer.analyze_text(text)
-            
-            # Combine mention data with analysis
-            analyzed_mention = {
-                **mention,
-                'sentiment_score': analysis['sentiment_score'],
-                'label': analysis['label'],
-                'confidence': analysis['confidence'],
-                'scraped_at': datetime.utcnow()
-            }
-            
-            analyzed.append(analyzed_mention)
-        
-        return analyzed
-    
-    def _save_mentions(self, influencer_name: str, mentions: List[Dict]):
-        """Save analyzed mentions to database"""
-        for mention in mentions:
+            batches.setdefault(target, []).extend(indexes)
+        
+        for language, indexes in batches.items():
+            group = [with_text[idx] for idx in indexes]
+            analyses = pool.analyze_batch(language, [m.text for m in group])
+            for mention, analysis in zip(group, analyses):
+                mention.set_analysis(
+                    analysis['sentiment_score'],
+                    analysis['label'],
+                    analysis['confidence'],
+                    scraped_at
+                )
+        
+        return with_text
+    
+    def _as_batch(self, mentions: List[MentionRecord]):
+        """Columnar MentionBatch for vectorized scoring, or the list itself without NumPy"""
+        try:
+            from mention_batch import MentionBatch
+        except ImportError:
+            return mentions
+        return MentionBatch.from_mentions(mentions)
+    
+    def _save_mentions(self, influencer_name: str, mentions: List[MentionRecord], duplicates: Optional[List[MentionRecord]] = None):
+        """Save analyzed mentions to database, and near-duplicates as cluster membership"""
+        rows = [{
+            'source': mention.source,
+            'url': mention.url,
+            'text_excerpt': mention.text,
+            'sentiment_score': mention.sentiment_score,
+            'label': mention.label,
+            'scraped_at': mention.scraped_at,
+            'cluster_id': mention.cluster_id,
+            'duplicate_count': mention.duplicate_count
+        } for mention in mentions]
+        
+        try:
+            database.save_mentions_bulk(self.db, influencer_name, rows)
+        except Exception as e:
+            # Fall back to row by row so one bad mention does not drop the batch
+            logger.warning("Bulk mention save failed, saving one by one: %s", e)
+            self.db.rollback()
+            for row in rows:
+                try:
+                    database.save_mention(self.db, influencer_name=influencer_name, **row)
+                except Exception as e:
+                    logger.warning("Error saving mention: %s", e)
+                    self.db.rollback()
+                    self.metrics.increment('save_errors_total')
+        
+        if duplicates:
             try:
-                database.save_mention(
+                database.save_mention_duplicates(
                     self.db,
-                    influencer_name=influencer_name,
-                    source=mention.get('source', 'unknown'),
-                    url=mention.get('url', ''),
-                    text_excerpt=mention.get('text', ''),
-                    sentiment_score=mention.get('sentiment_score', 0.0),
-                    label=mention.get('label', 'neutral')
+                    influencer_name,
+                    [(m.cluster_id, m.source, m.url) for m in duplicates]
                 )
             except Exception as e:
-                print(f"Error saving mention: {str(e)}")
+                logger.warning("Error saving duplicates: %s", e)
+                self.metrics.increment('save_errors_total')
     
     def get_cached_results(self, influencer_name: str) -> Dict:
-        """Get cached results from database"""
+        """Get cached results from database, scored from the mentions of the latest analysis run"""
         data = database.get_influencer_data(self.db, influencer_name)
         
         if not data:
+            self.metrics.increment('cache_requests_total', 1, {'result': 'miss'})
             return None
         
+        self.metrics.increment('cache_requests_total', 1, {'result': 'hit'})
+        
         influencer = data['influencer']
-        mentions = data['mentions']
-        
-        # Convert mentions to dict format
-        mention_dicts = []
-        for m in mentions:
-            mention_dicts.append({
-                'url': m.url,
-                'text': m.text_excerpt,
-                'source': m.source,
-                'sentiment_score': m.sentiment_score,
-                'label': m.label,
-                'scraped_at': m.scraped_at
-            })
+        run_start, analyzed_at = database.get_latest_run_window(self.db, influencer.name)
+        mentions = database.get_influencer_mentions(self.db, influencer.name, limit=None, since=run_start)
+        
+        records = [MentionRecord.from_model(m) for m in mentions]
         
         # Recalculate score from cached mentions
-        score_data = self.scorer.calculate_trust_score(mention_dicts)
+        score_data = self.scorer.calculate_trust_score(records)
         
         return {
-            'influencer_name': influencer_name,
-            'mentions': mention_dicts,
+            'influencer_name': influencer.name,
+            'analyzed_at': analyzed_at,
+            'mentions': records,
             'score_data': score_data,
             'trust_level': self.scorer.get_trust_level(score_data['trust_score']),
             'trust_color': self.scorer.get_trust_color(score_data['trust_score']),
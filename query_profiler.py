@@ -0,0 +1,239 @@
+"""
+Opt-in SQL profiling for the database engine
+Records latency, row count and call site for every statement, groups them
+per request and flags N+1 patterns (the same statement repeated many times
+in one request)
+
+Usage:
+    profiler = QueryProfiler(database.engine).enable()
+    with profiler.request('get_rankings') as profile:
+        leaderboard_manager.get_rankings('week')
+    print(profile.format_report())
+
+Run `python query_profiler.py` to profile the query-heavy leaderboard calls
+against a throwaway in-memory SQLite database.
+"""
+
+import contextvars
+import functools
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+
+_current_request = contextvars.ContextVar('query_profiler_request', default=None)
+
+_SQLALCHEMY_DIR = None
+_THIS_FILE = os.path.abspath(__file__)
+
+_WHITESPACE = re.compile(r'\s+')
+_PARAM_LIST = re.compile(r'\(\s*(?:\?|%\(\w+\)s|%s|:\w+)(?:\s*,\s*(?:\?|%\(\w+\)s|%s|:\w+))*\s*\)')
+
+
+def normalize_statement(statement: str) -> str:
+    """Collapse whitespace and expanded IN-lists so repeated statements group together"""
+    statement = _WHITESPACE.sub(' ', statement).strip()
+    return _PARAM_LIST.sub('(...)', statement)
+
+
+def _call_site() -> str:
+    """First stack frame outside SQLAlchemy and this module"""
+    global _SQLALCHEMY_DIR
+    if _SQLALCHEMY_DIR is None:
+        import sqlalchemy
+        _SQLALCHEMY_DIR = os.path.dirname(os.path.abspath(sqlalchemy.__file__))
+
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        raw = frame.f_code.co_filename
+        if not raw.startswith('<') and filename != _THIS_FILE \
+                and not filename.startswith(_SQLALCHEMY_DIR) and 'contextlib' not in filename:
+            return f"{os.path.basename(filename)}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return '<unknown>'
+
+
+class QueryRecord:
+    """A single executed statement"""
+    __slots__ = ('statement', 'duration', 'rowcount', 'call_site')
+
+    def __init__(self, statement: str, duration: float, rowcount: Optional[int], call_site: str):
+        self.statement = statement
+        self.duration = duration
+        self.rowcount = rowcount
+        self.call_site = call_site
+
+
+class RequestProfile:
+    """Statements executed while a request was active"""
+
+    def __init__(self, name: str, n_plus_one_threshold: int = 5):
+        self.name = name
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.queries: List[QueryRecord] = []
+        self.started = time.perf_counter()
+        self.elapsed = None
+
+    def summary(self) -> Dict:
+        """
+        Aggregate the recorded statements
+
+        Returns per-statement totals sorted by time spent, and the statements
+        repeated at least `n_plus_one_threshold` times (likely N+1 loops)
+        """
+        by_statement = {}
+        for q in self.queries:
+            key = normalize_statement(q.statement)
+            entry = by_statement.get(key)
+            if entry is None:
+                entry = {'statement': key, 'count': 0, 'total_time': 0.0, 'max_time': 0.0,
+                         'rows': None, 'call_sites': {}}
+                by_statement[key] = entry
+            entry['count'] += 1
+            entry['total_time'] += q.duration
+            entry['max_time'] = max(entry['max_time'], q.duration)
+            if q.rowcount is not None:
+                entry['rows'] = (entry['rows'] or 0) + q.rowcount
+            entry['call_sites'][q.call_site] = entry['call_sites'].get(q.call_site, 0) + 1
+
+        statements = sorted(by_statement.values(), key=lambda e: e['total_time'], reverse=True)
+        return {
+            'name': self.name,
+            'query_count': len(self.queries),
+            'query_time': sum(q.duration for q in self.queries),
+            'elapsed': self.elapsed if self.elapsed is not None else time.perf_counter() - self.started,
+            'statements': statements,
+            'n_plus_one': [e for e in statements if e['count'] >= self.n_plus_one_threshold]
+        }
+
+    def format_report(self, top: int = 10) -> str:
+        """Human-readable summary"""
+        s = self.summary()
+        lines = [
+            f"📊 {s['name']}: {s['query_count']} queries, "
+            f"{s['query_time'] * 1000:.1f} ms in SQL / {s['elapsed'] * 1000:.1f} ms total"
+        ]
+        for entry in s['statements'][:top]:
+            sites = ', '.join(f"{site} ×{n}" for site, n in entry['call_sites'].items())
+            rows = 'n/a' if entry['rows'] is None else entry['rows']
+            lines.append(
+                f"   {entry['total_time'] * 1000:8.2f} ms  ×{entry['count']:<4} rows={rows:<6} "
+                f"{entry['statement'][:100]}"
+            )
+            lines.append(f"              at {sites}")
+        for entry in s['n_plus_one']:
+            lines.append(f"   ⚠️ N+1 suspect ({entry['count']}×): {entry['statement'][:100]}")
+        return '\n'.join(lines)
+
+
+class QueryProfiler:
+    """Attaches to an engine's cursor events and records statements per request"""
+
+    def __init__(self, engine, n_plus_one_threshold: int = 5, record_outside_requests: bool = False):
+        self.engine = engine
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.record_outside_requests = record_outside_requests
+        self.global_profile = RequestProfile('<no request>', n_plus_one_threshold)
+        self.enabled = False
+        self._lock = threading.Lock()
+
+    def enable(self) -> 'QueryProfiler':
+        if not self.enabled:
+            event.listen(self.engine, 'before_cursor_execute', self._before_execute)
+            event.listen(self.engine, 'after_cursor_execute', self._after_execute)
+            event.listen(self.engine, 'handle_error', self._handle_error)
+            self.enabled = True
+        return self
+
+    def disable(self):
+        if self.enabled:
+            event.remove(self.engine, 'before_cursor_execute', self._before_execute)
+            event.remove(self.engine, 'after_cursor_execute', self._after_execute)
+            event.remove(self.engine, 'handle_error', self._handle_error)
+            self.enabled = False
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_profiler_start', {})[context] = time.perf_counter()
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info['query_profiler_start'].pop(context)
+        profile = _current_request.get()
+        if profile is None:
+            if not self.record_outside_requests:
+                return
+            profile = self.global_profile
+
+        # DBAPIs report -1 for SELECTs they do not buffer (e.g. sqlite3)
+        rowcount = getattr(cursor, 'rowcount', -1)
+        record = QueryRecord(statement, duration, rowcount if rowcount >= 0 else None, _call_site())
+        with self._lock:
+            profile.queries.append(record)
+
+    def _handle_error(self, context):
+        # A failed statement never reaches after_cursor_execute; drop its start time
+        if context.connection is not None:
+            context.connection.info.get('query_profiler_start', {}).pop(context.execution_context, None)
+
+    @contextmanager
+    def request(self, name: str):
+        """Profile all statements executed in this context (per thread / asyncio task)"""
+        profile = RequestProfile(name, self.n_plus_one_threshold)
+        token = _current_request.set(profile)
+        try:
+            yield profile
+        finally:
+            profile.elapsed = time.perf_counter() - profile.started
+            _current_request.reset(token)
+
+    def profiled(self, name: Optional[str] = None, report=print):
+        """Decorator: profile each call and pass the report to `report`"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.request(name or func.__qualname__) as profile:
+                    result = func(*args, **kwargs)
+                report(profile.format_report())
+                return result
+            return wrapper
+        return decorator
+
+
+if __name__ == "__main__":
+    from sqlalchemy import create_engine
+    from sqlalchemy.pool import StaticPool
+
+    import database
+    from leaderboard import LeaderboardManager
+
+    # Demo data stays in memory instead of landing in the configured database
+    engine = create_engine('sqlite://', poolclass=StaticPool)
+    database.Base.metadata.create_all(engine)
+    database.init_search_index(engine)
+    database.engine = engine
+    database.SessionLocal.configure(bind=engine)
+    database._schema_ready = True
+
+    profiler = QueryProfiler(engine).enable()
+    db = database.get_db()
+    lm = LeaderboardManager()
+
+    contributor = database.get_or_create_contributor(db, "ProfilerUser")
+
+    with profiler.request('update_contributor_stats') as profile:
+        database.update_contributor_stats(db, contributor.id, 10, 0.9)
+    print(profile.format_report())
+
+    for period in ('day', 'week', 'month', 'all'):
+        with profiler.request(f"get_rankings({period})") as profile:
+            lm.get_rankings(period=period, limit=10)
+        print(profile.format_report())
+
+    with profiler.request('get_contributor_stats') as profile:
+        lm.get_contributor_stats(contributor.id)
+    print(profile.format_report())
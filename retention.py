@@ -0,0 +1,209 @@
+"""
+Mention retention and archival
+Keeps recent mentions hot in the database and rolls older ones into
+per-month columnar archives (Parquet or Arrow IPC). Per influencer/month
+aggregates stay queryable in the mention_archives table, and
+database.get_influencer_data(..., include_archive=True) reads archived
+rows back when deep history is requested.
+
+Usage:
+    python retention.py --hot-days 90 --archive-dir archive --format parquet
+"""
+
+import argparse
+import os
+from collections import namedtuple
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import func
+
+import database
+from export import MENTION_COLUMNS, ArrowWriter
+
+ARCHIVE_COLUMNS = [column.key for column in MENTION_COLUMNS]
+
+# Same attributes as database.Mention, so MentionRecord.from_model accepts it
+ArchivedMention = namedtuple('ArchivedMention', ARCHIVE_COLUMNS)
+
+FORMAT_EXTENSIONS = {'parquet': 'parquet', 'arrow': 'arrow'}
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise RuntimeError("Mention archival requires pyarrow (pip install pyarrow)")
+    return pyarrow
+
+
+def _month_start(when: datetime) -> datetime:
+    return when.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _next_month(month: datetime) -> datetime:
+    return (month + timedelta(days=32)).replace(day=1)
+
+
+class RetentionPolicy:
+    """How long mentions stay hot and where archives go"""
+
+    def __init__(self, hot_days: int = 90, archive_dir: str = 'archive', format: str = 'parquet',
+                 batch_size: int = 10000):
+        if format not in FORMAT_EXTENSIONS:
+            raise ValueError(f"Unknown archive format: {format}")
+        self.hot_days = hot_days
+        self.archive_dir = archive_dir
+        self.format = format
+        self.batch_size = batch_size
+
+    def cutoff(self, now: Optional[datetime] = None) -> datetime:
+        """Mentions scraped before this (rounded down to a month) are archived"""
+        return _month_start((now or datetime.utcnow()) - timedelta(days=self.hot_days))
+
+
+def archive_month(db, policy: RetentionPolicy, month: datetime, before: datetime) -> int:
+    """
+    Archive mentions scraped in `month` (and before `before`) into one file,
+    record per-influencer aggregates and delete the archived rows.
+    Returns the number of mentions archived.
+    """
+    os.makedirs(policy.archive_dir, exist_ok=True)
+
+    end = min(_next_month(month), before)
+    query = db.query(database.Mention).filter(
+        database.Mention.scraped_at >= month,
+        database.Mention.scraped_at < end
+    ).order_by(database.Mention.id)
+
+    first = query.first()
+    if first is None:
+        return 0
+
+    # Named after the id range it holds: if the commit below fails, the next
+    # run selects the same rows and overwrites this file instead of adding one
+    last_id = query.order_by(None).with_entities(func.max(database.Mention.id)).scalar()
+    path = os.path.join(policy.archive_dir,
+                        f"mentions-{month:%Y-%m}-{first.id}-{last_id}.{FORMAT_EXTENSIONS[policy.format]}")
+
+    aggregates = {}
+    archived_ids = []
+    writer = ArrowWriter(path, MENTION_COLUMNS, policy.format, random_access=True)
+    try:
+        chunk = []
+        for mention in query.yield_per(policy.batch_size):
+            chunk.append(tuple(getattr(mention, name) for name in ARCHIVE_COLUMNS))
+            archived_ids.append(mention.id)
+
+            agg = aggregates.setdefault(mention.influencer_name, {
+                'row_count': 0, 'drama_count': 0, 'good_action_count': 0, 'neutral_count': 0,
+                'sentiment_sum': 0.0
+            })
+            agg['row_count'] += 1
+            agg['sentiment_sum'] += mention.sentiment_score or 0.0
+            if mention.label == 'drama':
+                agg['drama_count'] += 1
+            elif mention.label == 'good_action':
+                agg['good_action_count'] += 1
+            else:
+                agg['neutral_count'] += 1
+
+            if len(chunk) >= policy.batch_size:
+                writer.write(chunk)
+                chunk = []
+        if chunk:
+            writer.write(chunk)
+    except Exception:
+        writer.close()
+        os.remove(path)
+        raise
+    writer.close()
+
+    # The file is complete: record aggregates and drop the hot rows together
+    for name, agg in aggregates.items():
+        db.add(database.MentionArchive(
+            influencer_name=name,
+            month=month,
+            path=path,
+            format=policy.format,
+            **agg
+        ))
+    for start in range(0, len(archived_ids), policy.batch_size):
+        ids = archived_ids[start:start + policy.batch_size]
+        db.query(database.Mention).filter(database.Mention.id.in_(ids)).delete(synchronize_session=False)
+    db.commit()
+
+    return len(archived_ids)
+
+
+def apply_retention(db, policy: RetentionPolicy, now: Optional[datetime] = None) -> int:
+    """Archive every month older than the policy cutoff. Returns mentions archived."""
+    cutoff = policy.cutoff(now)
+    oldest = db.query(database.Mention.scraped_at).filter(
+        database.Mention.scraped_at < cutoff
+    ).order_by(database.Mention.scraped_at).first()
+    if oldest is None:
+        return 0
+
+    total = 0
+    month = _month_start(oldest.scraped_at)
+    while month < cutoff:
+        archived = archive_month(db, policy, month, cutoff)
+        if archived:
+            print(f"📦 Archived {archived} mentions from {month:%Y-%m}")
+        total += archived
+        month = _next_month(month)
+    return total
+
+
+def read_archived_mentions(db, influencer_name: str, since: Optional[datetime] = None) -> List[ArchivedMention]:
+    """Archived mentions for one influencer, newest first"""
+    query = db.query(database.MentionArchive).filter(
+        database.MentionArchive.influencer_name == influencer_name
+    )
+    if since:
+        query = query.filter(database.MentionArchive.month >= _month_start(since))
+    archives = query.all()
+    if not archives:
+        return []
+
+    pa = _require_pyarrow()
+    import pyarrow.compute as pc
+
+    mentions = {}
+    for path, format in sorted(set((a.path, a.format) for a in archives)):
+        if not os.path.exists(path):
+            continue
+        if format == 'parquet':
+            import pyarrow.parquet as pq
+            table = pq.read_table(path, filters=[('influencer_name', '=', influencer_name)])
+        else:
+            import pyarrow.ipc as ipc
+            with pa.memory_map(path, 'r') as source:
+                table = ipc.open_file(source).read_all()
+            table = table.filter(pc.equal(table['influencer_name'], influencer_name))
+        for row in table.to_pylist():
+            if since and row['scraped_at'] < since:
+                continue
+            # Keyed by id: a row never appears twice, even across overlapping files
+            mentions[row['id']] = ArchivedMention(**row)
+
+    return sorted(mentions.values(), key=lambda m: m.scraped_at, reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive old mentions to columnar files")
+    parser.add_argument('--hot-days', type=int, default=90, help="Days of mentions kept in the database")
+    parser.add_argument('--archive-dir', default='archive')
+    parser.add_argument('--format', choices=sorted(FORMAT_EXTENSIONS), default='parquet')
+    parser.add_argument('--batch-size', type=int, default=10000)
+    args = parser.parse_args()
+
+    policy = RetentionPolicy(args.hot_days, args.archive_dir, args.format, args.batch_size)
+    db = database.get_db()
+    total = apply_retention(db, policy)
+    print(f"✅ Retention applied: {total} mentions archived")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,9 @@
 Mock scrapers for testing the leaderboard functionality
 """
 
+import asyncio
+import random
+
 class BaseScraper:
     async def scrape(self, query):
         return []
@@ -60,3 +63,124 @@ class ForumScraper(BaseScraper):
                 'title': f'Forum discussion: {query}'
             }
         ]
+
+
+# Synthetic scrapers for capacity testing
+
+SYNTHETIC_SOURCES = ['news', 'youtube', 'twitter', 'reddit', 'forum']
+
+# Typical excerpt lengths per source (median chars, log-normal sigma)
+SYNTHETIC_TEXT_LENGTHS = {
+    'news': (1800, 0.5),
+    'youtube': (350, 0.6),
+    'twitter': (180, 0.35),
+    'reddit': (600, 0.8),
+    'forum': (700, 0.7),
+}
+
+SYNTHETIC_PHRASES = {
+    'drama': [
+        "Nouvelle polémique autour de {query} après des propos jugés choquants.",
+        "Le scandale enfle : {query} accusé d'avoir trompé ses abonnés.",
+        "Clash en direct, {query} s'attire les critiques de la communauté.",
+        "Des internautes dénoncent une arnaque liée à un partenariat de {query}.",
+    ],
+    'good_action': [
+        "{query} organise un live caritatif et récolte des dons pour une association.",
+        "Belle initiative : {query} soutient la recherche avec un don important.",
+        "{query} s'engage pour la charité et mobilise sa communauté.",
+        "Action solidaire de {query} pour aider les sinistrés.",
+    ],
+    'neutral': [
+        "{query} publie une nouvelle vidéo sur sa chaîne.",
+        "Interview de {query} sur ses projets à venir.",
+        "{query} annonce une tournée dans plusieurs villes françaises.",
+        "Retour sur la carrière de {query} et ses débuts sur internet.",
+    ],
+}
+
+SYNTHETIC_FILLER = [
+    "Les réactions ont été nombreuses sur les réseaux sociaux.",
+    "Plusieurs médias ont relayé l'information dans la journée.",
+    "La communauté reste partagée sur le sujet.",
+    "Le créateur n'a pas encore réagi officiellement.",
+    "Les chiffres d'audience restent stables selon les observateurs.",
+    "Le sujet a été largement commenté sur les forums.",
+]
+
+
+class SyntheticScraper(BaseScraper):
+    """
+    Seeded synthetic scraper for load and capacity testing
+
+    Emits `mentions_per_source` mentions per call with source-specific text
+    lengths, a configurable drama/good_action/neutral mix, log-normal
+    latency and a failure rate. Results only depend on the seed, the source
+    and the query, so runs are reproducible.
+    """
+
+    def __init__(self, source: str, mentions_per_source: int = 50, seed: int = 0,
+                 sentiment_mix=(0.15, 0.15, 0.70), latency_ms: float = 300.0,
+                 latency_sigma: float = 0.5, failure_rate: float = 0.0):
+        self.source = source
+        self.mentions_per_source = mentions_per_source
+        self.seed = seed
+        self.sentiment_mix = sentiment_mix
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.failure_rate = failure_rate
+        self.calls = 0
+
+    async def scrape(self, query):
+        self.calls += 1
+        rng = random.Random(f"{self.seed}:{self.source}:{query}:{self.calls}")
+
+        if self.latency_ms > 0:
+            await asyncio.sleep(rng.lognormvariate(0, self.latency_sigma) * self.latency_ms / 1000.0)
+
+        if rng.random() < self.failure_rate:
+            raise ConnectionError(f"synthetic {self.source} failure for {query}")
+
+        kinds = rng.choices(list(SYNTHETIC_PHRASES), weights=self.sentiment_mix, k=self.mentions_per_source)
+        return [self._make_mention(rng, query, kind, idx) for idx, kind in enumerate(kinds)]
+
+    def _make_mention(self, rng, query, kind, idx):
+        median, sigma = SYNTHETIC_TEXT_LENGTHS.get(self.source, (500, 0.6))
+        target_length = max(40, int(rng.lognormvariate(0, sigma) * median))
+
+        parts = [rng.choice(SYNTHETIC_PHRASES[kind]).format(query=query)]
+        length = len(parts[0])
+        while length < target_length:
+            filler = rng.choice(SYNTHETIC_FILLER)
+            parts.append(filler)
+            length += len(filler) + 1
+        text = " ".join(parts)[:target_length]
+
+        return {
+            'source': self.source,
+            'url': f'https://{self.source}.example.com/{query}/{self.calls}-{idx}',
+            'text': text,
+            'title': f'{self.source.capitalize()} #{idx + 1}: {query}'
+        }
+
+
+def get_scrapers(mode: str = 'mock', **synthetic_options):
+    """
+    Build the scraper set used by the orchestrator
+
+    mode: 'mock' for the one-item mocks above, 'synthetic' for
+    SyntheticScraper instances (options are passed through).
+    """
+    if mode == 'synthetic':
+        return {
+            source: SyntheticScraper(source, **synthetic_options)
+            for source in SYNTHETIC_SOURCES
+        }
+
+    return {
+        'news': NewsScraper(),
+        'youtube': YouTubeScraper(),
+        'twitter': TwitterScraper(),
+        'reddit': RedditScraper(),
+        'forum': ForumScraper()
+    }
@@ -1,12 +1,11 @@
 import streamlit as st
 import asyncio
-import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
 from datetime import datetime
 from orchestrator import InfluencerOrchestrator
 from leaderboard import LeaderboardManager
 import database
+import name_index
+from mention_record import MentionRecord
 
 # Page config
 st.set_page_config(
@@ -118,7 +117,12 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Initialize orchestrator
+# One-time startup per process: schema check, then shared managers
+@st.cache_resource
+def startup():
+    database.ensure_schema()
+    return True
+
 @st.cache_resource
 def get_orchestrator():
     return InfluencerOrchestrator()
@@ -127,12 +131,10 @@ def get_orchestrator():
 def get_leaderboard_manager():
     return LeaderboardManager()
 
+startup()
 orchestrator = get_orchestrator()
 leaderboard_manager = get_leaderboard_manager()
 
-# Initialize database
-database.init_db()
-
 # Header
 st.markdown('<div class="main-header">🔍 French Influencer Monitor</div>', unsafe_allow_html=True)
 st.markdown('<div class="sub-header">Analysez la réputation des influenceurs français</div>', unsafe_allow_html=True)
@@ -181,6 +183,8 @@ with st.sidebar:
     st.markdown("---")
     st.markdown("**Développé avec ❤️ pour le Hackathon**")
 
+MENTIONS_PAGE_SIZE = 20
+
 # Helper function for displaying mentions
 def display_mentions(mentions, filter_type=None):
     """Display mentions with optional filtering"""
@@ -188,7 +192,7 @@ def display_mentions(mentions, filter_type=None):
         st.info("Aucune mention trouvée")
         return
     
-    for mention in mentions[:20]:  # Limit to 20 for performance
+    for mention in mentions:
         label = mention['label']
         sentiment = mention['sentiment_score']
         
@@ -206,183 +210,226 @@ def display_mentions(mentions, filter_type=None):
         # Format sentiment
         sentiment_text = f"{'Positif' if sentiment > 0 else 'Négatif'} ({sentiment:.2f})"
         
+        # Near-duplicates collapsed into this mention
+        duplicate_count = mention.get('duplicate_count', 0)
+        duplicates_text = f" | <strong>Reprises:</strong> {duplicate_count}" if duplicate_count else ""
+        
         st.markdown(f"""
         <div class="{card_class}">
-            <p><strong>{emoji} {mention.get('title', 'Sans titre')}</strong></p>
+            <p><strong>{emoji} {mention.get('title') or 'Sans titre'}</strong></p>
             <p style="color: #6b7280; font-size: 0.9rem;">{mention['text'][:300]}...</p>
             <p style="font-size: 0.85rem; margin-top: 0.5rem;">
                 <strong>Source:</strong> {mention['source']} | 
-                <strong>Sentiment:</strong> {sentiment_text} | 
+                <strong>Sentiment:</strong> {sentiment_text}{duplicates_text} | 
                 <a href="{mention['url']}" target="_blank">🔗 Voir la source</a>
             </p>
         </div>
         """, unsafe_allow_html=True)
 
+def display_mention_feed(influencer, label=None):
+    """All stored mentions read page by page from the database, with a "load more" button"""
+    pages = st.session_state.setdefault('mention_pages', {})
+    feed = pages.get((influencer, label))
+    if feed is None:
+        page = database.get_mention_page(orchestrator.db, influencer, label=label, limit=MENTIONS_PAGE_SIZE)
+        feed = pages[(influencer, label)] = {
+            'mentions': [MentionRecord.from_model(m) for m in page['mentions']],
+            'next_cursor': page['next_cursor']
+        }
+    
+    display_mentions(feed['mentions'], label)
+    
+    if feed['next_cursor'] and st.button("Charger plus", key=f"more_{label or 'all'}"):
+        page = database.get_mention_page(orchestrator.db, influencer, label=label, limit=MENTIONS_PAGE_SIZE,
+                                         cursor=feed['next_cursor'])
+        feed['mentions'].extend(MentionRecord.from_model(m) for m in page['mentions'])
+        feed['next_cursor'] = page['next_cursor']
+        st.rerun()
+
+# Leaderboard data, memoized across reruns and sessions; the leaderboard
+# version in the cache key invalidates entries as soon as stats change
+@st.cache_data(ttl=600, show_spinner=False)
+def load_rankings(period, version):
+    return leaderboard_manager.get_rankings(period=period, limit=10)
+
+@st.cache_data(ttl=600, show_spinner=False)
+def build_rankings_chart(period, version):
+    import pandas as pd
+    import plotly.express as px
+    
+    rankings = load_rankings(period, version)
+    df_rankings = pd.DataFrame([{
+        'Contributeur': r['username'],
+        'Points': r['points']
+    } for r in rankings[:10]])
+    
+    fig = px.bar(
+        df_rankings,
+        x='Contributeur',
+        y='Points',
+        color='Points',
+        color_continuous_scale='Blues',
+        title=f"Top 10 - {leaderboard_manager.get_period_label(period)}"
+    )
+    fig.update_layout(
+        showlegend=False,
+        height=400,
+        xaxis_tickangle=-45
+    )
+    return fig
+
+@st.cache_data(show_spinner=False)
+def achievement_cards():
+    """Static HTML cards for the badge showcase"""
+    return [f"""
+            <div class="rank-card">
+                <h3 style="margin: 0;">{achievement['name']}</h3>
+                <p style="color: #6b7280; margin: 0.5rem 0;">{achievement['description']}</p>
+                <p style="color: #667eea; font-weight: bold; margin: 0;">Seuil: {achievement['threshold']}</p>
+            </div>
+            """ for achievement in leaderboard_manager.ACHIEVEMENTS.values()]
+
 # Main content - Route based on page selection
 if page == "🏆 Leaderboard":
     # Leaderboard page
     st.markdown('<div class="leaderboard-header">🏆 Leaderboard des Contributeurs</div>', unsafe_allow_html=True)
     st.markdown('<div class="sub-header">Classement des meilleurs analystes d\'influenceurs</div>', unsafe_allow_html=True)
     
-    # Time period tabs
-    tab1, tab2, tab3, tab4 = st.tabs(["📅 Aujourd'hui", "📆 Cette Semaine", "📊 Ce Mois", "🏆 Tout le Temps"])
+    # Time period selector - only the selected period is computed and rendered
+    period_labels = {
+        'day': "📅 Aujourd'hui",
+        'week': "📆 Cette Semaine",
+        'month': "📊 Ce Mois",
+        'all': "🏆 Tout le Temps"
+    }
+    period = st.radio(
+        "Période",
+        list(period_labels),
+        format_func=period_labels.get,
+        horizontal=True,
+        label_visibility="collapsed",
+        key="leaderboard_period"
+    )
     
-    periods = [
-        ('day', tab1),
-        ('week', tab2),
-        ('month', tab3),
-        ('all', tab4)
-    ]
+    leaderboard_version = database.get_leaderboard_version(leaderboard_manager.db)
+    rankings = load_rankings(period, leaderboard_version)
     
-    for period, tab in periods:
-        with tab:
-            # Get rankings for this period
-            rankings = leaderboard_manager.get_rankings(period=period, limit=10)
-            
-            if not rankings:
-                st.info("Aucun contributeur pour cette période")
-                continue
-            
-            # Display top 3 with special styling
-            if len(rankings) >= 1:
-                st.markdown("### 🎖️ Top 3")
-                top3_cols = st.columns(3)
+    if not rankings:
+        st.info("Aucun contributeur pour cette période")
+    else:
+        # Display top 3 with special styling
+        if len(rankings) >= 1:
+            st.markdown("### 🎖️ Top 3")
+            top3_cols = st.columns(3)
+        
+            for idx, ranking in enumerate(rankings[:3]):
+                with top3_cols[idx]:
+                    medal = leaderboard_manager.get_medal_emoji(idx + 1)
+                    card_class = ""
+                    if idx == 0:
+                        card_class = "rank-card-gold"
+                    elif idx == 1:
+                        card_class = "rank-card-silver"
+                    elif idx == 2:
+                        card_class = "rank-card-bronze"
                 
-                for idx, ranking in enumerate(rankings[:3]):
-                    with top3_cols[idx]:
-                        medal = leaderboard_manager.get_medal_emoji(idx + 1)
-                        card_class = ""
-                        if idx == 0:
-                            card_class = "rank-card-gold"
-                        elif idx == 1:
-                            card_class = "rank-card-silver"
-                        elif idx == 2:
-                            card_class = "rank-card-bronze"
-                        
-                        st.markdown(f"""
-                        <div class="rank-card {card_class}">
-                            <h1 style="text-align: center; margin: 0;">{medal}</h1>
-                            <h3 style="text-align: center; margin: 0.5rem 0;">{ranking['username']}</h3>
-                            <div class="stat-box">
-                                <h2 style="margin: 0; color: #667eea;">{ranking['points']}</h2>
-                                <p style="margin: 0; color: #6b7280; font-size: 0.9rem;">Points</p>
+                    st.markdown(f"""
+                    <div class="rank-card {card_class}">
+                        <h1 style="text-align: center; margin: 0;">{medal}</h1>
+                        <h3 style="text-align: center; margin: 0.5rem 0;">{ranking['username']}</h3>
+                        <div class="stat-box">
+                            <h2 style="margin: 0; color: #667eea;">{ranking['points']}</h2>
+                            <p style="margin: 0; color: #6b7280; font-size: 0.9rem;">Points</p>
+                        </div>
+                        <div style="display: flex; justify-content: space-around; margin-top: 1rem;">
+                            <div>
+                                <p style="margin: 0; font-weight: bold; color: #1f2937;">{ranking['analyses_count']}</p>
+                                <p style="margin: 0; font-size: 0.8rem; color: #6b7280;">Analyses</p>
                             </div>
-                            <div style="display: flex; justify-content: space-around; margin-top: 1rem;">
-                                <div>
-                                    <p style="margin: 0; font-weight: bold; color: #1f2937;">{ranking['analyses_count']}</p>
-                                    <p style="margin: 0; font-size: 0.8rem; color: #6b7280;">Analyses</p>
-                                </div>
-                                <div>
-                                    <p style="margin: 0; font-weight: bold; color: #1f2937;">{ranking['streak_days']}</p>
-                                    <p style="margin: 0; font-size: 0.8rem; color: #6b7280;">Jours de suite</p>
-                                </div>
+                            <div>
+                                <p style="margin: 0; font-weight: bold; color: #1f2937;">{ranking['streak_days']}</p>
+                                <p style="margin: 0; font-size: 0.8rem; color: #6b7280;">Jours de suite</p>
                             </div>
                         </div>
-                        """, unsafe_allow_html=True)
-                        
-                        # Display achievements
-                        achievements = ranking.get('achievements', [])
-                        if achievements:
-                            st.markdown("**Badges:**")
-                            for achievement in achievements[:3]:  # Show top 3 achievements
-                                st.markdown(f'<span class="achievement-badge">{achievement["name"]}</span>', unsafe_allow_html=True)
-            
-            # Display rest of top 10
-            if len(rankings) > 3:
-                st.markdown("### 📋 Top 4-10")
+                    </div>
+                    """, unsafe_allow_html=True)
                 
-                for idx, ranking in enumerate(rankings[3:10], start=4):
-                    col1, col2, col3, col4, col5 = st.columns([1, 3, 2, 2, 2])
-                    
-                    with col1:
-                        st.markdown(f"**#{idx}**")
-                    
-                    with col2:
-                        st.markdown(f"**{ranking['username']}**")
-                    
-                    with col3:
-                        st.markdown(f"🏆 {ranking['points']} pts")
-                    
-                    with col4:
-                        st.markdown(f"📊 {ranking['analyses_count']} analyses")
-                    
-                    with col5:
-                        st.markdown(f"🔥 {ranking['streak_days']} jours")
-                    
-                    st.markdown("---")
+                    # Display achievements
+                    achievements = ranking.get('achievements', [])
+                    if achievements:
+                        st.markdown("**Badges:**")
+                        for achievement in achievements[:3]:  # Show top 3 achievements
+                            st.markdown(f'<span class="achievement-badge">{achievement["name"]}</span>', unsafe_allow_html=True)
+    
+        # Display rest of top 10
+        if len(rankings) > 3:
+            st.markdown("### 📋 Top 4-10")
+        
+            for idx, ranking in enumerate(rankings[3:10], start=4):
+                col1, col2, col3, col4, col5 = st.columns([1, 3, 2, 2, 2])
             
-            # Period statistics
-            st.markdown("### 📈 Statistiques de la Période")
-            stat_col1, stat_col2, stat_col3 = st.columns(3)
+                with col1:
+                    st.markdown(f"**#{idx}** {leaderboard_manager.format_rank_change(ranking.get('rank_change', 0))}")
             
-            total_points = sum(r['points'] for r in rankings)
-            total_analyses = sum(r['analyses_count'] for r in rankings)
-            avg_points = total_points / len(rankings) if rankings else 0
+                with col2:
+                    st.markdown(f"**{ranking['username']}**")
             
-            with stat_col1:
-                st.markdown(f"""
-                <div class="stat-box">
-                    <h3 style="margin: 0; color: #667eea;">{len(rankings)}</h3>
-                    <p style="margin: 0; color: #6b7280;">Contributeurs Actifs</p>
-                </div>
-                """, unsafe_allow_html=True)
+                with col3:
+                    st.markdown(f"🏆 {ranking['points']} pts")
             
-            with stat_col2:
-                st.markdown(f"""
-                <div class="stat-box">
-                    <h3 style="margin: 0; color: #667eea;">{total_analyses}</h3>
-                    <p style="margin: 0; color: #6b7280;">Analyses Totales</p>
-                </div>
-                """, unsafe_allow_html=True)
+                with col4:
+                    st.markdown(f"📊 {ranking['analyses_count']} analyses")
             
-            with stat_col3:
-                st.markdown(f"""
-                <div class="stat-box">
-                    <h3 style="margin: 0; color: #667eea;">{avg_points:.0f}</h3>
-                    <p style="margin: 0; color: #6b7280;">Points Moyens</p>
-                </div>
-                """, unsafe_allow_html=True)
+                with col5:
+                    st.markdown(f"🔥 {ranking['streak_days']} jours")
             
-            # Ranking chart
-            if rankings:
-                st.markdown("### 📊 Graphique des Points")
-                df_rankings = pd.DataFrame([{
-                    'Contributeur': r['username'],
-                    'Points': r['points']
-                } for r in rankings[:10]])
-                
-                fig = px.bar(
-                    df_rankings,
-                    x='Contributeur',
-                    y='Points',
-                    color='Points',
-                    color_continuous_scale='Blues',
-                    title=f"Top 10 - {leaderboard_manager.get_period_label(period)}"
-                )
-                fig.update_layout(
-                    showlegend=False,
-                    height=400,
-                    xaxis_tickangle=-45
-                )
-                st.plotly_chart(fig, use_container_width=True)
+                st.markdown("---")
     
+        # Period statistics
+        st.markdown("### 📈 Statistiques de la Période")
+        stat_col1, stat_col2, stat_col3 = st.columns(3)
+    
+        total_points = sum(r['points'] for r in rankings)
+        total_analyses = sum(r['analyses_count'] for r in rankings)
+        avg_points = total_points / len(rankings) if rankings else 0
+    
+        with stat_col1:
+            st.markdown(f"""
+            <div class="stat-box">
+                <h3 style="margin: 0; color: #667eea;">{len(rankings)}</h3>
+                <p style="margin: 0; color: #6b7280;">Contributeurs Actifs</p>
+            </div>
+            """, unsafe_allow_html=True)
+    
+        with stat_col2:
+            st.markdown(f"""
+            <div class="stat-box">
+                <h3 style="margin: 0; color: #667eea;">{total_analyses}</h3>
+                <p style="margin: 0; color: #6b7280;">Analyses Totales</p>
+            </div>
+            """, unsafe_allow_html=True)
+    
+        with stat_col3:
+            st.markdown(f"""
+            <div class="stat-box">
+                <h3 style="margin: 0; color: #667eea;">{avg_points:.0f}</h3>
+                <p style="margin: 0; color: #6b7280;">Points Moyens</p>
+            </div>
+            """, unsafe_allow_html=True)
+    
+        # Ranking chart (figure memoized per leaderboard version)
+        st.markdown("### 📊 Graphique des Points")
+        st.plotly_chart(build_rankings_chart(period, leaderboard_version), use_container_width=True)
+
     # Achievement showcase
     st.markdown("---")
     st.markdown("### 🎖️ Badges Disponibles")
     st.markdown("Débloquez ces badges en contribuant à l'analyse d'influenceurs!")
     
     achievement_cols = st.columns(3)
-    achievements_list = list(leaderboard_manager.ACHIEVEMENTS.values())
-    
-    for idx, achievement in enumerate(achievements_list):
+    for idx, card in enumerate(achievement_cards()):
         with achievement_cols[idx % 3]:
-            st.markdown(f"""
-            <div class="rank-card">
-                <h3 style="margin: 0;">{achievement['name']}</h3>
-                <p style="color: #6b7280; margin: 0.5rem 0;">{achievement['description']}</p>
-                <p style="color: #667eea; font-weight: bold; margin: 0;">Seuil: {achievement['threshold']}</p>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(card, unsafe_allow_html=True)
 
 else:
     # Analysis page
@@ -395,8 +442,24 @@ else:
         influencer_name = st.text_input(
             "Nom de l'influenceur",
             placeholder="Ex: Squeezie, Norman, Cyprien...",
-            help="Entrez le nom d'un influenceur français"
+            help="Entrez le nom d'un influenceur français",
+            key="influencer_query"
         )
+        
+        # Autocomplete from already analyzed influencers (in-memory index)
+        suggestions = [
+            name for name in name_index.get_name_index(orchestrator.db).suggest(influencer_name, limit=5)
+            if name != influencer_name
+        ] if influencer_name else []
+        if suggestions:
+            suggestion_cols = st.columns(len(suggestions))
+            for col, suggestion in zip(suggestion_cols, suggestions):
+                with col:
+                    st.button(
+                        suggestion,
+                        key=f"suggestion_{suggestion}",
+                        on_click=lambda value=suggestion: st.session_state.update(influencer_query=value)
+                    )
     
     with search_col2:
         st.markdown("<br>", unsafe_allow_html=True)
@@ -443,9 +506,22 @@ else:
                     st.error(f"❌ Erreur lors de l'analyse: {str(e)}")
                     st.stop()
         
+        # Keep results across reruns so mention pages can be loaded on demand
+        st.session_state['analysis_results'] = results
+        st.session_state['mention_pages'] = {}
+    
+    elif not influencer_name and search_button:
+        st.warning("⚠️ Veuillez entrer le nom d'un influenceur")
+    
+    results = st.session_state.get('analysis_results')
+    if results:
+        # Counts, the source chart and the feed cover every stored mention (the score only
+        # the latest run), counted by aggregate queries rather than from loaded mentions
+        label_counts = database.get_mention_label_counts(orchestrator.db, results['influencer_name'])
+        
         # Display results
         st.markdown("---")
-        st.markdown(f"## 📊 Résultats pour: **{influencer_name}**")
+        st.markdown(f"## 📊 Résultats pour: **{results['influencer_name']}**")
         
         # Metrics row
         col1, col2, col3, col4 = st.columns(4)
@@ -476,7 +552,7 @@ else:
             """, unsafe_allow_html=True)
         
         with col4:
-            total_mentions = len(results['mentions'])
+            total_mentions = sum(label_counts.values())
             st.markdown(f"""
             <div class="metric-card">
                 <h2>{total_mentions}</h2>
@@ -486,6 +562,11 @@ else:
         
         st.markdown("<br>", unsafe_allow_html=True)
         
+        # Charting libraries are only needed once there are results to plot
+        import pandas as pd
+        import plotly.graph_objects as go
+        import plotly.express as px
+        
         # Visualizations
         viz_col1, viz_col2 = st.columns(2)
         
@@ -545,10 +626,7 @@ else:
         
         # Source distribution
         st.markdown("### 📊 Répartition par Source")
-        source_counts = {}
-        for mention in results['mentions']:
-            source = mention['source']
-            source_counts[source] = source_counts.get(source, 0) + 1
+        source_counts = database.get_mention_source_counts(orchestrator.db, results['influencer_name'])
         
         if source_counts:
             df_sources = pd.DataFrame(list(source_counts.items()), columns=['Source', 'Count'])
@@ -566,22 +644,24 @@ else:
         st.markdown("### 📝 Mentions Détaillées")
         
         # Filter tabs
-        tab1, tab2, tab3, tab4 = st.tabs(["🔴 Toutes", "⚠️ Controverses", "✅ Actions Positives", "⚪ Neutres"])
+        tab1, tab2, tab3, tab4 = st.tabs([
+            f"🔴 Toutes ({total_mentions})",
+            f"⚠️ Controverses ({label_counts['drama']})",
+            f"✅ Actions Positives ({label_counts['good_action']})",
+            f"⚪ Neutres ({label_counts['neutral']})"
+        ])
         
         with tab1:
-            display_mentions(results['mentions'], None)
+            display_mention_feed(results['influencer_name'], None)
         
         with tab2:
-            drama_mentions = [m for m in results['mentions'] if m['label'] == 'drama']
-            display_mentions(drama_mentions, 'drama')
+            display_mention_feed(results['influencer_name'], 'drama')
         
         with tab3:
-            good_mentions = [m for m in results['mentions'] if m['label'] == 'good_action']
-            display_mentions(good_mentions, 'good_action')
+            display_mention_feed(results['influencer_name'], 'good_action')
         
         with tab4:
-            neutral_mentions = [m for m in results['mentions'] if m['label'] == 'neutral']
-            display_mentions(neutral_mentions, 'neutral')
+            display_mention_feed(results['influencer_name'], 'neutral')
         
         # Score breakdown
         with st.expander("🔍 Détails du Calcul du Score"):
@@ -596,9 +676,6 @@ else:
             
             **Score final: `{results['score_data']['trust_score']}/100`**
             """)
-    
-    elif not influencer_name and search_button:
-        st.warning("⚠️ Veuillez entrer le nom d'un influenceur")
 
 # Footer
 st.markdown("---")
@@ -0,0 +1,119 @@
+import multiprocessing
+import os
+import signal
+import tempfile
+import threading
+import time
+
+from analyzer_server import AnalyzerServer, RemoteAnalyzer
+
+
+class _LengthAnalyzer:
+    """Stand-in model: records batch sizes, scores by text length"""
+
+    def analyze_batch(self, texts):
+        return [{'sentiment_score': len(t) / 100.0, 'label': 'neutral', 'confidence': 1.0} for t in texts]
+
+
+class _SlowAnalyzer(_LengthAnalyzer):
+    def analyze_batch(self, texts):
+        if 'slow' in texts:
+            time.sleep(0.5)
+        return super().analyze_batch(texts)
+
+
+def _serve(address, factory=_LengthAnalyzer):
+    AnalyzerServer(address, authkey=b'test', workers=2, max_wait_ms=20,
+                   analyzer_factory=factory).serve()
+
+
+def _start_server(factory=_LengthAnalyzer):
+    address = os.path.join(tempfile.mkdtemp(), 'analyzer.sock')
+    process = multiprocessing.get_context('fork').Process(target=_serve, args=(address, factory))
+    process.start()
+    for _ in range(100):
+        if os.path.exists(address):
+            break
+        time.sleep(0.05)
+    return process, address
+
+
+def _stop_server(process):
+    os.kill(process.pid, signal.SIGTERM)
+    process.join(5)
+
+
+def test_remote_analysis():
+    process, address = _start_server()
+    try:
+        client = RemoteAnalyzer(address, authkey=b'test')
+        assert client.analyze_text('abcd')['sentiment_score'] == 0.04
+        assert [r['sentiment_score'] for r in client.analyze_batch(['a', 'ab', 'abc'])] == [0.01, 0.02, 0.03]
+        assert client.ping() != process.pid  # answered by a forked worker
+        client.close()
+    finally:
+        _stop_server(process)
+
+
+def test_concurrent_clients():
+    process, address = _start_server()
+    results = {}
+
+    def call(idx):
+        client = RemoteAnalyzer(address, authkey=b'test')
+        results[idx] = client.analyze_text('x' * idx)['sentiment_score']
+        client.close()
+
+    try:
+        threads = [threading.Thread(target=call, args=(idx,)) for idx in range(1, 17)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results == {idx: idx / 100.0 for idx in range(1, 17)}
+    finally:
+        _stop_server(process)
+
+
+def test_timeout_does_not_leak_late_reply():
+    process, address = _start_server(_SlowAnalyzer)
+    try:
+        client = RemoteAnalyzer(address, authkey=b'test', timeout=0.1)
+        try:
+            client.analyze_text('slow')
+        except TimeoutError:
+            pass
+        else:
+            raise AssertionError("slow request did not time out")
+        client.timeout = 5
+        # Must be the answer for 'ab', not the late one for 'slow'
+        assert client.analyze_text('ab')['sentiment_score'] == 0.02
+        client.close()
+    finally:
+        _stop_server(process)
+
+
+def test_sigint_stops_only_that_worker():
+    process, address = _start_server()
+    try:
+        client = RemoteAnalyzer(address, authkey=b'test')
+        worker = client.ping()
+        client.close()
+        os.kill(worker, signal.SIGINT)
+        for _ in range(100):
+            if not os.path.exists(f"/proc/{worker}"):
+                break
+            time.sleep(0.05)
+        assert not os.path.exists(f"/proc/{worker}")
+        # The supervisor replaced it and the other worker is still serving
+        assert RemoteAnalyzer(address, authkey=b'test').analyze_text('abc')['sentiment_score'] == 0.03
+    finally:
+        _stop_server(process)
+
+
+if __name__ == "__main__":
+    test_remote_analysis()
+    test_concurrent_clients()
+    test_timeout_does_not_leak_late_reply()
+    test_sigint_stops_only_that_worker()
+    print("\n🎉 All tests passed!")
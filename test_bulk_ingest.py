@@ -0,0 +1,156 @@
+"""
+Bulk ingest and upsert tests
+Run against the configured DATABASE_URL: SQLite by default, or a local
+Postgres container to exercise the COPY / ON CONFLICT path.
+"""
+
+import csv
+import importlib.util
+import io
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from types import SimpleNamespace
+
+import database
+
+
+def test_save_mentions_bulk():
+    db = database.get_db()
+    name = f"Bulk {uuid.uuid4().hex[:8]}"
+    rows = [{
+        'source': 'news',
+        'url': '' if i == 0 else f"https://example.com/{i}",
+        'text_excerpt': f"mention, with \"quotes\"\nand newline {i}",
+        'sentiment_score': 0.1 * i,
+        'label': 'neutral',
+        'cluster_id': None if i % 2 else f"c{i}",
+        'duplicate_count': i
+    } for i in range(5)]
+
+    assert database.save_mentions_bulk(db, name, rows) == 5
+
+    saved = db.query(database.Mention).filter(
+        database.Mention.influencer_name == name
+    ).order_by(database.Mention.duplicate_count).all()
+    assert [m.text_excerpt for m in saved] == [r['text_excerpt'] for r in rows]
+    assert saved[0].url == ''
+    assert saved[1].cluster_id is None and saved[2].cluster_id == 'c2'
+    assert all(m.scraped_at is not None for m in saved)
+    db.close()
+
+
+def test_daily_stats_upsert():
+    db = database.get_db()
+    contributor = database.get_or_create_contributor(db, f"bulk-{uuid.uuid4().hex[:8]}")
+    database.update_contributor_stats(db, contributor.id, 10)
+    database.update_contributor_stats(db, contributor.id, 5)
+
+    buckets = db.query(database.ContributorDailyStats).filter(
+        database.ContributorDailyStats.contributor_id == contributor.id
+    ).all()
+    assert len(buckets) == 1
+    assert (buckets[0].points_earned, buckets[0].analyses_count) == (15, 2)
+    db.close()
+
+
+def test_score_rollup_upsert():
+    db = database.get_db()
+    name = f"Rollup {uuid.uuid4().hex[:8]}"
+    when = datetime(2025, 1, 1, 10, 30)
+    database._update_score_rollups(db, name, 60.0, when)
+    database._update_score_rollups(db, name, 40.0, when.replace(minute=10))
+    db.commit()
+
+    hour = db.query(database.ScoreRollup).filter(
+        database.ScoreRollup.influencer_name == name,
+        database.ScoreRollup.resolution == 'hour'
+    ).one()
+    assert (hour.min_score, hour.max_score, hour.sum_score, hour.count) == (40.0, 60.0, 100.0, 2)
+    # The older score does not replace the latest one
+    assert hour.last_score == 60.0
+    db.close()
+
+
+def _copy_rows():
+    return [{
+        'source': 'news', 'url': '', 'text_excerpt': 'a, "quoted"\nline', 'sentiment_score': -0.5,
+        'label': 'drama', 'cluster_id': None, 'duplicate_count': 0
+    }, {
+        'source': 'reddit', 'url': 'https://example.com/1', 'text_excerpt': 'plain', 'sentiment_score': 0.25,
+        'label': 'neutral', 'scraped_at': datetime(2025, 1, 2, 3, 4, 5), 'cluster_id': 'c1', 'duplicate_count': 2
+    }]
+
+
+def _fake_postgres_session(cursor):
+    calls = []
+    return SimpleNamespace(
+        get_bind=lambda: SimpleNamespace(dialect=SimpleNamespace(name='postgresql')),
+        connection=lambda: SimpleNamespace(connection=SimpleNamespace(cursor=lambda: cursor)),
+        commit=lambda: calls.append('commit'),
+        calls=calls
+    )
+
+
+def _check_copy(statement, payload):
+    assert statement.startswith(f"COPY mentions ({', '.join(database.MENTION_COPY_COLUMNS)}) FROM STDIN")
+    assert 'FORCE_NOT_NULL' in statement
+    rows = list(csv.reader(io.StringIO(payload)))
+    assert len(rows) == 2
+    first, second = (dict(zip(database.MENTION_COPY_COLUMNS, row)) for row in rows)
+    assert first['influencer_name'] == 'Copy' and first['text_excerpt'] == 'a, "quoted"\nline'
+    assert first['url'] == '' and first['cluster_id'] == ''
+    assert second['scraped_at'] == '2025-01-02 03:04:05' and second['duplicate_count'] == '2'
+
+
+def test_copy_path_psycopg2():
+    cursor = SimpleNamespace(copies=[], closed=False)
+    cursor.copy_expert = lambda statement, buffer: cursor.copies.append((statement, buffer.read()))
+    cursor.close = lambda: setattr(cursor, 'closed', True)
+    db = _fake_postgres_session(cursor)
+
+    assert database.save_mentions_bulk(db, 'Copy', _copy_rows()) == 2
+    assert len(cursor.copies) == 1 and cursor.closed and db.calls == ['commit']
+    _check_copy(*cursor.copies[0])
+
+
+def test_copy_path_psycopg3():
+    written = []
+
+    @contextmanager
+    def copy(statement):
+        written.append(statement)
+        yield SimpleNamespace(write=written.append)
+
+    cursor = SimpleNamespace(copy=copy, close=lambda: None)
+    assert database.save_mentions_bulk(_fake_postgres_session(cursor), 'Copy', _copy_rows()) == 2
+    _check_copy(written[0], ''.join(written[1:]))
+
+
+def test_engine_options_by_dialect():
+    assert database._engine_url_and_options('sqlite:///x.db') == ('sqlite:///x.db', {})
+
+    find_spec = importlib.util.find_spec
+    try:
+        importlib.util.find_spec = lambda name: None
+        url, options = database._engine_url_and_options('postgres://u@h/db')
+        assert url == 'postgresql://u@h/db' and options == {'pool_pre_ping': True}
+
+        importlib.util.find_spec = lambda name: object() if name == 'psycopg' else None
+        url, options = database._engine_url_and_options('postgres://u@h/db')
+        assert url == 'postgresql+psycopg://u@h/db'
+        assert options['connect_args'] == {'prepare_threshold': getattr(database.config, 'PG_PREPARE_THRESHOLD', 1)}
+        # An explicit driver is kept
+        assert database._engine_url_and_options('postgresql+psycopg2://u@h/db')[0] == 'postgresql+psycopg2://u@h/db'
+    finally:
+        importlib.util.find_spec = find_spec
+
+
+if __name__ == "__main__":
+    test_save_mentions_bulk()
+    test_daily_stats_upsert()
+    test_score_rollup_upsert()
+    test_copy_path_psycopg2()
+    test_copy_path_psycopg3()
+    test_engine_options_by_dialect()
+    print("\n🎉 All tests passed!")
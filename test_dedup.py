@@ -0,0 +1,42 @@
+from dedup import NearDuplicateDetector, cluster_key, normalize_text
+
+
+def test_near_duplicates_cluster_together():
+    detector = NearDuplicateDetector()
+    texts = [
+        "Le scandale enfle : Squeezie accusé d'avoir trompé ses abonnés. La communauté reste partagée sur le sujet.",
+        "Squeezie publie une nouvelle vidéo sur sa chaîne avec un invité surprise.",
+        "RT Le scandale enfle: Squeezie accusé d'avoir trompé ses abonnés ! La communauté reste partagée sur le sujet.",
+        "LE SCANDALE ENFLE : SQUEEZIE ACCUSÉ D'AVOIR TROMPÉ SES ABONNÉS. LA COMMUNAUTÉ RESTE PARTAGÉE SUR LE SUJET.",
+    ]
+    assert detector.cluster(texts) == [0, 1, 0, 0]
+
+
+def test_distinct_texts_stay_apart():
+    detector = NearDuplicateDetector()
+    texts = [
+        "Squeezie organise un live caritatif et récolte des dons pour une association.",
+        "Interview de Norman sur ses projets à venir et sa prochaine tournée.",
+        "",
+    ]
+    assert detector.cluster(texts) == [0, 1, 2]
+
+
+def test_cluster_key_ignores_case_and_accents():
+    assert normalize_text("Élodie  a   DIT: «Bonjour»") == "elodie a dit bonjour"
+    assert cluster_key("Élodie a dit bonjour") == cluster_key("elodie, a dit... BONJOUR")
+
+
+def test_shingle_less_texts_stay_apart():
+    detector = NearDuplicateDetector()
+    texts = ["😡😡😡", "!!!", "🙏❤️", "https://t.co/aB3xZ", "https://t.co/Qw9pL", "😡😡😡"]
+    assert detector.cluster(texts) == [0, 1, 2, 3, 4, 5]
+    assert cluster_key("😡😡😡") != cluster_key("🙏❤️")
+
+
+if __name__ == "__main__":
+    test_near_duplicates_cluster_together()
+    test_distinct_texts_stay_apart()
+    test_cluster_key_ignores_case_and_accents()
+    test_shingle_less_texts_stay_apart()
+    print("🎉 All tests passed!")
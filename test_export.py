@@ -0,0 +1,89 @@
+import csv
+import io
+import os
+import sys
+import tempfile
+import uuid
+from datetime import datetime
+
+import pytest
+
+import database
+from export import export_mentions, export_scores
+
+
+def _influencer_with_mentions(db):
+    name = f"Export {uuid.uuid4().hex[:8]}"
+    database.save_mentions_bulk(db, name, [{
+        'source': 'news', 'url': f"https://example.com/{i}", 'text_excerpt': f"texte, \"{i}\"",
+        'sentiment_score': -0.5 if i % 3 == 0 else 0.1, 'label': 'drama' if i % 3 == 0 else 'neutral',
+        'scraped_at': datetime(2025, 1, 1 + i)
+    } for i in range(7)])
+    database.update_influencer_score(db, name, 64.0, 3, 0)
+    return name
+
+
+def _capture_stdout(export):
+    """Run export with sys.stdout swapped for an in-memory text stream; returns the raw bytes"""
+    stdout = sys.stdout
+    sys.stdout = io.TextIOWrapper(io.BytesIO(), encoding='utf-8')
+    try:
+        export()
+        sys.stdout.flush()
+        return sys.stdout.buffer.getvalue()
+    finally:
+        sys.stdout = stdout
+
+
+def test_csv_export_filters():
+    db = database.get_db()
+    name = _influencer_with_mentions(db)
+    path = os.path.join(tempfile.mkdtemp(), 'mentions.csv')
+
+    total = export_mentions(db, path, 'csv', influencer=name.upper(), label='drama',
+                            since=datetime(2025, 1, 2), chunk_size=2)
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    assert total == len(rows) == 2
+    assert [r['text_excerpt'] for r in rows] == ['texte, "3"', 'texte, "6"']
+    db.close()
+
+
+def test_arrow_exports_to_files_and_stdout():
+    pa = pytest.importorskip('pyarrow')
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+
+    db = database.get_db()
+    name = _influencer_with_mentions(db)
+    directory = tempfile.mkdtemp()
+
+    path = os.path.join(directory, 'mentions.parquet')
+    assert export_mentions(db, path, 'parquet', influencer=name, chunk_size=3) == 7
+    table = pq.read_table(path)
+    assert table.column('scraped_at').type == pa.timestamp('us')
+    assert table.column('id').to_pylist() == sorted(table.column('id').to_pylist())
+
+    path = os.path.join(directory, 'scores.arrow')
+    assert export_scores(db, path, 'arrow', influencer=name) == 1
+    with pa.OSFile(path, 'rb') as f:
+        assert ipc.open_stream(f).read_all().column('trust_score').to_pylist() == [64.0]
+
+    # '-' streams to stdout instead of creating a file named '-'
+    cwd = os.getcwd()
+    os.chdir(directory)
+    try:
+        parquet = _capture_stdout(lambda: export_mentions(db, '-', 'parquet', influencer=name, label='drama'))
+        arrow = _capture_stdout(lambda: export_mentions(db, '-', 'arrow', influencer=name))
+        assert not os.path.exists('-')
+    finally:
+        os.chdir(cwd)
+    assert pq.read_table(pa.BufferReader(parquet)).num_rows == 3
+    assert ipc.open_stream(pa.BufferReader(arrow)).read_all().num_rows == 7
+    db.close()
+
+
+if __name__ == "__main__":
+    test_csv_export_filters()
+    test_arrow_exports_to_files_and_stdout()
+    print("\n🎉 All tests passed!")
@@ -0,0 +1,92 @@
+import os
+
+import pytest
+
+from inference_backend import DEFAULT_ONNX_CACHE, analyze_texts, apply_backend, compare_backends
+
+
+class _KeywordAnalyzer:
+    def __init__(self, drama_words=('scandale',), shift=0.0):
+        self.drama_words = drama_words
+        self.shift = shift
+        self.batches = []
+
+    def analyze_batch(self, texts):
+        self.batches.append(len(texts))
+        return [self._analyze(text) for text in texts]
+
+    def _analyze(self, text):
+        if any(word in text for word in self.drama_words):
+            return {'sentiment_score': -0.7 + self.shift, 'label': 'drama', 'confidence': 0.9}
+        return {'sentiment_score': 0.1 + self.shift, 'label': 'neutral', 'confidence': 0.6}
+
+
+TEXTS = [
+    "Nouveau scandale sur les réseaux",
+    "Polémique autour de sa dernière vidéo",
+    "Une vidéo sans histoire",
+    "Live caritatif réussi",
+]
+
+
+def test_analyze_texts_batches():
+    analyzer = _KeywordAnalyzer()
+    assert len(analyze_texts(analyzer, TEXTS * 10, batch_size=16)) == 40
+    assert analyzer.batches == [16, 16, 8]
+
+
+def test_compare_backends_reports_drift():
+    reference = _KeywordAnalyzer(drama_words=('scandale', 'Polémique'))
+    candidate = _KeywordAnalyzer(shift=0.02)
+
+    parity = compare_backends(reference, candidate, TEXTS)
+    assert parity['label_agreement'] == 0.75
+    assert parity['disagreements'] == [("Polémique autour de sa dernière vidéo", 'drama', 'neutral')]
+    assert round(parity['max_score_delta'], 2) == 0.82
+
+    parity = compare_backends(reference, reference, TEXTS)
+    assert parity['label_agreement'] == 1.0 and parity['max_score_delta'] == 0.0
+
+
+def test_default_and_unknown_backends():
+    analyzer = _KeywordAnalyzer()
+    assert apply_backend(analyzer, 'torch') is analyzer
+    try:
+        apply_backend(analyzer, 'tpu')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("unknown backend accepted")
+
+
+def test_default_onnx_cache_ignores_working_directory():
+    assert os.path.isabs(DEFAULT_ONNX_CACHE)
+    assert os.path.dirname(os.path.dirname(DEFAULT_ONNX_CACHE)) == os.path.dirname(os.path.abspath(__file__))
+
+
+def test_int8_backend_quantizes_linear_layers():
+    torch = pytest.importorskip('torch')
+    torch.manual_seed(0)
+
+    class _TinyAnalyzer:
+        def __init__(self):
+            self.model = torch.nn.Sequential(torch.nn.Linear(16, 32), torch.nn.ReLU(), torch.nn.Linear(32, 3))
+
+    analyzer = _TinyAnalyzer()
+    inputs = torch.randn(64, 16)
+    with torch.no_grad():
+        expected = analyzer.model(inputs).argmax(dim=1)
+        apply_backend(analyzer, 'int8')
+        actual = analyzer.model(inputs).argmax(dim=1)
+
+    assert type(analyzer.model[0]) is not torch.nn.Linear
+    assert (expected == actual).float().mean() >= 0.9
+
+
+if __name__ == "__main__":
+    test_analyze_texts_batches()
+    test_compare_backends_reports_drift()
+    test_default_and_unknown_backends()
+    test_default_onnx_cache_ignores_working_directory()
+    test_int8_backend_quantizes_linear_layers()
+    print("\n🎉 All tests passed!")
@@ -0,0 +1,95 @@
+from language import UNDETERMINED, AnalyzerPool, detect_language, group_by_language
+from mention_record import MentionRecord
+from metrics import InMemoryMetrics
+from orchestrator import InfluencerOrchestrator
+
+
+class _CountingAnalyzer:
+    instances = 0
+
+    def __init__(self):
+        _CountingAnalyzer.instances += 1
+        self.batches = []
+        self.texts = []
+
+    def analyze_batch(self, texts):
+        self.batches.append(len(texts))
+        self.texts.extend(texts)
+        return [{'sentiment_score': 0.0, 'label': 'neutral', 'confidence': 1.0} for _ in texts]
+
+
+def test_detect_language():
+    assert detect_language("Le nouveau scandale de la semaine fait réagir les fans sur les réseaux") == 'fr'
+    assert detect_language("The fans are happy with the new video and the charity stream") == 'en'
+    assert detect_language("El video es muy bueno y los fans están felices") == 'es'
+    assert detect_language("Squeezie") == UNDETERMINED
+    assert detect_language("") == UNDETERMINED
+
+
+def test_group_by_language_defaults_undetermined():
+    groups = group_by_language(["Squeezie", "The fans are happy with the video", "Les fans sont contents de la vidéo"],
+                               default='fr')
+    assert groups == {'fr': [0, 2], 'en': [1]}
+
+
+def test_pool_is_lazy_and_shares_factories():
+    _CountingAnalyzer.instances = 0
+    pool = AnalyzerPool({'fr': _CountingAnalyzer, 'en': _CountingAnalyzer})
+    assert _CountingAnalyzer.instances == 0
+    assert not pool.supports('es')
+
+    assert len(pool.analyze_batch('fr', ['a', 'b', 'c'])) == 3
+    pool.analyze_batch('en', ['d'])
+    assert _CountingAnalyzer.instances == 1
+    assert pool.get('fr').batches == [3, 1]
+
+
+def test_short_french_not_sent_to_italian():
+    # il/le/un are both French and Italian: they must not tip the balance
+    assert detect_language("Il est très drôle") == 'fr'
+    assert detect_language("Il a été très gentil") == 'fr'
+    assert detect_language("Une vidéo avec son ami") == 'fr'
+    assert detect_language("Il video è molto bello e la gente è felice") == 'it'
+    # à, è, ù are as Italian as they are French
+    assert detect_language("Che città!") != 'fr'
+    assert detect_language("La città è molto bella") == 'it'
+
+
+def test_only_undetermined_routes_to_default():
+    pool = AnalyzerPool({'fr': _CountingAnalyzer, 'en': _CountingAnalyzer}, default_language='fr')
+    assert pool.route('en') == 'en'
+    assert pool.route(UNDETERMINED) == 'fr'
+    assert pool.route('it') is None and pool.route('es') is None
+
+
+def test_unsupported_languages_skip_analysis():
+    sink = InMemoryMetrics()
+    instance = InfluencerOrchestrator(scrapers={}, metrics=sink)
+    instance._analyzer = analyzer = _CountingAnalyzer()
+    mentions = [MentionRecord.from_scraped({'source': 'news', 'text': text}) for text in (
+        "Les fans sont contents de la vidéo",
+        "El video es muy bueno y los fans están felices",
+        "Il video è molto bello e la gente è felice",
+        "Squeezie",
+    )]
+    mentions[1].set_analysis(0.5, 'good_action', 0.9, None)
+
+    assert instance._analyze_mentions(mentions) == mentions
+    assert analyzer.texts == ["Les fans sont contents de la vidéo", "Squeezie"]
+    assert [(m.label, m.sentiment_score, m.confidence) for m in mentions[1:3]] == [('neutral', 0.0, 0.0)] * 2
+    assert all(m.scraped_at is not None for m in mentions)
+    counters = sink.snapshot()['counters']
+    assert counters['mentions_language_skipped_total{language="es"}'] == 1
+    assert counters['mentions_language_skipped_total{language="it"}'] == 1
+    assert counters['mentions_by_language_total{language="und"}'] == 1
+    instance.db.close()
+
+
+if __name__ == "__main__":
+    test_detect_language()
+    test_group_by_language_defaults_undetermined()
+    test_pool_is_lazy_and_shares_factories()
+    test_short_french_not_sent_to_italian()
+    test_only_undetermined_routes_to_default()
+    test_unsupported_languages_skip_analysis()
+    print("\n🎉 All tests passed!")
@@ -0,0 +1,188 @@
+"""
+Leaderboard storage tests: cache versioning, contributor stats and achievements
+"""
+
+import uuid
+from datetime import datetime, timedelta
+
+import database
+
+
+def _contributor(db, prefix='lb'):
+    return database.get_or_create_contributor(db, f"{prefix}-{uuid.uuid4().hex[:8]}")
+
+
+def test_leaderboard_version_bumps_after_commit():
+    db = database.get_db()
+    before = database.get_leaderboard_version(db, shared=False)
+
+    database.bump_leaderboard_version(db)
+    # Readers must not see the new version while the write is uncommitted
+    assert database.get_leaderboard_version(db, shared=False) == before
+    db.commit()
+    assert database.get_leaderboard_version(db, shared=False)[0] == before[0] + 1
+
+    database.bump_leaderboard_version(db)
+    db.rollback()
+    db.commit()
+    assert database.get_leaderboard_version(db, shared=False)[0] == before[0] + 1
+    db.close()
+
+
+def test_stats_write_bumps_version():
+    db = database.get_db()
+    contributor = _contributor(db)
+    before = database.get_leaderboard_version(db, shared=False)[0]
+    database.update_contributor_stats(db, contributor.id, 10)
+    assert database.get_leaderboard_version(db, shared=False)[0] == before + 1
+    db.close()
+
+
+def test_rank_changes_against_previous_day():
+    db = database.get_db()
+    period = f"test-{uuid.uuid4().hex[:8]}"
+    today = datetime(2030, 1, 3)
+    db.bulk_insert_mappings(database.RankingSnapshot, [
+        {'period': period, 'snapshot_date': datetime(2030, 1, 1), 'contributor_id': 1, 'rank': 9},
+        {'period': period, 'snapshot_date': datetime(2030, 1, 2), 'contributor_id': 1, 'rank': 3},
+        {'period': period, 'snapshot_date': datetime(2030, 1, 2), 'contributor_id': 2, 'rank': 1},
+        # Same-day snapshots are not "previous"
+        {'period': period, 'snapshot_date': today, 'contributor_id': 2, 'rank': 50},
+    ])
+    db.commit()
+
+    rankings = [{'contributor_id': 1, 'rank': 1}, {'contributor_id': 2, 'rank': 2}, {'contributor_id': 3, 'rank': 3}]
+    assert database.get_rank_changes(db, period, rankings, now=today.replace(hour=8)) == {1: 2, 2: -1, 3: 0}
+    assert database.get_rank_changes(db, f"{period}-none", rankings, now=today) == {1: 0, 2: 0, 3: 0}
+    db.close()
+
+
+def test_snapshot_closes_previous_day():
+    db = database.get_db()
+    contributor = _contributor(db, 'snap')
+    closing_day = datetime(2031, 6, 10)
+    bucket = database.ContributorDailyStats(contributor_id=contributor.id, day=closing_day,
+                                            points_earned=10 ** 9 + contributor.id, analyses_count=1)
+    db.add(bucket)
+    db.commit()
+    try:
+        # Taken just after midnight: stamped with the day that ended, over its window
+        database.take_ranking_snapshot(db, 'day', now=datetime(2031, 6, 11, 0, 5))
+        top = db.query(database.RankingSnapshot).filter(
+            database.RankingSnapshot.period == 'day',
+            database.RankingSnapshot.snapshot_date == closing_day
+        ).order_by(database.RankingSnapshot.rank).first()
+        assert top.contributor_id == contributor.id
+    finally:
+        db.delete(bucket)
+        db.commit()
+        db.close()
+
+
+def test_snapshot_job_refreshes_cached_rank_changes():
+    import jobs
+    from leaderboard import LeaderboardManager
+
+    db = database.get_db()
+    leader = _contributor(db, 'leader')
+    leader.total_points = 10 ** 12 + leader.id
+    today = database.get_period_start('day')
+    db.query(database.RankingSnapshot).filter(
+        database.RankingSnapshot.period == 'all',
+        database.RankingSnapshot.snapshot_date >= today - timedelta(days=2)
+    ).delete(synchronize_session=False)
+    db.add(database.RankingSnapshot(period='all', snapshot_date=today - timedelta(days=2),
+                                    contributor_id=leader.id, rank=4))
+    database.bump_leaderboard_version(db)
+    db.commit()
+
+    lm = LeaderboardManager()
+    assert lm.get_rankings('all', limit=3)[0]['rank_change'] == 3
+
+    jobs.snapshot_rankings(db, periods=('all',), limit=3)
+    top = lm.get_rankings('all', limit=3)[0]
+    assert top['contributor_id'] == leader.id and top['rank_change'] == 0
+    db.close()
+
+
+def test_recompute_streaks():
+    db = database.get_db()
+    now = datetime(2032, 3, 10, 15)
+    ago = lambda days, hour=12: now.replace(hour=hour) - timedelta(days=days)
+    analyses = {
+        'live': [ago(0), ago(0, 1), ago(1), ago(2), ago(5)],  # two analyses today count once
+        'yesterday': [ago(1, 23), ago(2, 0)],  # still live until today ends
+        'lapsed': [ago(3)],
+    }
+    contributors = {key: _contributor(db, f"streak-{key}") for key in analyses}
+    contributors['lapsed'].streak_days = 4
+    contributors['yesterday'].streak_days = 2
+    db.add_all([
+        database.AnalysisHistory(influencer_name='Streaks', contributor_id=contributors[key].id, trust_score=50.0,
+                                 drama_count=0, good_action_count=0, analyzed_at=when)
+        for key, dates in analyses.items() for when in dates
+    ])
+    db.commit()
+
+    ids = sorted(c.id for c in contributors.values())
+    assert database.recompute_streaks(db, ids[0], ids[-1], now=now) == 2
+    db.expire_all()
+    assert {key: c.streak_days for key, c in contributors.items()} == {'live': 3, 'yesterday': 2, 'lapsed': 0}
+    assert database.recompute_streaks(db, ids[0], ids[-1], now=now) == 0
+    db.close()
+
+
+def _unlocked(db, contributor_id):
+    return {key for key, _ in database.get_contributor_achievements(db, [contributor_id])[contributor_id]}
+
+
+def test_stats_update_unlocks_achievements_once():
+    db = database.get_db()
+    contributor = _contributor(db, 'ach')
+    database.update_contributor_stats(db, contributor.id, 10)
+    assert _unlocked(db, contributor.id) == {'first_analysis'}
+
+    contributor.analyses_count = 9
+    db.commit()
+    database.update_contributor_stats(db, contributor.id, 10)
+    database.update_contributor_stats(db, contributor.id, 10)
+    rows = db.query(database.ContributorAchievement).filter(
+        database.ContributorAchievement.contributor_id == contributor.id
+    ).count()
+    assert _unlocked(db, contributor.id) == {'first_analysis', 'dedicated'} and rows == 2
+    db.close()
+
+
+def test_backfill_achievements():
+    db = database.get_db()
+    contributor = _contributor(db, 'backfill')
+    contributor.analyses_count = 12
+    contributor.streak_days = 7
+    db.commit()
+
+    database.backfill_achievements(db)
+    assert _unlocked(db, contributor.id) == {'first_analysis', 'dedicated', 'streak_3', 'streak_7'}
+    assert database.backfill_achievements(db) == 0
+    db.close()
+
+
+def test_badges_follow_rules():
+    from leaderboard import ACHIEVEMENT_BADGES, LeaderboardManager
+    achievements = LeaderboardManager().ACHIEVEMENTS
+    assert set(ACHIEVEMENT_BADGES) == set(database.ACHIEVEMENT_RULES) == set(achievements)
+    for key, (metric, threshold) in database.ACHIEVEMENT_RULES.items():
+        assert achievements[key]['threshold'] == threshold
+    assert achievements['dedicated']['description'] == 'Complete 10 analyses'
+
+
+if __name__ == "__main__":
+    test_leaderboard_version_bumps_after_commit()
+    test_stats_write_bumps_version()
+    test_rank_changes_against_previous_day()
+    test_snapshot_closes_previous_day()
+    test_snapshot_job_refreshes_cached_rank_changes()
+    test_recompute_streaks()
+    test_stats_update_unlocks_achievements_once()
+    test_backfill_achievements()
+    test_badges_follow_rules()
+    print("\n🎉 All tests passed!")
@@ -0,0 +1,43 @@
+from datetime import datetime, timedelta
+from leaderboard import LeaderboardManager
+from mention_batch import MentionBatch
+from mention_record import MentionRecord
+
+
+def make_mentions():
+    now = datetime.utcnow()
+    mentions = []
+    for idx in range(120):
+        mentions.append(MentionRecord(
+            source=['news', 'youtube', 'twitter', 'reddit', 'forum', 'blog'][idx % 6],
+            url=f'https://example.com/{idx}',
+            text='text',
+            sentiment_score=(idx % 7 - 3) / 3.0,
+            label=['drama', 'good_action', 'neutral'][idx % 3],
+            scraped_at=now - timedelta(days=idx % 45, hours=idx % 5)
+        ))
+    # Dict mentions with ISO strings and missing timestamps
+    mentions.append({'source': 'news', 'label': 'drama', 'sentiment_score': -0.5,
+                     'scraped_at': (now - timedelta(days=40)).isoformat()})
+    mentions.append({'source': 'forum', 'label': 'neutral', 'sentiment_score': 0.0})
+    return mentions
+
+
+def test_quality_score_batch_matches_loop():
+    lm = LeaderboardManager()
+    mentions = make_mentions()
+    batch = MentionBatch.from_mentions(mentions)
+    assert abs(lm.calculate_quality_score(mentions) - lm.calculate_quality_score(batch)) < 1e-9
+    assert abs(lm.calculate_quality_score(mentions[:3]) - lm.calculate_quality_score(MentionBatch.from_mentions(mentions[:3]))) < 1e-9
+
+
+def test_label_and_source_counts():
+    batch = MentionBatch.from_mentions(make_mentions())
+    assert batch.label_counts() == {'neutral': 41, 'drama': 41, 'good_action': 40}
+    assert batch.unique_source_count() == 6
+
+
+if __name__ == "__main__":
+    test_quality_score_batch_matches_loop()
+    test_label_and_source_counts()
+    print("🎉 All tests passed!")
@@ -0,0 +1,100 @@
+import uuid
+from datetime import datetime, timedelta
+
+import database
+
+
+def _influencer_with_runs(db):
+    """Two analysis runs: 5 mentions yesterday, 7 today (sharing one scraped_at per run)"""
+    name = f"Feed {uuid.uuid4().hex[:8]}"
+    today = datetime.utcnow().replace(microsecond=0)
+    runs = [(today - timedelta(days=1), 5), (today, 7)]
+    for scraped_at, count in runs:
+        database.save_mentions_bulk(db, name, [{
+            'source': 'news' if i % 2 else 'reddit', 'url': f"https://example.com/{i}",
+            'text_excerpt': f"mention {i}", 'sentiment_score': 0.0,
+            'label': 'drama' if i < 2 else 'neutral', 'scraped_at': scraped_at
+        } for i in range(count)])
+    return name, today
+
+
+def test_mention_page_keyset():
+    db = database.get_db()
+    name, _ = _influencer_with_runs(db)
+
+    seen = []
+    cursor = None
+    while True:
+        page = database.get_mention_page(db, name, limit=5, cursor=cursor)
+        seen.extend(m.id for m in page['mentions'])
+        cursor = page['next_cursor']
+        if not cursor:
+            break
+    assert len(seen) == len(set(seen)) == 12
+    ordered = db.query(database.Mention).filter(database.Mention.id.in_(seen)).all()
+    by_id = {m.id: m for m in ordered}
+    keys = [(by_id[i].scraped_at, i) for i in seen]
+    assert keys == sorted(keys, reverse=True)
+
+    drama = database.get_mention_page(db, name, label='drama', limit=10)
+    assert len(drama['mentions']) == 4 and drama['next_cursor'] is None
+    db.close()
+
+
+def test_counts_and_page_scoped_to_run():
+    db = database.get_db()
+    name, run_start = _influencer_with_runs(db)
+
+    assert database.get_mention_label_counts(db, name) == {'drama': 4, 'good_action': 0, 'neutral': 8}
+    assert database.get_mention_label_counts(db, name, since=run_start) == {'drama': 2, 'good_action': 0, 'neutral': 5}
+    assert database.get_mention_label_counts(db, name, source='news', since=run_start)['neutral'] == 2
+    assert database.get_mention_source_counts(db, name, since=run_start) == {'news': 3, 'reddit': 4}
+
+    page = database.get_mention_page(db, name, limit=20, since=run_start)
+    assert len(page['mentions']) == 7
+    db.close()
+
+
+def test_cached_results_cover_latest_run_of_legacy_rows():
+    import orchestrator
+
+    db = database.get_db()
+    name = f"Legacy run {uuid.uuid4().hex[:8]}"
+    start = datetime(2024, 5, 1, 12)
+    # Before runs shared one scraped_at, every row carried its own timestamp
+    for run, (count, offset) in enumerate([(3, 0), (4, 60)]):
+        database.save_mentions_bulk(db, name, [{
+            'source': 'news', 'url': f"https://example.com/{run}/{i}", 'text_excerpt': f"run {run} mention {i}",
+            'sentiment_score': 0.0, 'label': 'neutral', 'scraped_at': start + timedelta(seconds=offset + i)
+        } for i in range(count)])
+        database.update_influencer_score(db, name, 50.0, 0, 0)
+        db.query(database.AnalysisHistory).filter(
+            database.AnalysisHistory.influencer_name == name, database.AnalysisHistory.analyzed_at > start + timedelta(days=1)
+        ).update({'analyzed_at': start + timedelta(seconds=offset + 30)}, synchronize_session=False)
+        db.commit()
+
+    assert database.get_latest_run_window(db, name) == (start + timedelta(seconds=30), start + timedelta(seconds=90))
+    results = orchestrator.InfluencerOrchestrator().get_cached_results(name)
+    assert sorted(m.text for m in results['mentions']) == [f"run 1 mention {i}" for i in range(4)]
+    assert results['analyzed_at'] == start + timedelta(seconds=90)
+
+    # The feed is not scoped to a run
+    assert len(database.get_mention_page(db, name, limit=20)['mentions']) == 7
+
+    # Mentions without any recorded run are all used
+    other = f"No run {uuid.uuid4().hex[:8]}"
+    database.save_mentions_bulk(db, other, [{
+        'source': 'news', 'url': f"https://example.com/{i}", 'text_excerpt': 'x', 'sentiment_score': 0.0,
+        'label': 'neutral', 'scraped_at': start + timedelta(seconds=i)
+    } for i in range(2)])
+    database.get_or_create_influencer(db, other)
+    assert database.get_latest_run_window(db, other) == (None, None)
+    assert len(orchestrator.InfluencerOrchestrator().get_cached_results(other)['mentions']) == 2
+    db.close()
+
+
+if __name__ == "__main__":
+    test_mention_page_keyset()
+    test_counts_and_page_scoped_to_run()
+    test_cached_results_cover_latest_run_of_legacy_rows()
+    print("\n🎉 All tests passed!")
@@ -0,0 +1,52 @@
+import sys
+from datetime import datetime
+from types import SimpleNamespace
+
+from leaderboard import LeaderboardManager
+from mention_record import MentionRecord
+
+
+def test_mapping_access_matches_dict():
+    record = MentionRecord.from_scraped({'source': 'news', 'url': 'https://example.com', 'text': 'Un texte'})
+    as_dict = record.to_dict()
+    for key in ('title', 'scraped_at', 'cluster_id', 'label', 'missing'):
+        assert record.get(key) == as_dict.get(key)
+        assert record.get(key, 'default') == as_dict.get(key, 'default')
+    assert record.get('title', 'Sans titre') is None
+    assert record['text'] == 'Un texte' and 'url' in record and 'missing' not in record
+    try:
+        record['missing']
+    except KeyError:
+        pass
+    else:
+        raise AssertionError("unknown key readable")
+
+
+def test_interned_strings_and_analysis():
+    first = MentionRecord('new' + 's', '', '')
+    second = MentionRecord.from_scraped({'source': ''.join(['n', 'e', 'w', 's'])})
+    assert first.source is second.source
+    assert first.label == 'neutral' and first.url == '' and second.source == 'news'
+
+    when = datetime(2025, 1, 1)
+    first.set_analysis(-0.4, ''.join(['dra', 'ma']), 0.8, when)
+    assert first.label is sys.intern('drama')
+    assert (first['sentiment_score'], first['confidence'], first['scraped_at']) == (-0.4, 0.8, when)
+
+
+def test_from_model_and_unanalyzed_quality_score():
+    row = SimpleNamespace(source='reddit', url='u', text_excerpt='t', sentiment_score=0.3, label='good_action',
+                          scraped_at=datetime(2025, 1, 1), cluster_id=None, duplicate_count=None)
+    record = MentionRecord.from_model(row)
+    assert record.text == 't' and record.duplicate_count == 0 and record.get('cluster_id', 'x') is None
+
+    # Records not analyzed yet have no timestamp; they count as recent
+    pending = [MentionRecord.from_scraped({'source': 'news'}) for _ in range(3)]
+    assert abs(LeaderboardManager().calculate_quality_score(pending) - (0.4 / 5 + 0.3 * 3 / 30 + 0.3)) < 1e-9
+
+
+if __name__ == "__main__":
+    test_mapping_access_matches_dict()
+    test_interned_strings_and_analysis()
+    test_from_model_and_unanalyzed_quality_score()
+    print("\n🎉 All tests passed!")
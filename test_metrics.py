@@ -0,0 +1,96 @@
+import json
+import logging
+import urllib.error
+import urllib.request
+
+import metrics
+from metrics import InMemoryMetrics, JsonLogMetrics, MultiSink
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def test_render_prometheus():
+    sink = InMemoryMetrics(buckets=(0.1, 1.0))
+    sink.increment('mentions_total', 3, {'source': 'news'})
+    sink.increment('mentions_total', 2, {'source': 'news'})
+    sink.increment('mentions_total', labels={'source': 'say "hi"\n'})
+    for value in (0.05, 0.5, 2.0):
+        sink.observe('pipeline_stage_seconds', value, {'stage': 'scrape'})
+
+    lines = sink.render_prometheus().splitlines()
+    assert lines == [
+        '# TYPE mentions_total counter',
+        'mentions_total{source="news"} 5',
+        'mentions_total{source="say \\"hi\\"\\n"} 1',
+        '# TYPE pipeline_stage_seconds histogram',
+        'pipeline_stage_seconds_bucket{stage="scrape",le="0.1"} 1',
+        'pipeline_stage_seconds_bucket{stage="scrape",le="1.0"} 2',
+        'pipeline_stage_seconds_bucket{stage="scrape",le="+Inf"} 3',
+        'pipeline_stage_seconds_sum{stage="scrape"} 2.55',
+        'pipeline_stage_seconds_count{stage="scrape"} 3',
+    ]
+    assert sink.snapshot()['histograms']['pipeline_stage_seconds{stage="scrape"}']['count'] == 3
+
+    sink.reset()
+    assert sink.render_prometheus() == '\n'
+
+
+def test_json_sink_and_timer():
+    log = logging.getLogger('metrics.test')
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    handler = _ListHandler()
+    log.addHandler(handler)
+    memory = InMemoryMetrics()
+    sink = MultiSink(memory, JsonLogMetrics(log))
+
+    sink.increment('cache_hits_total', labels={'influencer': 'Squeezie'})
+    with sink.timer('analysis_seconds'):
+        pass
+
+    events = [json.loads(message) for message in handler.messages]
+    assert [(e['type'], e['name']) for e in events] == [('counter', 'cache_hits_total'), ('histogram', 'analysis_seconds')]
+    assert events[0]['value'] == 1 and events[0]['labels'] == {'influencer': 'Squeezie'}
+    assert events[1]['value'] >= 0 and events[1]['labels'] == {}
+    assert memory.snapshot()['counters'] == {'cache_hits_total{influencer="Squeezie"}': 1}
+
+    # Nothing is serialized when the logger would drop it
+    log.setLevel(logging.WARNING)
+    sink.increment('cache_hits_total')
+    assert len(handler.messages) == 2
+    log.removeHandler(handler)
+
+
+def test_prometheus_server_serves_process_sink():
+    previous = metrics.get_metrics()
+    sink = metrics.configure_metrics('both')
+    server = metrics.start_prometheus_server(port=0, addr='127.0.0.1')
+    try:
+        sink.increment('analyses_total')
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        with urllib.request.urlopen(f"{base}/metrics") as response:
+            assert 'analyses_total 1' in response.read().decode()
+        try:
+            urllib.request.urlopen(f"{base}/other")
+        except urllib.error.HTTPError as e:
+            assert e.code == 404
+        else:
+            raise AssertionError("unknown path served")
+    finally:
+        server.shutdown()
+        server.server_close()
+        metrics.set_metrics(previous)
+
+
+if __name__ == "__main__":
+    test_render_prometheus()
+    test_json_sink_and_timer()
+    test_prometheus_server_serves_process_sink()
+    print("\n🎉 All tests passed!")
@@ -0,0 +1,65 @@
+import sqlite3
+
+from migrate_database import compact_contributor_stats
+
+
+def _legacy_database():
+    conn = sqlite3.connect(':memory:')
+    conn.executescript("""
+        CREATE TABLE contributor_daily_stats (
+            id INTEGER PRIMARY KEY,
+            contributor_id INTEGER NOT NULL,
+            day DATETIME NOT NULL,
+            points_earned INTEGER DEFAULT 0,
+            analyses_count INTEGER DEFAULT 0
+        );
+        CREATE UNIQUE INDEX idx_daily_contributor_day ON contributor_daily_stats(contributor_id, day);
+        CREATE TABLE contributor_stats (
+            id INTEGER PRIMARY KEY,
+            contributor_id INTEGER NOT NULL,
+            period VARCHAR(10) NOT NULL,
+            period_start DATETIME NOT NULL,
+            points_earned INTEGER DEFAULT 0,
+            analyses_count INTEGER DEFAULT 0
+        );
+    """)
+    return conn
+
+
+def test_compact_contributor_stats():
+    conn = _legacy_database()
+    cursor = conn.cursor()
+    # A bucket already written by the new code for the same day
+    cursor.execute("INSERT INTO contributor_daily_stats (contributor_id, day, points_earned, analyses_count) "
+                   "VALUES (1, '2025-01-02 00:00:00.000000', 5, 1)")
+    cursor.executemany(
+        "INSERT INTO contributor_stats (contributor_id, period, period_start, points_earned, analyses_count) "
+        "VALUES (?, ?, ?, ?, ?)", [
+            (1, 'day', '2025-01-01 00:00:00.000000', 10, 1),
+            (1, 'day', '2025-01-01 00:00:00.000000', 12, 1),
+            (1, 'day', '2025-01-04 00:00:00.000000', 7, 1),
+            (2, 'day', '2025-01-01 00:00:00.000000', 3, 1),
+            # Rolling week/month rows only repeat the daily counts
+            (1, 'week', '2024-12-30 00:00:00.000000', 29, 3),
+            (1, 'month', '2025-01-01 00:00:00.000000', 29, 3),
+        ])
+
+    assert compact_contributor_stats(cursor) == 3
+    rows = cursor.execute(
+        "SELECT contributor_id, day, points_earned, analyses_count FROM contributor_daily_stats "
+        "ORDER BY contributor_id, day"
+    ).fetchall()
+    assert rows == [
+        (1, '2025-01-02 00:00:00.000000', 27, 3),
+        (1, '2025-01-05 00:00:00.000000', 7, 1),
+        (2, '2025-01-02 00:00:00.000000', 3, 1),
+    ]
+    assert cursor.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name='contributor_stats'"
+    ).fetchone() is None
+    conn.close()
+
+
+if __name__ == "__main__":
+    test_compact_contributor_stats()
+    print("\n🎉 All tests passed!")
@@ -0,0 +1,84 @@
+import threading
+import uuid
+
+import database
+from name_index import NameIndex, display_name, normalize_name
+
+
+def test_normalize_name_folds_variants():
+    assert normalize_name("Squeezie") == normalize_name("squeezie ") == normalize_name("SQUEEZIE")
+    assert normalize_name("Léna  Situations") == "lena situations"
+    assert normalize_name("Jean-Baptiste") == normalize_name("jean baptiste")
+    assert display_name("  Léna   Situations ") == "Léna Situations"
+
+
+def test_suggest_prefix_then_fuzzy():
+    index = NameIndex()
+    for name in ["Squeezie", "Norman", "Cyprien", "Léna Situations", "Lebouseuh", "McFly et Carlito"]:
+        index.add(name)
+    index.add("SQUEEZIE")  # same key, ignored
+
+    assert len(index) == 6
+    assert index.lookup("squeezie ") == "Squeezie"
+    assert index.suggest("le")[:2] == ["Lebouseuh", "Léna Situations"]
+    assert index.suggest("sqeezie")[0] == "Squeezie"
+    assert index.suggest("") == []
+
+
+def test_suggest_while_adding():
+    index = NameIndex()
+    errors = []
+
+    def writer():
+        for i in range(5000):
+            index.add(f"Streamer {i}")
+
+    def reader():
+        try:
+            for _ in range(500):
+                index.suggest("streamer 1")
+        except RuntimeError as e:  # set changed size during iteration
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer), threading.Thread(target=reader)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert len(index) == 5000
+
+
+def test_legacy_row_matches_other_case():
+    db = database.get_db()
+    name = f"Legacy {uuid.uuid4().hex[:8]}"
+    legacy = database.Influencer(name=name, normalized_name=None)
+    db.add(legacy)
+    db.commit()
+
+    found = database.get_or_create_influencer(db, name.upper())
+    assert found.id == legacy.id
+    assert found.normalized_name == normalize_name(name)
+    assert db.query(database.Influencer).filter(database.Influencer.name.ilike(name)).count() == 1
+    db.close()
+
+
+def test_legacy_row_matches_accented_case():
+    db = database.get_db()
+    name = f"Élodie {uuid.uuid4().hex[:8]}"
+    legacy = database.Influencer(name=name, normalized_name=None)
+    db.add(legacy)
+    db.commit()
+
+    assert database.find_influencer(db, name.upper()).id == legacy.id
+    assert database.resolve_influencer_name(db, f"elodie {name.split()[1]}") == name
+    db.close()
+
+
+if __name__ == "__main__":
+    test_normalize_name_folds_variants()
+    test_suggest_prefix_then_fuzzy()
+    test_suggest_while_adding()
+    test_legacy_row_matches_other_case()
+    test_legacy_row_matches_accented_case()
+    print("🎉 All tests passed!")
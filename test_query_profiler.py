@@ -0,0 +1,80 @@
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import StaticPool
+
+from query_profiler import QueryProfiler, normalize_statement
+
+
+def _profiler(**kwargs):
+    engine = create_engine('sqlite://', poolclass=StaticPool)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)"))
+        conn.execute(text("INSERT INTO items (name) VALUES ('a'), ('b'), ('c')"))
+    return engine, QueryProfiler(engine, n_plus_one_threshold=3, **kwargs).enable()
+
+
+def test_normalize_statement_groups_in_lists():
+    assert normalize_statement("SELECT *\n  FROM t WHERE id IN (?, ?, ?)") == "SELECT * FROM t WHERE id IN (...)"
+    assert normalize_statement("SELECT * FROM t WHERE id IN (%(id_1)s, %(id_2)s)") == "SELECT * FROM t WHERE id IN (...)"
+
+
+def test_request_records_and_flags_n_plus_one():
+    engine, profiler = _profiler()
+    with engine.connect() as conn:
+        conn.execute(text("SELECT count(*) FROM items"))  # outside any request: ignored
+        with profiler.request('loop') as profile:
+            for item_id in (1, 2, 3):
+                conn.execute(text("SELECT name FROM items WHERE id = :id"), {'id': item_id})
+            conn.execute(text("SELECT * FROM items"))
+
+    summary = profile.summary()
+    assert summary['query_count'] == 4 and profiler.global_profile.queries == []
+    assert [e['count'] for e in summary['n_plus_one']] == [3]
+    assert all(q.call_site.startswith('test_query_profiler.py:') for q in profile.queries)
+    assert 'N+1 suspect (3×)' in profile.format_report()
+
+    profiler.disable()
+    with profiler.request('disabled') as profile:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    assert profile.queries == []
+
+
+def test_failed_statement_does_not_leak_start_time():
+    engine, profiler = _profiler()
+    with engine.connect() as conn:
+        with profiler.request('errors') as profile:
+            for _ in range(3):
+                try:
+                    conn.execute(text("SELECT * FROM missing_table"))
+                except OperationalError:
+                    pass
+            conn.execute(text("SELECT 1"))
+        assert conn.info.get('query_profiler_start') == {}
+    assert len(profile.queries) == 1
+
+
+def test_profiled_decorator_keeps_metadata():
+    engine, profiler = _profiler(record_outside_requests=True)
+    reports = []
+
+    @profiler.profiled(report=reports.append)
+    def load_items(conn):
+        """Load every item"""
+        return conn.execute(text("SELECT name FROM items")).scalars().all()
+
+    with engine.connect() as conn:
+        assert load_items(conn) == ['a', 'b', 'c']
+        conn.execute(text("SELECT 1"))
+    assert load_items.__name__ == 'load_items' and load_items.__doc__ == "Load every item"
+    assert load_items.__wrapped__.__name__ == 'load_items'
+    assert len(reports) == 1 and 'load_items: 1 queries' in reports[0]
+    assert len(profiler.global_profile.queries) == 1
+
+
+if __name__ == "__main__":
+    test_normalize_statement_groups_in_lists()
+    test_request_records_and_flags_n_plus_one()
+    test_failed_statement_does_not_leak_start_time()
+    test_profiled_decorator_keeps_metadata()
+    print("\n🎉 All tests passed!")
@@ -0,0 +1,85 @@
+import os
+import tempfile
+import uuid
+from datetime import datetime, timedelta
+
+import database
+from retention import RetentionPolicy, archive_month, read_archived_mentions
+
+MONTH = datetime(2001, 3, 1)
+
+
+def _influencer_with_mentions(db, hot=60, archived=5):
+    name = f"Retention {uuid.uuid4().hex[:8]}"
+    database.get_or_create_influencer(db, name)
+    rows = [{
+        'source': 'news', 'url': f"https://example.com/{i}", 'text_excerpt': f"old {i}",
+        'sentiment_score': 0.0, 'label': 'neutral', 'scraped_at': MONTH + timedelta(days=i)
+    } for i in range(archived)]
+    now = datetime.utcnow()
+    rows += [{
+        'source': 'news', 'url': f"https://example.com/hot/{i}", 'text_excerpt': f"hot {i}",
+        'sentiment_score': 0.0, 'label': 'neutral', 'scraped_at': now - timedelta(hours=i)
+    } for i in range(hot)]
+    database.save_mentions_bulk(db, name, rows)
+    return name
+
+
+def _policy(format='parquet'):
+    return RetentionPolicy(archive_dir=tempfile.mkdtemp(), format=format, batch_size=2)
+
+
+def test_archive_and_full_history():
+    db = database.get_db()
+    name = _influencer_with_mentions(db)
+    policy = _policy()
+
+    assert archive_month(db, policy, MONTH, datetime(2001, 4, 1)) >= 5
+    data = database.get_influencer_data(db, name, include_archive=True)
+    assert len(data['mentions']) == 65
+    scraped = [m.scraped_at for m in data['mentions']]
+    assert scraped == sorted(scraped, reverse=True)
+
+    # Without the archive only the recent page is returned
+    assert len(database.get_influencer_data(db, name)['mentions']) == 50
+
+    since = datetime.utcnow() - timedelta(hours=9, minutes=30)
+    assert len(database.get_influencer_data(db, name, include_archive=True, since=since)['mentions']) == 10
+    since = MONTH + timedelta(days=3)
+    assert len(database.get_influencer_data(db, name, include_archive=True, since=since)['mentions']) == 62
+    db.close()
+
+
+def test_failed_commit_does_not_duplicate_archive():
+    db = database.get_db()
+    name = _influencer_with_mentions(db, hot=0)
+    policy = _policy('arrow')
+
+    commit = db.commit
+
+    def failing_commit():
+        raise RuntimeError("database went away")
+
+    db.commit = failing_commit
+    try:
+        archive_month(db, policy, MONTH, datetime(2001, 4, 1))
+    except RuntimeError:
+        db.rollback()
+    else:
+        raise AssertionError("commit failure not raised")
+    finally:
+        db.commit = commit
+
+    archive_month(db, policy, MONTH, datetime(2001, 4, 1))
+    assert len(os.listdir(policy.archive_dir)) == 1
+
+    archived = read_archived_mentions(db, name)
+    assert [m.text_excerpt for m in archived] == [f"old {i}" for i in reversed(range(5))]
+    assert db.query(database.Mention).filter(database.Mention.influencer_name == name).count() == 0
+    db.close()
+
+
+if __name__ == "__main__":
+    test_archive_and_full_history()
+    test_failed_commit_does_not_duplicate_archive()
+    print("\n🎉 All tests passed!")
@@ -0,0 +1,112 @@
+"""
+Trust score rollup tests: rebuild from history, chart series and the migration backfill
+"""
+
+import os
+import tempfile
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import database
+import migrate_database
+
+# Out of order, with a tie, across hours, days and a week boundary (2025-01-05 is a Sunday)
+SCORES = [
+    (datetime(2025, 1, 6, 9, 15), 70.0),
+    (datetime(2025, 1, 5, 23, 50), 40.5),
+    (datetime(2025, 1, 5, 23, 10), 55.0),
+    (datetime(2025, 1, 6, 9, 15), 72.25),
+    (datetime(2025, 1, 6, 9, 45), 61.0),
+    (datetime(2025, 1, 8, 0, 0), 30.0),
+]
+
+
+def _rollups(db, name):
+    return sorted(
+        (r.resolution, r.bucket_start, r.min_score, r.max_score, r.sum_score, r.count, r.last_score, r.last_at)
+        for r in db.query(database.ScoreRollup).filter(database.ScoreRollup.influencer_name == name)
+    )
+
+
+def _add_history(db, name):
+    db.add_all([
+        database.AnalysisHistory(influencer_name=name, trust_score=score, drama_count=0,
+                                 good_action_count=0, analyzed_at=when)
+        for when, score in SCORES
+    ])
+    db.commit()
+
+
+def test_rebuild_matches_incremental():
+    db = database.get_db()
+    name = f"Rollup {uuid.uuid4().hex[:8]}"
+    _add_history(db, name)
+    for when, score in SCORES:
+        database._update_score_rollups(db, name, score, when)
+    db.commit()
+    incremental = _rollups(db, name)
+
+    database.rebuild_score_rollups(db, name)
+    assert _rollups(db, name) == incremental
+
+    weeks = [r for r in incremental if r[0] == 'week']
+    assert [(r[1], r[5]) for r in weeks] == [(datetime(2024, 12, 30), 2), (datetime(2025, 1, 6), 4)]
+    hour = next(r for r in incremental if r[0] == 'hour' and r[1] == datetime(2025, 1, 6, 9))
+    assert hour[5:] == (3, 61.0, datetime(2025, 1, 6, 9, 45))
+    db.close()
+
+
+def test_score_series_picks_resolution():
+    db = database.get_db()
+    name = f"Series {uuid.uuid4().hex[:8]}"
+    _add_history(db, name)
+    database.rebuild_score_rollups(db, name)
+
+    end = datetime(2025, 1, 9)
+    hourly = database.get_score_series(db, name, start=datetime(2025, 1, 5), end=end)
+    assert hourly['resolution'] == 'hour'
+    assert [p['count'] for p in hourly['points']] == [2, 3, 1]
+
+    daily = database.get_score_series(db, name, start=end - timedelta(days=60), end=end)
+    assert daily['resolution'] == 'day'
+    day = next(p for p in daily['points'] if p['bucket_start'] == datetime(2025, 1, 6))
+    assert (day['min'], day['max'], day['last']) == (61.0, 72.25, 61.0)
+    assert day['avg'] == (70.0 + 72.25 + 61.0) / 3
+
+    weekly = database.get_score_series(db, name, start=end - timedelta(days=3650), end=end)
+    assert weekly['resolution'] == 'week' and len(weekly['points']) == 2
+    assert database.get_score_series(db, name, start=datetime(2030, 1, 1), end=datetime(2030, 1, 2))['points'] == []
+    db.close()
+
+
+def test_migration_backfills_its_own_database():
+    path = os.path.join(tempfile.mkdtemp(), 'legacy.db')
+    engine = create_engine(f"sqlite:///{path}")
+    database.Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    name = f"Migrated {uuid.uuid4().hex[:8]}"
+    _add_history(db, name)
+
+    db_path = migrate_database.DB_PATH
+    migrate_database.DB_PATH = path
+    try:
+        migrate_database.migrate_database()
+    finally:
+        migrate_database.DB_PATH = db_path
+    assert len(_rollups(db, name)) == 8
+    db.close()
+    engine.dispose()
+
+    configured = database.get_db()
+    assert configured.query(database.ScoreRollup).filter(database.ScoreRollup.influencer_name == name).count() == 0
+    configured.close()
+
+
+if __name__ == "__main__":
+    test_rebuild_matches_incremental()
+    test_score_series_picks_resolution()
+    test_migration_backfills_its_own_database()
+    print("\n🎉 All tests passed!")
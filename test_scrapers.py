@@ -0,0 +1,50 @@
+import asyncio
+
+from scrapers import SYNTHETIC_PHRASES, SYNTHETIC_SOURCES, SyntheticScraper, get_scrapers
+
+
+def _scrape(scraper, query="Squeezie"):
+    return asyncio.run(scraper.scrape(query))
+
+
+def test_synthetic_scraper_is_reproducible():
+    first = _scrape(SyntheticScraper('news', mentions_per_source=20, seed=7, latency_ms=0))
+    second = _scrape(SyntheticScraper('news', mentions_per_source=20, seed=7, latency_ms=0))
+    assert len(first) == 20
+    assert first == second
+    assert all(m['source'] == 'news' and 'Squeezie' in m['text'] for m in first)
+
+    other_seed = _scrape(SyntheticScraper('news', mentions_per_source=20, seed=8, latency_ms=0))
+    assert other_seed != first
+
+
+def test_synthetic_sentiment_mix():
+    scraper = SyntheticScraper('reddit', mentions_per_source=200, seed=1, latency_ms=0,
+                               sentiment_mix=(1.0, 0.0, 0.0))
+    drama_openings = tuple(p.split('{query}')[0] for p in SYNTHETIC_PHRASES['drama'])
+    texts = [m['text'] for m in _scrape(scraper)]
+    assert all(any(t.startswith(opening) for opening in drama_openings) for t in texts)
+
+
+def test_synthetic_failure_rate():
+    scraper = SyntheticScraper('youtube', mentions_per_source=1, latency_ms=0, failure_rate=1.0)
+    try:
+        _scrape(scraper)
+    except ConnectionError:
+        pass
+    else:
+        raise AssertionError("failure_rate=1.0 did not fail")
+
+
+def test_get_scrapers_synthetic_passes_options():
+    scrapers = get_scrapers('synthetic', mentions_per_source=3, latency_ms=0, sentiment_mix=(0, 0, 1))
+    assert set(scrapers) == set(SYNTHETIC_SOURCES)
+    assert all(s.mentions_per_source == 3 and s.sentiment_mix == (0, 0, 1) for s in scrapers.values())
+
+
+if __name__ == "__main__":
+    test_synthetic_scraper_is_reproducible()
+    test_synthetic_sentiment_mix()
+    test_synthetic_failure_rate()
+    test_get_scrapers_synthetic_passes_options()
+    print("\n🎉 All tests passed!")
@@ -0,0 +1,71 @@
+"""
+Lazy startup tests: the schema check on first connection and one-time
+loading of the orchestrator's heavy dependencies
+"""
+
+import threading
+import time
+
+from sqlalchemy import text
+
+import database
+import inference_backend
+import orchestrator
+
+
+def test_engine_connection_ensures_schema():
+    ready = database._schema_ready
+    database._schema_ready = False
+    try:
+        with database.engine.connect() as conn:
+            assert database._schema_ready
+            conn.execute(text("SELECT count(*) FROM mentions")).scalar()
+    finally:
+        database._schema_ready = ready or database._schema_ready
+
+
+def _load_concurrently(read, threads=8):
+    start = threading.Barrier(threads)
+    seen = []
+
+    def worker():
+        start.wait()
+        seen.append(read())
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return seen
+
+
+def test_concurrent_first_access_loads_once():
+    calls = []
+
+    def slow_loader(name):
+        def load(*args, **kwargs):
+            calls.append(name)
+            time.sleep(0.05)
+            return object()
+        return load
+
+    get_scrapers, load_analyzer = orchestrator.get_scrapers, inference_backend.load_analyzer
+    orchestrator.get_scrapers = slow_loader('scrapers')
+    inference_backend.load_analyzer = slow_loader('analyzer')
+    try:
+        instance = orchestrator.InfluencerOrchestrator()
+        scrapers = _load_concurrently(lambda: instance.scrapers)
+        analyzers = _load_concurrently(lambda: instance.analyzer)
+    finally:
+        orchestrator.get_scrapers, inference_backend.load_analyzer = get_scrapers, load_analyzer
+
+    assert sorted(calls) == ['analyzer', 'scrapers']
+    assert len({id(s) for s in scrapers}) == 1 and len({id(a) for a in analyzers}) == 1
+    assert len({id(p) for p in _load_concurrently(lambda: instance.analyzer_pool)}) == 1
+
+
+if __name__ == "__main__":
+    test_engine_connection_ensures_schema()
+    test_concurrent_first_access_loads_once()
+    print("\n🎉 All tests passed!")